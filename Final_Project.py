@@ -1,25 +1,33 @@
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
 import json
+import os
+
+from page_ready import wait_until_ready
+from storefront import FixtureRecorder
+
+# Set BESTSELLERS_URL to scrape a local mock storefront (python storefront.py) instead of Amazon,
+# and FIXTURE_RECORD_DIR to save the page HTML for offline replay
+BESTSELLERS_URL = os.environ.get('BESTSELLERS_URL', 'https://www.amazon.com/Best-Sellers/zgbs')
+FIXTURE_RECORD_DIR = os.environ.get('FIXTURE_RECORD_DIR')
 
 # Initialize WebDriver
 driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()))
 
 # Navigate to Amazon's bestsellers page
-driver.get('https://www.amazon.com/Best-Sellers/zgbs')  # Example page with less aggressive anti-scraping measures
+driver.get(BESTSELLERS_URL)  # Example page with less aggressive anti-scraping measures
 
 # Initialize a list to store product data
 products_data = []
 
-# Create a WebDriverWait object with a maximum timeout of 10 seconds
-wait = WebDriverWait(driver, 10)
+# Wait (at most 10 seconds) until the products are on the page and the list stopped changing
+wait_until_ready(driver, '.zg-item', timeout=10)
 
-# Wait for the products to load
-wait.until(EC.presence_of_all_elements_located((By.CLASS_NAME, 'zg-item')))
+# Record the loaded page so the run can be replayed offline
+if FIXTURE_RECORD_DIR:
+    FixtureRecorder(FIXTURE_RECORD_DIR).save('Amazon', 'bestsellers', driver.page_source)
 
 # Locate the product elements
 products = driver.find_elements(By.CLASS_NAME, 'zg-item')
@@ -39,9 +47,6 @@ for product in products[:10]:
     except Exception as e:
         print(f"Error extracting product data: {e}")
 
-    # Add a random delay between iterations to simulate human behavior
-    time.sleep(random.uniform(1, 3))
-
 # Save the scraped data to a JSON file
 with open('amazon_top10.json', 'w', encoding='utf-8') as f:
     json.dump(products_data, f, indent=4, ensure_ascii=False)
@@ -0,0 +1,162 @@
+"""
+Content-addressed cache of analysis artifacts (CSV tables, charts).
+
+Each artifact is keyed by a hash of the data columns it is computed from plus
+its parameters, so an artifact is only recomputed when its own inputs change:
+new snapshots that leave one table's columns untouched do not re-render it.
+
+The cache keeps one file per key under its directory and evicts the least
+recently used files once it grows past max_bytes. It also remembers which key
+each output file currently holds, so an unchanged artifact costs one stat()
+and no copy at all.
+"""
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+
+import pandas as pd
+
+
+class FrameDigest:
+    def __init__(self, df):
+        """
+        Content hashes of a DataFrame's columns, each computed at most once.
+
+        Args:
+            df (pandas.DataFrame): Data the artifacts are computed from
+        """
+        self.df = df
+        self._columns = {}
+
+    def column(self, name):
+        if name not in self._columns:
+            series = self.df[name]
+            values = pd.util.hash_pandas_object(series, index=False).to_numpy()
+            digest = hashlib.sha256(str(series.dtype).encode('utf-8'))
+            digest.update(values.tobytes())
+            self._columns[name] = digest.hexdigest()
+        return self._columns[name]
+
+    def digest(self, columns):
+        """Hash of the given columns (names, dtypes and values, in row order)."""
+        digest = hashlib.sha256()
+        for name in columns:
+            digest.update(f'{name}={self.column(name)};'.encode('utf-8'))
+        return digest.hexdigest()
+
+
+class AnalysisCache:
+    def __init__(self, directory, max_bytes=200 * 2 ** 20):
+        """
+        Bounded on-disk cache of analysis artifacts.
+
+        Args:
+            directory (str): Cache directory (created if missing)
+            max_bytes (int): Total size of cached files before the least recently
+                used ones are evicted
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(directory, 'index.json')
+        self.entries = {}
+        self.outputs = {}
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        if os.path.exists(self.index_path):
+            try:
+                with open(self.index_path, encoding='utf-8') as f:
+                    data = json.load(f)
+                self.entries = data.get('entries', {})
+                self.outputs = data.get('outputs', {})
+            except (OSError, ValueError) as e:
+                logging.error(f"Could not read analysis cache index {self.index_path}, starting a new one: {e}")
+
+    @staticmethod
+    def key(artifact, digest, params=None):
+        """Cache key of an artifact computed from data with this digest and these parameters."""
+        text = json.dumps({'artifact': artifact, 'data': digest, 'params': params or {}}, sort_keys=True, default=str)
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    def _entry_path(self, key, path):
+        return os.path.join(self.directory, key[:2], key + os.path.splitext(path)[1])
+
+    @staticmethod
+    def _stat(path):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return [stat.st_size, stat.st_mtime_ns]
+
+    def restore(self, key, path):
+        """
+        Make path hold the artifact for key, if it is cached.
+
+        Returns:
+            str or None: "unchanged" when path already holds it, "restored" when it
+                was copied from the cache, None when the artifact must be computed
+        """
+        with self._lock:
+            output = self.outputs.get(os.path.abspath(path))
+            if output and output['key'] == key and output['stat'] == self._stat(path):
+                self._touch(key)
+                return "unchanged"
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            cached = os.path.join(self.directory, entry['file'])
+            try:
+                shutil.copyfile(cached, path)
+            except OSError as e:
+                logging.warning(f"Dropping unreadable analysis cache entry {cached}: {e}")
+                del self.entries[key]
+                self._save()
+                return None
+            self.outputs[os.path.abspath(path)] = {'key': key, 'stat': self._stat(path)}
+            self._touch(key)
+            return "restored"
+
+    def store(self, key, path):
+        """Add the freshly computed artifact at path to the cache, evicting old entries if needed."""
+        with self._lock:
+            cached = self._entry_path(key, path)
+            os.makedirs(os.path.dirname(cached), exist_ok=True)
+            tmp_path = cached + '.tmp'
+            shutil.copyfile(path, tmp_path)
+            os.replace(tmp_path, cached)
+            self.entries[key] = {'file': os.path.relpath(cached, self.directory),
+                                 'size': os.path.getsize(cached), 'last_used': time.time()}
+            self.outputs[os.path.abspath(path)] = {'key': key, 'stat': self._stat(path)}
+            self._evict()
+            self._save()
+
+    def _touch(self, key):
+        if key in self.entries:
+            self.entries[key]['last_used'] = time.time()
+        self._save()
+
+    def size(self):
+        return sum(entry['size'] for entry in self.entries.values())
+
+    def _evict(self):
+        total = self.size()
+        for key, entry in sorted(self.entries.items(), key=lambda item: item[1]['last_used']):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.directory, entry['file']))
+            except OSError:
+                pass
+            total -= entry['size']
+            del self.entries[key]
+            logging.info(f"Evicted analysis cache entry {entry['file']}")
+
+    def _save(self):
+        tmp_path = self.index_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'entries': self.entries, 'outputs': self.outputs}, f)
+        os.replace(tmp_path, self.index_path)
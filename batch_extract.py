@@ -0,0 +1,114 @@
+import logging
+
+# Runs inside the browser. Walks every product card once and evaluates each
+# field's selector chain in order, so a whole results page costs a single
+# WebDriver round trip instead of several find_element calls per card.
+EXTRACT_CARDS_JS = """
+const spec = arguments[0];
+const text = (el) => ((el.innerText || el.textContent || '').trim());
+const read = (el, f) => (f.attr ? (el.getAttribute(f.attr) || '').trim() : text(el));
+// Fields read with a selector after the first one of their chain
+const fallbacks = {};
+
+function field(card, name, f) {
+    for (const [index, selector] of f.selectors.entries()) {
+        // ':scope' is the card element itself, e.g. for its data-asin attribute
+        const found = selector === ':scope' ? [card] : Array.from(card.querySelectorAll(selector));
+        if (found.length) {
+            if (index > 0) {
+                fallbacks[name] = (fallbacks[name] || 0) + 1;
+            }
+            let value = found.slice(0, f.join || 1).map((el) => read(el, f)).join(' ');
+            if (f.first_word) {
+                value = value.split(/\\s+/)[0];
+            }
+            return value;
+        }
+    }
+    return null;
+}
+
+const rows = [];
+const cards = Array.from(document.querySelectorAll(spec.card)).slice(0, spec.limit);
+for (const card of cards) {
+    const row = {};
+    let complete = true;
+    for (const [name, f] of Object.entries(spec.fields)) {
+        const value = field(card, name, f);
+        if (value === null && f.required) {
+            complete = false;
+            break;
+        }
+        row[name] = value === null ? 'N/A' : value;
+    }
+    if (complete) {
+        rows.push(row);
+    }
+}
+return {cards: cards.length, rows: rows, fallbacks: fallbacks};
+"""
+
+
+def field_spec(*selectors, join=1, required=False, first_word=False, attr=None):
+    """
+    Describe how to read one field from a product card.
+
+    Args:
+        selectors (str): CSS selectors tried in order; the first one that matches wins.
+            ':scope' selects the card element itself.
+        join (int): Number of matching elements whose text is joined with a space
+        required (bool): Drop the card when no selector matches
+        first_word (bool): Keep only the first whitespace separated word
+        attr (str): Read this attribute (e.g. 'href', 'data-asin') instead of the text
+
+    Returns:
+        dict: Field specification understood by EXTRACT_CARDS_JS
+    """
+    return {"selectors": list(selectors), "join": join, "required": required, "first_word": first_word, "attr": attr}
+
+
+def card_spec(card_selector, limit=20, **fields):
+    """
+    Describe the product cards of a results page.
+
+    Args:
+        card_selector (str): CSS selector matching one element per product
+        limit (int): Maximum number of cards to read
+        fields: field_spec() for each output column (e.g. name, price, rating)
+
+    Returns:
+        dict: Page specification passed to extract_cards
+    """
+    return {"card": card_selector, "limit": limit, "fields": fields}
+
+
+def extract_cards(driver, spec, metrics=None, **labels):
+    """
+    Read all product cards on the current page with a single execute_script call.
+
+    Args:
+        driver (WebDriver): Selenium WebDriver instance showing a results page
+        spec (dict): Page specification built with card_spec
+        metrics (MetricsRegistry): Optional registry counting dropped cards and
+            fields read with fallback selectors
+        labels: Labels of those counts (e.g. website='Amazon')
+
+    Returns:
+        list: One dict per card with the fields named in the spec
+    """
+    result = driver.execute_script(EXTRACT_CARDS_JS, spec) or {}
+    rows = result.get("rows", [])
+    skipped = result.get("cards", 0) - len(rows)
+    if skipped:
+        logging.warning(f"Skipped {skipped} product cards missing required fields")
+    if metrics is not None:
+        record_extraction(metrics, skipped, result.get("fallbacks") or {}, source="browser", **labels)
+    return rows
+
+
+def record_extraction(metrics, skipped, fallbacks, **labels):
+    """Count dropped cards and fallback selector hits of one results page in metrics."""
+    if skipped:
+        metrics.inc("parse_failures_total", skipped, **labels)
+    for name, hits in fallbacks.items():
+        metrics.inc("fallback_selector_hits_total", hits, field=name, **labels)
@@ -0,0 +1,78 @@
+"""
+Benchmark chart rendering: inline on the calling thread vs a background process pool.
+
+Renders the analysis charts (price distribution, website comparison, price
+trend and one histogram per category) for synthetic processed data and prints,
+for each worker count, how long the calling thread was blocked and how long
+until every image was on disk:
+
+    python benchmarks/bench_charts.py --products 20000 --categories 6 --workers 0 2 4
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import wait
+
+import numpy as np
+import pandas as pd
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from chart_renderer import (ChartRenderer, category_price_histogram, price_distribution, price_trend,
+                            website_price_comparison)
+
+
+def synthetic_data(rng, products, categories):
+    return pd.DataFrame({
+        "category": rng.choice([f"category{i}" for i in range(categories)], products),
+        "website": rng.choice(["Amazon", "BestBuy"], products),
+        "price_cleaned": rng.uniform(20, 2500, products).round(2),
+        "timestamp": (pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 30, products), unit="D"))
+                     .strftime("%Y-%m-%d %H:%M:%S"),
+    })
+
+
+def render_all(renderer, df, directory):
+    futures = [
+        renderer.submit(price_distribution, df[["category", "price_cleaned"]],
+                        os.path.join(directory, "price_distribution.png")),
+        renderer.submit(website_price_comparison, df[["website", "category", "price_cleaned"]],
+                        os.path.join(directory, "website_price_comparison.png")),
+        renderer.submit(price_trend, df, os.path.join(directory, "price_trend.png")),
+    ]
+    for category in sorted(df["category"].unique()):
+        futures.append(renderer.submit(category_price_histogram, df[["website", "category", "price_cleaned"]],
+                                       os.path.join(directory, f"price_histogram_{category}.png"), category=category))
+    return futures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--products", type=int, default=20000)
+    parser.add_argument("--categories", type=int, default=6)
+    parser.add_argument("--workers", type=int, nargs="+", default=[0, 2, 4], help="0 renders inline")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    df = synthetic_data(np.random.default_rng(args.seed), args.products, args.categories)
+    print(f"{args.products} products, {args.categories + 3} charts per run")
+    with tempfile.TemporaryDirectory(prefix="bench_charts_") as directory:
+        for workers in args.workers:
+            renderer = ChartRenderer(max_workers=workers)
+            # Warm-up run: starts the worker processes (and their imports)
+            wait(render_all(renderer, df, directory))
+
+            start = time.perf_counter()
+            futures = render_all(renderer, df, directory)
+            blocked = time.perf_counter() - start
+            wait(futures)
+            total = time.perf_counter() - start
+            renderer.shutdown()
+            print(f"  workers={workers}  caller blocked {blocked:6.2f}s   all charts done {total:6.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Benchmark vectorized price/rating parsing against the row-by-row parsers.
+
+Builds synthetic raw columns with bench_pipeline's generator, checks that
+cleaning.parse_prices / parse_ratings are bit-identical to Series.apply with
+the scalar parsers for every variant the tracker scripts use, and reports
+the speedup.
+
+Usage:
+    python benchmarks/bench_cleaning.py --rows 1m
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_pipeline import parse_rows, synthetic_chunk
+from cleaning import parse_price, parse_prices, parse_rating, parse_ratings
+
+# (label, column, row-by-row version, vectorized version)
+VARIANTS = [
+    ("price", "price",
+     lambda s: s.apply(parse_price), lambda s: parse_prices(s)),
+    ("price first token (improvising.py)", "price",
+     lambda s: s.apply(lambda p: parse_price(p, first_token=True)), lambda s: parse_prices(s, first_token=True)),
+    ("rating", "rating",
+     lambda s: s.apply(parse_rating), lambda s: parse_ratings(s)),
+    ("rating strings only (group.final.py)", "rating",
+     lambda s: s.apply(lambda r: parse_rating(r, strings_only=True, fill=0)),
+     lambda s: parse_ratings(s, strings_only=True, fill=0)),
+]
+
+
+def best_of(fn, column, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(column)
+        timings.append(time.perf_counter() - start)
+    return result, min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", default="1m")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rows = parse_rows(args.rows)
+    df = synthetic_chunk(np.random.default_rng(0), 0, rows, "2024-12-09 15:22:14")
+    # Blank and "N/A" cells arrive as NaN after read_csv
+    df = df.replace({"": np.nan, "N/A": np.nan})
+
+    print(f"{rows:,} rows")
+    print(f"{'variant':<38}{'apply (s)':>12}{'vectorized (s)':>16}{'speedup':>10}")
+    for label, column, row_by_row, vectorized in VARIANTS:
+        expected, slow = best_of(row_by_row, df[column], args.repeat)
+        result, fast = best_of(vectorized, df[column], args.repeat)
+        identical = expected.to_numpy("float64").tobytes() == result.to_numpy("float64").tobytes()
+        if not identical:
+            raise SystemExit(f"{label}: vectorized output differs from the row-by-row parser")
+        print(f"{label:<38}{slow:>12.3f}{fast:>16.3f}{slow / fast:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
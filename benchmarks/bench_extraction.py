@@ -0,0 +1,95 @@
+"""
+Benchmark WebDriver round trips for product card extraction.
+
+Loads a synthetic Amazon-style results page in Chrome and extracts it with
+EXTRACTION_MODE "elements" (find_element per field) and "batch" (a single
+execute_script per page), reporting round trips and wall-clock time for each.
+
+Usage:
+    python benchmarks/bench_extraction.py --cards 20 --repeat 5
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from web_scraping_final import EcommerceProductTracker
+
+CARD_HTML = """
+<div data-component-type="s-search-result">
+  <h2><a href="/dp/B0{index:08d}"><span>Synthetic Laptop {index}, 15.6" FHD, 16GB RAM, 512GB SSD</span></a></h2>
+  <span class="a-price"><span class="a-price-whole">{whole:,}</span><span class="a-price-fraction">99</span></span>
+  <span class="a-icon-alt">4.{rating} out of 5 stars</span>
+</div>
+"""
+
+
+def write_results_page(cards):
+    """Write a synthetic results page with the given number of cards and return its path."""
+    body = "".join(CARD_HTML.format(index=i, whole=199 + i * 10, rating=i % 10) for i in range(cards))
+    fd, path = tempfile.mkstemp(suffix=".html")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(f"<html><body>{body}</body></html>")
+    return path
+
+
+class RoundTripCounter:
+    """Counts WebDriver commands by wrapping driver.execute (used by WebElement calls too)."""
+
+    def __init__(self, driver):
+        self.count = 0
+        self._execute = driver.execute
+
+        def execute(command, params=None):
+            self.count += 1
+            return self._execute(command, params)
+
+        driver.execute = execute
+
+
+def run(tracker, driver, mode, repeat):
+    tracker.EXTRACTION_MODE = mode
+    counter = RoundTripCounter(driver)
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        products = tracker.extract_amazon_products(driver, "laptops")
+        timings.append(time.perf_counter() - start)
+    driver.execute = counter._execute
+    return {
+        "mode": mode,
+        "products": len(products),
+        "round_trips": counter.count // repeat,
+        "best_s": min(timings),
+        "mean_s": sum(timings) / len(timings),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cards", type=int, default=20, help="product cards on the synthetic page")
+    parser.add_argument("--repeat", type=int, default=5, help="extractions per mode")
+    args = parser.parse_args()
+
+    tracker = EcommerceProductTracker()
+    page = write_results_page(args.cards)
+    driver = tracker.init_driver()
+    try:
+        driver.get("file://" + page)
+        results = [run(tracker, driver, mode, args.repeat) for mode in ("elements", "batch")]
+    finally:
+        driver.quit()
+        os.remove(page)
+
+    print(f"{'mode':<10}{'products':>10}{'round trips':>14}{'best (s)':>12}{'mean (s)':>12}")
+    for r in results:
+        print(f"{r['mode']:<10}{r['products']:>10}{r['round_trips']:>14}{r['best_s']:>12.4f}{r['mean_s']:>12.4f}")
+    speedup = results[0]["mean_s"] / results[1]["mean_s"] if results[1]["mean_s"] else float("inf")
+    print(f"batch extraction is {speedup:.1f}x faster")
+
+
+if __name__ == "__main__":
+    main()
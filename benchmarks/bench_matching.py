@@ -0,0 +1,114 @@
+"""
+Benchmark cross-site product matching on synthetic listings with known answers.
+
+Generates a catalogue of products, each listed on Amazon and/or BestBuy with
+site-specific noisy titles (different word order, separators, dropped specs,
+"WH-1000XM5" vs "WH1000XM5"), including sibling models that differ only in
+their model number. Reports run time, candidate pairs and precision/recall:
+
+    python benchmarks/bench_matching.py --products 1k 10k 100k
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+import pandas as pd
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import product_matching
+from bench_pipeline import parse_rows
+
+BRANDS = ["Lenovo", "HP", "Dell", "Acer", "ASUS", "Apple", "Sony", "Bose", "Samsung", "JBL", "LG", "MSI"]
+LINES = {
+    "laptops": ["IdeaPad", "ThinkPad", "Pavilion", "Inspiron", "Aspire", "VivoBook", "ZenBook", "Envy", "Swift"],
+    "headphones": ["QuietComfort", "Tune", "Live", "Momentum", "Studio", "SoundSport", "Elite"],
+    "monitors": ["UltraSharp", "Odyssey", "UltraGear", "Nitro", "ProArt", "ViewFinity"],
+}
+SPECS = {
+    "laptops": ["15.6\" FHD", "14\" HD", "16GB RAM", "8GB RAM", "512GB SSD", "1TB SSD", "Intel Core i5", "Windows 11"],
+    "headphones": ["Wireless", "Bluetooth 5.3", "Noise Cancelling", "Over-Ear", "30H Battery", "USB-C"],
+    "monitors": ["27\"", "32\"", "4K UHD", "144Hz", "IPS", "HDR10", "1ms"],
+}
+COLORS = ["Black", "Silver", "White", "Blue", "Gray"]
+
+
+def catalogue(rng, products):
+    items = []
+    for i in range(products):
+        category = rng.choice(list(LINES))
+        letters = "".join(rng.choice("ABCDEFGHJKMNPQRSTVWXZ") for _ in range(rng.randint(1, 3)))
+        # Sibling models share a prefix and differ in the last digits ("V15 G2" vs "V15 G3")
+        base = f"{letters}{rng.randint(1, 99)}"
+        model = f"{base}-{rng.randint(100, 9999)}{rng.choice(['', 'X', 'M5', 'G2'])}"
+        items.append({
+            "id": i,
+            "brand": rng.choice(BRANDS),
+            "line": rng.choice(LINES[category]),
+            "model": model,
+            "category": category,
+            "specs": rng.sample(SPECS[category], 4),
+            "color": rng.choice(COLORS),
+            "price": round(rng.uniform(30, 2500), 2),
+        })
+    return items
+
+
+def amazon_title(rng, item):
+    specs = ", ".join(item["specs"][:rng.randint(2, 4)])
+    return f"{item['brand']} {item['line']} {item['model']} {item['category'].rstrip('s').title()}, {specs}, {item['color']}"
+
+
+def bestbuy_title(rng, item):
+    model = item["model"].replace("-", "") if rng.random() < 0.5 else item["model"]
+    specs = " - ".join(rng.sample(item["specs"], rng.randint(1, 3)))
+    return f"{item['brand']} - {item['line']} {model} {specs} - {item['color']}"
+
+
+def listings(rng, items, overlap):
+    rows = []
+    for item in items:
+        on_amazon, on_bestbuy = True, True
+        if rng.random() > overlap:
+            on_amazon, on_bestbuy = (True, False) if rng.random() < 0.5 else (False, True)
+        if on_amazon:
+            rows.append({"product_key": f"Amazon:{item['id']}", "name": amazon_title(rng, item), "website": "Amazon",
+                         "category": item["category"], "price_cleaned": item["price"], "truth": item["id"]})
+        if on_bestbuy:
+            rows.append({"product_key": f"BestBuy:{item['id']}", "name": bestbuy_title(rng, item), "website": "BestBuy",
+                         "category": item["category"], "price_cleaned": round(item["price"] * rng.uniform(0.85, 1.2), 2),
+                         "truth": item["id"]})
+    return pd.DataFrame(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--products", nargs="+", default=["1k", "10k"], help="catalogue sizes")
+    parser.add_argument("--overlap", type=float, default=0.6, help="share of products listed on both sites")
+    parser.add_argument("--threshold", type=float, default=0.4)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for size in args.products:
+        rng = random.Random(args.seed)
+        df = listings(rng, catalogue(rng, parse_rows(size)), args.overlap)
+        truth = dict(zip(df["product_key"], df["truth"]))
+        expected = int((df.groupby("truth")["website"].nunique() == 2).sum())
+
+        start = time.perf_counter()
+        report = product_matching.price_spread_report(df, threshold=args.threshold)
+        elapsed = time.perf_counter() - start
+
+        correct = int(sum(truth[a] == truth[b] for a, b in zip(report["product_key_a"], report["product_key_b"])))
+        precision = correct / len(report) if len(report) else 0.0
+        recall = correct / expected if expected else 0.0
+        print(f"{len(df):>9,} listings  {elapsed:>8.2f}s  {len(report):>8,} matches"
+              f"  precision {precision:.3f}  recall {recall:.3f}")
+
+
+if __name__ == "__main__":
+    main()
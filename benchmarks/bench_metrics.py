@@ -0,0 +1,85 @@
+"""
+Benchmark the overhead of the hot-path metrics.
+
+Times the recording calls on their own, then runs scrape_all_sources over
+HTTP against a local mock storefront followed by clean_and_process_data,
+with the metrics registry enabled and disabled:
+
+    python benchmarks/bench_metrics.py --runs 5 --pages 5
+"""
+import argparse
+import importlib.util
+import logging
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import timeit
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from metrics import MetricsRegistry
+from storefront import MockStorefront
+
+
+def load_tracker(script, work_dir):
+    """Import the tracker class from a script and point its output directories at work_dir."""
+    spec = importlib.util.spec_from_file_location("tracker_under_benchmark", os.path.join(REPO_DIR, script))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    tracker = module.EcommerceProductTracker()
+    tracker.LOG_DIR = os.path.join(work_dir, "logs")
+    tracker.PROCESSED_DATA_DIR = os.path.join(work_dir, "processed_data")
+    tracker.ANALYSIS_OUTPUT_DIR = os.path.join(work_dir, "analysis_output")
+    for dir_path in [tracker.LOG_DIR, tracker.PROCESSED_DATA_DIR, tracker.ANALYSIS_OUTPUT_DIR]:
+        os.makedirs(dir_path, exist_ok=True)
+    tracker.rate_limiter = module.HostRateLimiter(rate=1_000, burst=100)
+    tracker.init_driver = lambda *args: None  # Pages are plain HTML, no browser should start
+    return tracker
+
+
+def run(args, enabled):
+    work_dir = tempfile.mkdtemp(prefix="bench_metrics_")
+    try:
+        tracker = load_tracker(args.script, work_dir)
+        tracker.RESULT_PAGES = args.pages
+        tracker.metrics.enabled = enabled
+        with MockStorefront() as storefront:
+            tracker.SITE_URLS = storefront.site_urls()
+            start = time.perf_counter()
+            tracker.scrape_all_sources()
+            tracker.clean_and_process_data()
+            return time.perf_counter() - start
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--script", default="web_scraping_final.py",
+                        choices=["web_scraping_final.py", "group.final.py", "improvising.py"])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--pages", type=int, default=5, help="result pages per website and category")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    registry = MetricsRegistry()
+    calls = 200_000
+    inc = timeit.timeit(lambda: registry.inc("webdriver_commands_total", command="findElements"), number=calls)
+    observe = timeit.timeit(lambda: registry.observe("stage_duration_seconds", 0.2, stage="fetch_website"),
+                            number=calls)
+    print(f"counter increment {inc / calls * 1e6:.2f}us, histogram observation {observe / calls * 1e6:.2f}us")
+
+    print(f"{args.script}, scrape ({args.pages} pages per job) + process, best of {args.runs} runs")
+    print(f"  {'metrics':<8} {'best (s)':>9} {'median (s)':>11}")
+    for enabled in (False, True):
+        times = [run(args, enabled) for _ in range(args.runs)]
+        print(f"  {'on' if enabled else 'off':<8} {min(times):>9.3f} {statistics.median(times):>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Benchmark lean page loads: bytes transferred and page-ready latency per page.
+
+Serves synthetic results pages with realistic page weight (a product image
+per card, a web font, a promo video and a third-party ad script) from a
+local mock storefront, and loads them in Chrome with the tracker's
+init_driver, once with LEAN_PAGES off and once with it on:
+
+    python benchmarks/bench_page_weight.py --pages 10 --latency 0.05
+
+Per mode it prints the mean time driver.get blocked the scraper, the mean
+DOMContentLoaded time, the bytes transferred and the requests made per page
+(read once the page has finished loading). Needs Chrome and chromedriver.
+"""
+import argparse
+import logging
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from urllib.parse import urlsplit
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from lean_pages import DEFAULT_BLOCKED_DOMAINS, page_metrics
+from storefront import MockStorefront
+from tracker_cli import TRACKERS, load_tracker
+
+
+def load_pages(driver, urls):
+    """Load every url, returning (seconds driver.get took, page_metrics once the page completed) per page."""
+    samples = []
+    for url in urls:
+        start = time.perf_counter()
+        driver.get(url)
+        elapsed = time.perf_counter() - start
+        deadline = time.monotonic() + 30
+        while driver.execute_script("return document.readyState") != "complete" and time.monotonic() < deadline:
+            time.sleep(0.05)
+        samples.append((elapsed, page_metrics(driver)))
+    return samples
+
+
+def run(args, lean, work_dir):
+    tracker = load_tracker(args.tracker)()
+    tracker.PROCESSED_DATA_DIR = work_dir  # Cached chromedriver path
+    tracker.KEEP_BROWSERS_WARM = False
+    tracker.LEAN_PAGES = lean
+    with MockStorefront(latency=args.latency, page_assets=True) as storefront:
+        # The storefront serves its "third-party" ad script from its other host name
+        third_party = urlsplit(storefront.third_party_url).hostname
+        tracker.BLOCKED_DOMAINS = DEFAULT_BLOCKED_DOMAINS + [third_party]
+        base_url = storefront.site_urls()["Amazon"]
+        urls = [f"{base_url}/s?k=laptops&page={page}" for page in range(1, args.pages + 1)]
+        try:
+            driver = tracker.init_driver(os.path.join(work_dir, f"profile-{lean}"))
+        except Exception as e:
+            driver = None
+            logging.debug(f"init_driver failed: {e}")
+        if driver is None:
+            raise SystemExit("Chrome could not be started, this benchmark needs Chrome and chromedriver")
+        try:
+            load_pages(driver, urls[:1])  # Warm up the browser
+            return load_pages(driver, urls)
+        finally:
+            driver.quit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tracker", default="web_scraping_final", choices=TRACKERS)
+    parser.add_argument("--pages", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds the storefront delays every response")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    work_dir = tempfile.mkdtemp(prefix="bench_page_weight_")
+    try:
+        print(f"{args.pages} results pages, storefront latency {args.latency:.2f}s")
+        print(f"  {'mode':<5} {'get (s)':>8} {'ready (s)':>10} {'KiB/page':>9} {'requests':>9}")
+        for lean in (False, True):
+            samples = run(args, lean, work_dir)
+            metrics = [m for _, m in samples if m]
+            ready = [m["ready_ms"] / 1000 for m in metrics if m.get("ready_ms") is not None]
+            print(f"  {'lean' if lean else 'full':<5} {statistics.fmean(s for s, _ in samples):>8.2f} "
+                  f"{statistics.fmean(ready) if ready else float('nan'):>10.2f} "
+                  f"{statistics.fmean(m['bytes'] for m in metrics) / 1024:>9.0f} "
+                  f"{statistics.fmean(m['requests'] for m in metrics):>9.1f}")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark result-page depth: products scraped and wall time vs pages crawled.
+
+Runs scrape_all_sources over HTTP against a local mock storefront that
+delays every response by --latency seconds (like a remote site), for each
+RESULT_PAGES depth with one page at a time (MAX_TABS=1) and with --tabs
+pages in flight:
+
+    python benchmarks/bench_pages.py --pages 1 5 10 --tabs 4 --latency 0.3
+
+The per-host rate limiter is opened up so that only the page loads count;
+live runs are additionally paced by HOST_RATE_LIMIT.
+"""
+import argparse
+import csv
+import glob
+import importlib.util
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from storefront import MockStorefront
+
+
+def load_tracker(script, work_dir):
+    """Import the tracker class from a script and point its output directories at work_dir."""
+    spec = importlib.util.spec_from_file_location("tracker_under_benchmark", os.path.join(REPO_DIR, script))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    tracker = module.EcommerceProductTracker()
+    tracker.LOG_DIR = os.path.join(work_dir, "logs")
+    tracker.PROCESSED_DATA_DIR = os.path.join(work_dir, "processed_data")
+    tracker.ANALYSIS_OUTPUT_DIR = os.path.join(work_dir, "analysis_output")
+    for dir_path in [tracker.LOG_DIR, tracker.PROCESSED_DATA_DIR, tracker.ANALYSIS_OUTPUT_DIR]:
+        os.makedirs(dir_path, exist_ok=True)
+    tracker.rate_limiter = module.HostRateLimiter(rate=1_000, burst=100)
+    tracker.init_driver = lambda *args: None  # Pages are plain HTML, no browser should start
+    return tracker
+
+
+def run(args, pages, tabs):
+    work_dir = tempfile.mkdtemp(prefix="bench_pages_")
+    try:
+        tracker = load_tracker(args.script, work_dir)
+        tracker.RESULT_PAGES = pages
+        tracker.MAX_TABS = tabs
+        with MockStorefront(latency=args.latency) as storefront:
+            tracker.SITE_URLS = storefront.site_urls()
+            start = time.perf_counter()
+            tracker.scrape_all_sources()
+            elapsed = time.perf_counter() - start
+        products = 0
+        for snapshot in glob.glob(os.path.join(tracker.LOG_DIR, "products_*.csv")):
+            with open(snapshot, newline="", encoding="utf-8") as f:
+                products += sum(1 for _ in csv.DictReader(f))
+        return elapsed, products / (len(tracker.WEBSITES) * len(tracker.PRODUCT_CATEGORIES))
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--script", default="web_scraping_final.py",
+                        choices=["web_scraping_final.py", "group.final.py", "improvising.py"])
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 5, 10])
+    parser.add_argument("--tabs", type=int, default=4, help="pages in flight for the concurrent runs")
+    parser.add_argument("--latency", type=float, default=0.3, help="seconds the storefront delays every response")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    print(f"{args.script}, storefront latency {args.latency:.2f}s")
+    print(f"  {'pages':>5} {'tabs':>5} {'products/category':>18} {'seconds':>9}")
+    for pages in args.pages:
+        for tabs in sorted({1, args.tabs}):
+            elapsed, per_job = run(args, pages, tabs)
+            print(f"  {pages:>5} {tabs:>5} {per_job:>18.0f} {elapsed:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
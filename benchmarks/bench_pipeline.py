@@ -0,0 +1,278 @@
+"""
+End-to-end benchmark for the scrape, clean and analyze stages.
+
+Generates synthetic raw products_*.csv snapshots in the real scraper schema
+(name, price, rating, category, website, timestamp), then times and
+memory-profiles each tracker stage in an isolated temporary directory:
+
+    scrape   scrape_all_sources over HTTP against a local mock storefront
+    clean    clean_and_process_data on the synthetic snapshot
+    analyze  analyze_product_data, until its tables are written and its charts rendered
+    chart    the price distribution chart on its own, rendered in this process
+
+Memory is the tracemalloc peak of this process, so it leaves out the chart
+rendering processes analyze hands its charts to (CHART_WORKERS); the chart
+stage renders in this process and is measured in full.
+
+Results are written as JSON so runs from different versions can be compared:
+
+    python benchmarks/bench_pipeline.py --rows 10k 1m
+    python benchmarks/bench_pipeline.py --rows 10k --compare benchmarks/results/pipeline_old.json
+"""
+import argparse
+import importlib.util
+import json
+import logging
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import wait
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from chart_renderer import price_distribution
+from storefront import MockStorefront
+
+RESULTS_DIR = os.path.join(REPO_DIR, "benchmarks", "results")
+FIELDNAMES = ["name", "price", "rating", "category", "website", "timestamp"]
+CATEGORIES = ["laptops", "headphones", "smartphones", "monitors", "tablets", "cameras"]
+BRANDS = np.array(["Lenovo", "HP", "Dell", "Acer", "ASUS", "Apple", "Sony", "Bose", "Samsung", "JBL"])
+CHUNK_ROWS = 500_000
+
+
+def parse_rows(text):
+    """Parse a row count such as '10k', '1m' or '10000000'."""
+    text = text.lower().replace("_", "")
+    for suffix, factor in (("k", 1_000), ("m", 1_000_000)):
+        if text.endswith(suffix):
+            return int(float(text[:-1]) * factor)
+    return int(text)
+
+
+def synthetic_chunk(rng, start, rows, base_time):
+    """
+    Build one chunk of raw scraper output.
+
+    Prices and ratings use the formats the scrapers actually produce:
+    "1,299", "$1,299.99", "1,299 99" (joined whole/fraction), "N/A" and empty;
+    "4.5 out of 5 stars", "4.5", "N/A" and empty.
+    """
+    index = np.arange(start, start + rows)
+    whole = rng.integers(5, 3000, rows)
+    cents = rng.integers(0, 100, rows)
+    whole_text = pd.Series(whole).map("{:,}".format)
+    cents_text = pd.Series(cents).map("{:02d}".format)
+
+    price_format = rng.integers(0, 10, rows)
+    price = whole_text.copy()
+    price[price_format == 5] = "$" + whole_text[price_format == 5] + "." + cents_text[price_format == 5]
+    price[price_format == 6] = whole_text[price_format == 6] + " " + cents_text[price_format == 6]
+    price[price_format == 7] = "N/A"
+    price[price_format == 8] = ""
+
+    rating_value = pd.Series(rng.uniform(1.0, 5.0, rows)).map("{:.1f}".format)
+    rating_format = rng.integers(0, 4, rows)
+    rating = rating_value + " out of 5 stars"
+    rating[rating_format == 1] = rating_value[rating_format == 1]
+    rating[rating_format == 2] = "N/A"
+    rating[rating_format == 3] = ""
+
+    category = np.array(CATEGORIES)[rng.integers(0, len(CATEGORIES), rows)]
+    name = (
+        pd.Series(BRANDS[rng.integers(0, len(BRANDS), rows)])
+        + " " + pd.Series(category).str.title()
+        + " Model " + pd.Series(index % 50_000).astype(str)
+        + ", 15.6\" FHD, 16GB RAM"
+    )
+    seconds = pd.to_timedelta(index // 20, unit="s")
+    timestamp = (pd.Timestamp(base_time) + seconds).strftime("%Y-%m-%d %H:%M:%S")
+
+    return pd.DataFrame({
+        "name": name,
+        "price": price,
+        "rating": rating,
+        "category": category,
+        "website": np.where(rng.integers(0, 2, rows) == 0, "Amazon", "BestBuy"),
+        "timestamp": timestamp,
+    }, columns=FIELDNAMES)
+
+
+def generate_snapshot(log_dir, rows, seed=0):
+    """
+    Write a synthetic logs/products_<ts>.csv snapshot with the given number of rows.
+
+    Returns:
+        str: Path of the generated file
+    """
+    rng = np.random.default_rng(seed)
+    base_time = datetime(2024, 12, 9, 15, 22, 14)
+    path = os.path.join(log_dir, f"products_{base_time.strftime('%Y%m%d_%H%M%S')}.csv")
+    for start in range(0, rows, CHUNK_ROWS):
+        chunk = synthetic_chunk(rng, start, min(CHUNK_ROWS, rows - start), base_time)
+        chunk.to_csv(path, mode="a" if start else "w", header=not start, index=False)
+    return path
+
+
+def load_tracker(script, work_dir):
+    """Import the tracker class from a script and point its output directories at work_dir."""
+    spec = importlib.util.spec_from_file_location("tracker_under_benchmark", os.path.join(REPO_DIR, script))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    tracker = module.EcommerceProductTracker()
+    tracker.LOG_DIR = os.path.join(work_dir, "logs")
+    tracker.PROCESSED_DATA_DIR = os.path.join(work_dir, "processed_data")
+    tracker.ANALYSIS_OUTPUT_DIR = os.path.join(work_dir, "analysis_output")
+    for dir_path in [tracker.LOG_DIR, tracker.PROCESSED_DATA_DIR, tracker.ANALYSIS_OUTPUT_DIR]:
+        os.makedirs(dir_path, exist_ok=True)
+    return module, tracker
+
+
+def measure(stage, fn, memory=True, **info):
+    """
+    Run fn once, returning its result and a timing/memory record.
+
+    Memory is the tracemalloc peak of Python and NumPy allocations in this process
+    during the stage; allocations of child processes are not seen.
+    """
+    if memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    peak = None
+    if memory:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    record = {"stage": stage, "seconds": round(elapsed, 6), "peak_bytes": peak}
+    record.update(info)
+    print(f"  {stage:<8} {elapsed:>10.3f}s" + (f" {peak / 2 ** 20:>10.1f} MiB" if peak is not None else ""))
+    return result, record
+
+
+def bench_scrape(module, tracker, categories, results_per_page, memory):
+    """Time a full scrape_all_sources run over HTTP against the mock storefront."""
+    tracker.PRODUCT_CATEGORIES = [f"category-{i}" for i in range(categories)]
+    tracker.rate_limiter = module.HostRateLimiter(rate=1_000, burst=100)
+    tracker.init_driver = lambda: None  # Pages are plain HTML, no browser should start
+
+    with MockStorefront(results_per_page=results_per_page) as storefront:
+        tracker.SITE_URLS = storefront.site_urls()
+        _, record = measure("scrape", tracker.scrape_all_sources, memory)
+    # Every job crawls up to RESULT_PAGES result pages: count the pages it loaded
+    pages = sum(job["pages"] for job in tracker.last_run_summary["jobs"])
+    record["pages"] = pages
+    record["pages_per_minute"] = round(pages / record["seconds"] * 60, 1) if record["seconds"] else None
+
+    # Start the data stages from the generated snapshot only
+    for f in os.listdir(tracker.LOG_DIR):
+        if f.startswith("products_"):
+            os.remove(os.path.join(tracker.LOG_DIR, f))
+    return record
+
+
+def run_size(args, rows):
+    work_dir = tempfile.mkdtemp(prefix="bench_pipeline_")
+    tracker = None
+    try:
+        module, tracker = load_tracker(args.script, work_dir)
+        print(f"{rows:,} rows ({args.script})")
+        records = []
+
+        if not args.skip_scrape:
+            records.append(bench_scrape(module, tracker, args.categories, args.results_per_page, args.memory))
+
+        start = time.perf_counter()
+        path = generate_snapshot(tracker.LOG_DIR, rows, seed=args.seed)
+        print(f"  generated {os.path.getsize(path) / 2 ** 20:.1f} MiB in {time.perf_counter() - start:.1f}s")
+
+        df, record = measure("clean", tracker.clean_and_process_data, args.memory, rows=rows)
+        records.append(record)
+        # analyze returns once the tables are written; wait for its charts too
+        _, record = measure("analyze", lambda: wait(tracker.analyze_product_data(df)), args.memory, rows=rows)
+        records.append(record)
+        chart_path = os.path.join(tracker.ANALYSIS_OUTPUT_DIR, "bench_price_distribution.png")
+        _, record = measure("chart", lambda: price_distribution(df[["category", "price_cleaned"]], chart_path),
+                            args.memory, rows=rows)
+        records.append(record)
+
+        return {"rows": rows, "stages": records}
+    finally:
+        if tracker is not None:
+            # Stop the rendering processes before their output directory goes
+            tracker.chart_renderer().shutdown()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def environment():
+    try:
+        revision = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR,
+                                  capture_output=True, text=True).stdout.strip()
+    except OSError:
+        revision = None
+    return {
+        "git_revision": revision or None,
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "created": datetime.now().isoformat(timespec="seconds"),
+    }
+
+
+def compare(current, baseline_path):
+    """Print per-stage time ratios against an earlier result file."""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    old = {(r["rows"], s["stage"]): s for r in baseline["runs"] for s in r["stages"]}
+    print(f"\ncompared with {baseline_path} ({baseline['environment'].get('git_revision')})")
+    for run in current["runs"]:
+        for stage in run["stages"]:
+            before = old.get((run["rows"], stage["stage"]))
+            if before and stage["seconds"]:
+                ratio = before["seconds"] / stage["seconds"]
+                print(f"  {run['rows']:>12,} {stage['stage']:<8} {before['seconds']:>10.3f}s -> "
+                      f"{stage['seconds']:>10.3f}s  ({ratio:.2f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", nargs="+", default=["10k"], help="snapshot sizes, e.g. 10k 1m 10m")
+    parser.add_argument("--script", default="web_scraping_final.py", help="tracker script to benchmark")
+    parser.add_argument("--categories", type=int, default=10, help="categories per website for the scrape stage")
+    parser.add_argument("--results-per-page", type=int, default=20)
+    parser.add_argument("--skip-scrape", action="store_true", help="only benchmark the data stages")
+    parser.add_argument("--no-memory", dest="memory", action="store_false", help="disable tracemalloc")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="result file (default: benchmarks/results/pipeline_<timestamp>.json)")
+    parser.add_argument("--compare", help="earlier result file to compare against")
+    args = parser.parse_args()
+
+    # Keep benchmark runs out of logs/scraper.log; the tracker's basicConfig becomes a no-op
+    logging.basicConfig(level=logging.WARNING)
+
+    results = {"environment": environment(), "runs": [run_size(args, parse_rows(r)) for r in args.rows]}
+
+    output = args.output or os.path.join(RESULTS_DIR, f"pipeline_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"results written to {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
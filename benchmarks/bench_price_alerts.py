@@ -0,0 +1,87 @@
+"""
+Benchmark price-change detection as history grows: incremental state vs rescanning.
+
+For each daily run of synthetic products, times
+
+    incremental  price_alerts.PriceChangeDetector.observe + save (O(1) per product)
+    rescan       the same statistics recomputed with pandas over the whole history
+                 (groupby EWMA and rolling min/max), as a batch job would
+
+and prints the per-run cost at each checkpoint:
+
+    python benchmarks/bench_price_alerts.py --runs 10 100 500 --products 1000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from price_alerts import PriceChangeDetector
+
+
+def synthetic_run(rng, base_prices, day):
+    timestamp = (datetime(2024, 1, 1, 12) + timedelta(days=day)).strftime("%Y-%m-%d %H:%M:%S")
+    prices = base_prices * rng.normal(1.0, 0.02, len(base_prices))
+    # A few products drop sharply every day
+    drops = rng.random(len(base_prices)) < 0.01
+    prices[drops] *= 0.8
+    return [
+        {"product_key": f"Amazon:asin:{i:010d}", "name": f"Product {i}", "website": "Amazon",
+         "category": "laptops", "timestamp": timestamp, "price": f"{price:,.2f}"}
+        for i, price in enumerate(prices)
+    ]
+
+
+def rescan(history, alpha, window):
+    df = pd.DataFrame(history)
+    df["price_value"] = df["price"].str.replace(",", "").astype(float)
+    grouped = df.groupby("product_key")["price_value"]
+    stats = pd.DataFrame({
+        "ewma": grouped.transform(lambda s: s.ewm(alpha=alpha, adjust=False).mean()),
+        "low": grouped.transform(lambda s: s.rolling(window, min_periods=1).min()),
+        "high": grouped.transform(lambda s: s.rolling(window, min_periods=1).max()),
+        "product_key": df["product_key"],
+    })
+    return stats.groupby("product_key").tail(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, nargs="+", default=[10, 100, 500], help="checkpoints (total runs)")
+    parser.add_argument("--products", type=int, default=1000, help="products per run")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    base_prices = rng.uniform(20, 2500, args.products)
+    with tempfile.TemporaryDirectory(prefix="bench_price_alerts_") as work_dir:
+        detector = PriceChangeDetector(os.path.join(work_dir, "price_state.json"),
+                                       os.path.join(work_dir, "price_events.jsonl"))
+        history, events = [], 0
+        print(f"{args.products} products per run")
+        for checkpoint in sorted(args.runs):
+            while len(history) < checkpoint * args.products:
+                run = synthetic_run(rng, base_prices, len(history) // args.products)
+                history.extend(run)
+                start = time.perf_counter()
+                events += len(detector.observe(run))
+                detector.save()
+                incremental = time.perf_counter() - start
+
+            start = time.perf_counter()
+            rescan(history, detector.alpha, detector.window)
+            rescanned = time.perf_counter() - start
+            print(f"  {checkpoint:>5} runs  incremental {incremental * 1000:>8.1f} ms/run"
+                  f"   rescan {rescanned * 1000:>9.1f} ms/run   ({events:,} events so far)")
+
+
+if __name__ == "__main__":
+    main()
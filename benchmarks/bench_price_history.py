@@ -0,0 +1,93 @@
+"""
+Benchmark price-history lookups in the SQLite store as runs accumulate.
+
+Records daily runs of synthetic products into price_history.PriceHistoryStore and,
+at each checkpoint, times point lookups (one product over the last 90 days) and
+category lookups (one website/category over the last 7 days):
+
+    python benchmarks/bench_price_history.py --runs 10 100 1000 --products 500
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from price_history import PriceHistoryStore
+from product_identity import product_key
+
+WEBSITES = ["Amazon", "BestBuy"]
+CATEGORIES = ["laptops", "headphones", "smartphones", "monitors", "tablets"]
+
+
+def synthetic_run(rng, products, day):
+    timestamp = (datetime(2024, 1, 1, 12) + timedelta(days=day)).strftime("%Y-%m-%d %H:%M:%S")
+    return [
+        {
+            "name": f"Product {i}",
+            "price": f"{rng.randint(10, 2500):,}",
+            "rating": f"{rng.uniform(3.0, 5.0):.1f} out of 5 stars",
+            "category": CATEGORIES[i % len(CATEGORIES)],
+            "website": WEBSITES[i % len(WEBSITES)],
+            "timestamp": timestamp,
+        }
+        for i in range(products)
+    ]
+
+
+def time_lookups(fn, args_list):
+    timings = []
+    for args in args_list:
+        start = time.perf_counter()
+        fn(*args)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000, max(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, nargs="+", default=[10, 100, 1000], help="checkpoints (total runs)")
+    parser.add_argument("--products", type=int, default=500, help="products per run")
+    parser.add_argument("--lookups", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory(prefix="bench_price_history_") as work_dir:
+        store = PriceHistoryStore(os.path.join(work_dir, "price_history.db"))
+        recorded, insert_seconds = 0, 0.0
+        print(f"{args.products} products per run")
+        for checkpoint in sorted(args.runs):
+            while recorded < checkpoint:
+                products = synthetic_run(rng, args.products, recorded)
+                start = time.perf_counter()
+                store.record_run(products, source=f"run_{recorded}")
+                insert_seconds += time.perf_counter() - start
+                recorded += 1
+
+            last_day = datetime(2024, 1, 1) + timedelta(days=recorded)
+            since_90 = (last_day - timedelta(days=90)).strftime("%Y-%m-%d")
+            since_7 = (last_day - timedelta(days=7)).strftime("%Y-%m-%d")
+            points = []
+            for _ in range(args.lookups):
+                i = rng.randrange(args.products)
+                points.append((product_key(WEBSITES[i % len(WEBSITES)], f"Product {i}"), since_90))
+            categories = [(rng.choice(WEBSITES), rng.choice(CATEGORIES), since_7) for _ in range(args.lookups // 10)]
+
+            point_median, point_max = time_lookups(store.price_history, points)
+            category_median, category_max = time_lookups(store.category_history, categories)
+            size = sum(os.path.getsize(p) for p in (store.path, store.path + "-wal") if os.path.exists(p)) / 2 ** 20
+            print(f"  {recorded:>6} runs  {size:>8.1f} MiB  insert {insert_seconds / recorded * 1000:>7.2f} ms/run"
+                  f"  point {point_median:>6.2f} ms (max {point_max:.2f})"
+                  f"  category 7d {category_median:>6.2f} ms (max {category_max:.2f})")
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Benchmark readiness detection: how long the scraper waits for a results page
+and how much of the result grid it sees once it reads it.
+
+Loads results pages from a local mock storefront in Chrome (started with the
+tracker's init_driver) and waits for the result cards, once with the polling
+WebDriverWait presence check the scrapers used before and once with the
+page_ready probe:
+
+    python benchmarks/bench_readiness.py --pages 10 --latency 0.05 --script-results
+
+With --script-results the pages fill their grid with two fetch requests after
+loading, like sites rendering their results client-side, so a wait that
+returns at the first card reads a half-empty grid. Needs Chrome and
+chromedriver.
+"""
+import argparse
+import logging
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from page_ready import wait_until_ready
+from storefront import MockStorefront
+from tracker_cli import TRACKERS, load_tracker
+
+CARDS = "div[data-component-type='s-search-result']"
+
+
+def presence_wait(driver):
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    WebDriverWait(driver, 10).until(EC.presence_of_all_elements_located((By.CSS_SELECTOR, CARDS)))
+
+
+def probe_wait(driver):
+    wait_until_ready(driver, CARDS, timeout=10)
+
+
+def load_pages(driver, urls, wait):
+    """Load every url and wait for its cards, returning (seconds waited, cards seen) per page."""
+    samples = []
+    for url in urls:
+        driver.get(url)
+        start = time.perf_counter()
+        wait(driver)
+        elapsed = time.perf_counter() - start
+        samples.append((elapsed, driver.execute_script(f"return document.querySelectorAll({CARDS!r}).length")))
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tracker", default="web_scraping_final", choices=TRACKERS)
+    parser.add_argument("--pages", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds the storefront delays every response")
+    parser.add_argument("--script-results", action="store_true", help="pages fetch their cards after loading")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    work_dir = tempfile.mkdtemp(prefix="bench_readiness_")
+    try:
+        tracker = load_tracker(args.tracker)()
+        tracker.PROCESSED_DATA_DIR = work_dir  # Cached chromedriver path
+        tracker.KEEP_BROWSERS_WARM = False
+        with MockStorefront(latency=args.latency, script_results=args.script_results) as storefront:
+            base_url = storefront.site_urls()["Amazon"]
+            urls = [f"{base_url}/s?k=laptops&page={page}" for page in range(1, args.pages + 1)]
+            try:
+                driver = tracker.init_driver(os.path.join(work_dir, "profile"))
+            except Exception as e:
+                driver = None
+                logging.debug(f"init_driver failed: {e}")
+            if driver is None:
+                raise SystemExit("Chrome could not be started, this benchmark needs Chrome and chromedriver")
+            try:
+                print(f"{args.pages} results pages of {storefront.results_per_page} cards, storefront latency "
+                      f"{args.latency:.2f}s{', rendered by scripts' if args.script_results else ''}")
+                print(f"  {'wait':<9} {'mean (s)':>9} {'max (s)':>8} {'cards seen':>11}")
+                for name, wait in (("presence", presence_wait), ("probe", probe_wait)):
+                    load_pages(driver, urls[:1], wait)  # Warm up the browser
+                    samples = load_pages(driver, urls, wait)
+                    print(f"  {name:<9} {statistics.fmean(s for s, _ in samples):>9.3f} "
+                          f"{max(s for s, _ in samples):>8.3f} {statistics.fmean(c for _, c in samples):>11.1f}")
+            finally:
+                driver.quit()
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark tracker start-up: lazy imports vs importing everything at load.
+
+Runs each tracker_cli command in a fresh interpreter on an empty data
+directory (so the command itself does almost no work) and prints the median
+wall time, with
+
+    lazy   the tracker as it is: heavy dependencies imported by the code paths using them
+    eager  the same command after importing every dependency the tracker scripts
+           used to import at module load (selenium, webdriver_manager, requests,
+           bs4, matplotlib, seaborn, fake_useragent)
+
+plus the heavy modules the lazy command actually loaded:
+
+    python benchmarks/bench_startup.py --tracker web_scraping_final --repeat 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CLI = os.path.join(REPO_DIR, "tracker_cli.py")
+
+EAGER_IMPORTS = [
+    "selenium.webdriver", "selenium.webdriver.support.ui", "selenium.webdriver.support.expected_conditions",
+    "selenium.webdriver.chrome.service", "webdriver_manager.chrome", "requests", "bs4",
+    "matplotlib.pyplot", "seaborn", "fake_useragent",
+]
+HEAVY_MODULES = ["pandas", "pyarrow"] + EAGER_IMPORTS
+
+CHILD = """
+import importlib, json, runpy, sys
+for name in {preload!r}:
+    importlib.import_module(name)
+sys.argv = {argv!r}
+runpy.run_path({cli!r}, run_name="__main__")
+print("LOADED " + json.dumps([name for name in {heavy!r} if name in sys.modules]))
+"""
+
+
+def run(argv, preload):
+    code = CHILD.format(preload=preload, argv=[CLI] + argv, cli=CLI, heavy=HEAVY_MODULES)
+    start = time.perf_counter()
+    # -c puts the working directory on sys.path, where the tracker modules live
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, cwd=REPO_DIR)
+    elapsed = time.perf_counter() - start
+    loaded = next(json.loads(line[7:]) for line in result.stdout.splitlines() if line.startswith("LOADED "))
+    return elapsed, loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tracker", default="web_scraping_final",
+                        choices=["web_scraping_final", "group.final", "improvising"])
+    parser.add_argument("--commands", nargs="+", default=["process", "analyze"])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="bench_startup_") as data_dir:
+        print(f"{args.tracker}, median of {args.repeat} runs")
+        for command in args.commands:
+            argv = ["--tracker", args.tracker, "--data-dir", data_dir, command]
+            times = {}
+            for mode, preload in (("eager", EAGER_IMPORTS), ("lazy", [])):
+                samples = [run(argv, preload) for _ in range(args.repeat)]
+                times[mode] = statistics.median(elapsed for elapsed, _ in samples)
+                loaded = samples[-1][1]
+            print(f"  {command:8s} eager {times['eager']:6.2f}s   lazy {times['lazy']:6.2f}s"
+                  f"   ({times['lazy'] / times['eager']:.0%})   lazy loaded: {', '.join(loaded) or '-'}")
+        start = time.perf_counter()
+        subprocess.run([sys.executable, CLI, "--help"], capture_output=True, check=True)
+        print(f"  --help   {time.perf_counter() - start:6.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Benchmark historical reads of raw snapshots: CSV files vs the partitioned Parquet store.
+
+Writes the same synthetic history (one snapshot per day) both as logs/products_<ts>.csv
+files and as a columnar_store.ParquetStore, then compares disk usage and the time to
+read it back:
+
+    full     every column of every snapshot
+    pruned   the columns an analysis needs, one website, the last week only
+
+    python benchmarks/bench_storage.py --snapshots 30 --rows 100k
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_pipeline import parse_rows, synthetic_chunk
+from columnar_store import ParquetStore, partition_filter, raw_schema
+
+PRUNED_COLUMNS = ["category", "website", "price"]
+
+
+def directory_size(path):
+    return sum(os.path.getsize(os.path.join(root, f)) for root, _, files in os.walk(path) for f in files)
+
+
+def timed(fn, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--snapshots", type=int, default=30, help="daily snapshots of history")
+    parser.add_argument("--rows", default="100k", help="rows per snapshot, e.g. 10k or 1m")
+    parser.add_argument("--repeat", type=int, default=3, help="best of this many reads")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rows = parse_rows(args.rows)
+    rng = np.random.default_rng(args.seed)
+    work_dir = tempfile.mkdtemp(prefix="bench_storage_")
+    try:
+        csv_dir = os.path.join(work_dir, "logs")
+        os.makedirs(csv_dir)
+        store = ParquetStore(os.path.join(work_dir, "products"), raw_schema())
+
+        first_day = datetime(2024, 12, 1, 15, 22, 14)
+        for day in range(args.snapshots):
+            snapshot_time = first_day + timedelta(days=day)
+            chunk = synthetic_chunk(rng, 0, rows, snapshot_time)
+            name = f"products_{snapshot_time.strftime('%Y%m%d_%H%M%S')}"
+            chunk.to_csv(os.path.join(csv_dir, f"{name}.csv"), index=False)
+            store.write(chunk, name)
+
+        csv_bytes, parquet_bytes = directory_size(csv_dir), directory_size(store.root)
+        print(f"{args.snapshots} snapshots x {rows:,} rows")
+        print(f"  size     csv {csv_bytes / 2 ** 20:>9.1f} MiB   parquet {parquet_bytes / 2 ** 20:>9.1f} MiB"
+              f"   ({csv_bytes / parquet_bytes:.1f}x smaller)")
+
+        csv_files = sorted(os.path.join(csv_dir, f) for f in os.listdir(csv_dir))
+        since = (first_day + timedelta(days=args.snapshots - 7)).strftime("%Y-%m-%d")
+
+        def csv_full():
+            return pd.concat([pd.read_csv(f) for f in csv_files], ignore_index=True)
+
+        def csv_pruned():
+            # The best CSV can do: skip files by name, parse only some columns, filter rows after loading
+            recent = [f for f in csv_files if os.path.basename(f)[9:17] >= since.replace("-", "")]
+            df = pd.concat([pd.read_csv(f, usecols=PRUNED_COLUMNS) for f in recent], ignore_index=True)
+            return df[df["website"] == "Amazon"]
+
+        reads = [
+            ("full", csv_full, lambda: store.read()),
+            ("pruned", csv_pruned, lambda: store.read(PRUNED_COLUMNS, partition_filter(since=since, websites=["Amazon"]))),
+        ]
+        for label, csv_read, parquet_read in reads:
+            csv_df, csv_seconds = timed(csv_read, args.repeat)
+            parquet_df, parquet_seconds = timed(parquet_read, args.repeat)
+            assert len(csv_df) == len(parquet_df), (label, len(csv_df), len(parquet_df))
+            print(f"  {label:<8} csv {csv_seconds:>9.3f}s     parquet {parquet_seconds:>9.3f}s"
+                  f"     ({csv_seconds / parquet_seconds:.1f}x faster, {len(parquet_df):,} rows)")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
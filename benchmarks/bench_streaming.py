@@ -0,0 +1,96 @@
+"""
+Benchmark peak memory of saving a scrape run: accumulate-then-save vs streaming.
+
+Runs scrape_pool.ScrapePool over synthetic jobs (no network, fetch_fn returns
+generated products) and saves the products to a CSV snapshot either
+
+    accumulate  merge every job's products at the end, then write them (the old path)
+    streaming   hand each finished job to a snapshot_writer.CsvSnapshotWriter
+
+and reports the tracemalloc peak for growing run sizes:
+
+    python benchmarks/bench_streaming.py --jobs 10 100 1000 --products 200
+"""
+import argparse
+import csv
+import logging
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from columnar_store import RAW_COLUMNS
+from scrape_pool import ScrapePool
+from snapshot_writer import CsvSnapshotWriter
+
+
+def synthetic_fetch(products):
+    def fetch(website, category):
+        return [
+            {
+                "name": f"{website} {category} product {i} with a long scraped title, 16GB RAM, 512GB SSD",
+                "price": f"{100 + i % 900:,}.99",
+                "rating": "4.5 out of 5 stars",
+                "category": category,
+                "website": website,
+                "timestamp": "2024-12-09 15:23:36",
+                "product_key": f"{website}:sku:{category}-{i}",
+            }
+            for i in range(products)
+        ]
+    return fetch
+
+
+def merge_job_products(jobs):
+    """Flatten the products of completed jobs, keeping submission order."""
+    all_products = []
+    for job in sorted(jobs, key=lambda j: j.index):
+        all_products.extend(job.products)
+    return all_products
+
+
+def accumulate(targets, fetch, path, batch_size):
+    jobs = ScrapePool(lambda: None, None, pool_size=2, fetch_fn=fetch).run(targets)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=RAW_COLUMNS, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(merge_job_products(jobs))
+
+
+def streaming(targets, fetch, path, batch_size):
+    with CsvSnapshotWriter(path, RAW_COLUMNS, batch_size) as writer:
+        ScrapePool(lambda: None, None, pool_size=2, fetch_fn=fetch,
+                   on_job_done=lambda job: writer.write(job.products)).run(targets)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, nargs="+", default=[10, 100, 1000], help="(website, category) jobs per run")
+    parser.add_argument("--products", type=int, default=200, help="products per job")
+    parser.add_argument("--batch-size", type=int, default=200)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    fetch = synthetic_fetch(args.products)
+    with tempfile.TemporaryDirectory(prefix="bench_streaming_") as work_dir:
+        for jobs in args.jobs:
+            targets = [("Amazon" if i % 2 else "BestBuy", f"category{i}") for i in range(jobs)]
+            line = f"{jobs * args.products:>10,} products"
+            for label, save in (("accumulate", accumulate), ("streaming", streaming)):
+                path = os.path.join(work_dir, f"{label}_{jobs}.csv")
+                tracemalloc.start()
+                start = time.perf_counter()
+                save(targets, fetch, path, args.batch_size)
+                elapsed = time.perf_counter() - start
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                line += f"   {label} {elapsed:>6.2f}s {peak / 2 ** 20:>8.1f} MiB"
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
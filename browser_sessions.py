@@ -0,0 +1,259 @@
+"""
+Warm, reusable browser sessions.
+
+Starting Chrome for every run pays for driver resolution, the browser's cold
+start and the sites' cookie/consent handling each time. BrowserManager keeps
+sessions open between runs instead:
+
+- the chromedriver path resolved by webdriver_manager is cached in a file
+  (ChromeDriverCache), so later starts need no network access;
+- every session slot keeps its own persistent profile directory (Chrome locks
+  a profile while it runs), so cookies and consent survive restarts;
+- an idle session is health-checked before it is handed out again, and
+  recycled (quit and restarted on the same profile) after max_pages pages or
+  once its processes use more than max_memory_mb of memory.
+"""
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+class ChromeDriverCache:
+    def __init__(self, cache_file):
+        """
+        Chromedriver binary path, resolved once with webdriver_manager.
+
+        Args:
+            cache_file (str): JSON file the resolved path is kept in
+        """
+        self.cache_file = cache_file
+        self._lock = threading.Lock()
+
+    def path(self, refresh=False):
+        """
+        Path of the chromedriver binary.
+
+        Args:
+            refresh (bool): Resolve it again (e.g. when the cached driver no longer
+                matches the installed Chrome)
+
+        Returns:
+            str: Executable chromedriver path
+        """
+        with self._lock:
+            if not refresh:
+                try:
+                    with open(self.cache_file, encoding='utf-8') as f:
+                        cached = json.load(f).get('path')
+                    if cached and os.access(cached, os.X_OK):
+                        return cached
+                except (OSError, ValueError):
+                    pass
+
+            from webdriver_manager.chrome import ChromeDriverManager
+
+            path = ChromeDriverManager().install()
+            tmp_path = self.cache_file + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'path': path, 'resolved_at': time.time()}, f)
+            os.replace(tmp_path, self.cache_file)
+            logging.info(f"Resolved chromedriver {path}")
+            return path
+
+
+def _process_tree_rss(pid):
+    """Resident memory in bytes of a process and all its descendants, or None."""
+    if psutil is not None:
+        try:
+            root = psutil.Process(pid)
+            processes = [root] + root.children(recursive=True)
+        except psutil.Error:
+            return None
+        total = 0
+        for process in processes:
+            try:
+                total += process.memory_info().rss
+            except psutil.Error:
+                pass
+        return total
+
+    # Without psutil, read /proc (Linux)
+    if not os.path.isdir('/proc'):
+        return None
+    children = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat', encoding='utf-8') as f:
+                # The command name may contain spaces; the fields after it are fixed
+                ppid = int(f.read().rsplit(')', 1)[1].split()[1])
+        except (OSError, ValueError, IndexError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+    page_size = os.sysconf('SC_PAGE_SIZE')
+    total, stack = 0, [pid]
+    while stack:
+        current = stack.pop()
+        try:
+            with open(f'/proc/{current}/statm', encoding='utf-8') as f:
+                total += int(f.read().split()[1]) * page_size
+        except (OSError, ValueError, IndexError):
+            if current == pid:
+                return None
+            continue
+        stack.extend(children.get(current, []))
+    return total
+
+
+class BrowserSession:
+    """A running browser, the profile slot it uses and the pages it has served."""
+
+    def __init__(self, driver, slot, profile_dir):
+        self.driver = driver
+        self.slot = slot
+        self.profile_dir = profile_dir
+        self.pages = 0
+        self.started_at = time.time()
+
+    def is_alive(self):
+        """Health check: the driver process runs and the browser answers a script."""
+        process = getattr(getattr(self.driver, 'service', None), 'process', None)
+        if process is not None and process.poll() is not None:
+            return False
+        try:
+            self.driver.execute_script("return 1")
+            return True
+        except Exception:
+            return False
+
+    def memory_mb(self):
+        """Memory of the driver and browser processes in MiB, or None if it cannot be measured."""
+        process = getattr(getattr(self.driver, 'service', None), 'process', None)
+        if process is None:
+            return None
+        rss = _process_tree_rss(process.pid)
+        return None if rss is None else rss / 2 ** 20
+
+    def quit(self):
+        try:
+            self.driver.quit()
+        except Exception as e:
+            logging.warning(f"Error closing browser session {self.slot}: {e}")
+
+
+class BrowserManager:
+    def __init__(self, launch, profile_root=None, max_pages=200, max_memory_mb=1500):
+        """
+        Pool of warm browser sessions shared by scrape runs.
+
+        Thread safe: every scrape worker acquires a session for a job and
+        releases it afterwards, and idle sessions stay open for the next job
+        or the next run.
+
+        Args:
+            launch (callable): launch(profile_dir) -> WebDriver, or None on failure
+            profile_root (str): Directory of the persistent profiles (profile-<slot>),
+                None for throwaway profiles
+            max_pages (int): Pages a session serves before it is recycled
+            max_memory_mb (float): Memory of a session's processes past which it is
+                recycled (None disables the check)
+        """
+        self.launch = launch
+        self.profile_root = profile_root
+        self.max_pages = max_pages
+        self.max_memory_mb = max_memory_mb
+        self.started = 0
+        self.recycled = 0
+        self.closed = False
+        self._idle = []
+        self._busy_slots = set()
+        self._lock = threading.Lock()
+        atexit.register(self.close)
+
+    def _free_slot(self):
+        taken = self._busy_slots | {session.slot for session in self._idle}
+        slot = 0
+        while slot in taken:
+            slot += 1
+        return slot
+
+    def acquire(self):
+        """
+        A healthy session: an idle one if there is any, otherwise a new browser.
+
+        Returns:
+            BrowserSession or None: None when the browser could not be started
+        """
+        while True:
+            with self._lock:
+                if not self._idle:
+                    slot = self._free_slot()
+                    self._busy_slots.add(slot)
+                    break
+                session = self._idle.pop()
+                self._busy_slots.add(session.slot)
+            if session.is_alive():
+                return session
+            logging.warning(f"Browser session {session.slot} stopped responding, restarting it")
+            session.quit()
+            with self._lock:
+                self._busy_slots.discard(session.slot)
+
+        profile_dir = None
+        if self.profile_root:
+            profile_dir = os.path.join(self.profile_root, f'profile-{slot}')
+            os.makedirs(profile_dir, exist_ok=True)
+        try:
+            driver = self.launch(profile_dir)
+        except Exception as e:
+            logging.error(f"Failed to start browser session {slot}: {e}")
+            driver = None
+        if driver is None:
+            with self._lock:
+                self._busy_slots.discard(slot)
+            return None
+        self.started += 1
+        return BrowserSession(driver, slot, profile_dir)
+
+    def release(self, session, pages=1):
+        """
+        Return a session after it served pages, recycling it when it is worn out.
+
+        Args:
+            session (BrowserSession): Session from acquire
+            pages (int): Pages loaded since it was acquired
+        """
+        session.pages += pages
+        reason = None
+        if self.max_pages and session.pages >= self.max_pages:
+            reason = f"{session.pages} pages"
+        elif self.max_memory_mb:
+            memory = session.memory_mb()
+            if memory is not None and memory > self.max_memory_mb:
+                reason = f"{memory:.0f} MiB of memory"
+        if reason:
+            logging.info(f"Recycling browser session {session.slot} after {reason}")
+            self.recycled += 1
+        with self._lock:
+            self._busy_slots.discard(session.slot)
+            if not reason and not self.closed:
+                self._idle.append(session)
+                return
+        session.quit()
+
+    def close(self):
+        """Quit the idle sessions; busy ones are quit when they are released."""
+        with self._lock:
+            self.closed = True
+            idle, self._idle = self._idle, []
+        for session in idle:
+            session.quit()
@@ -0,0 +1,220 @@
+"""
+Off-thread chart rendering.
+
+Charts are rendered by module-level functions in a pool of worker processes
+with matplotlib's non-interactive Agg backend, so rendering never needs a
+display and never blocks the thread that schedules scraping and analysis.
+ChartRenderer.submit returns a future per chart: analysis tables are written
+right away while the images finish in the background.
+
+A chart is rendered to a temporary file next to its output and renamed into
+place when it is done, so readers never see a half-written image, and a chart
+submitted again before an older render of the same file finished always wins
+over it.
+"""
+import itertools
+import logging
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from concurrent.futures import CancelledError, Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import nullcontext
+
+import pandas as pd
+
+
+def _plotting():
+    """
+    Import the plotting libraries with the headless Agg backend selected.
+
+    Only the processes that draw charts pay for importing matplotlib and
+    seaborn; the backend must be chosen before either creates a figure.
+    """
+    import matplotlib
+    matplotlib.use('Agg')
+    import seaborn as sns
+    from matplotlib.figure import Figure
+    return Figure, sns
+
+
+def _save(fig, path):
+    fig.tight_layout()
+    fig.savefig(path)
+
+
+def price_distribution(df, path, figsize=(12, 6), hue=None, title='Price Distribution by Product Category'):
+    """Boxplot of prices per category (and per website with hue='website')."""
+    Figure, sns = _plotting()
+    fig = Figure(figsize=figsize)
+    ax = fig.subplots()
+    sns.boxplot(x='category', y='price_cleaned', hue=hue, data=df, ax=ax)
+    ax.set_title(title)
+    ax.tick_params(axis='x', labelrotation=45)
+    _save(fig, path)
+
+
+def website_price_comparison(df, path, figsize=(12, 6)):
+    """Bar chart of the mean price per category, one bar per website."""
+    Figure, _ = _plotting()
+    fig = Figure(figsize=figsize)
+    ax = fig.subplots()
+    df.groupby(['category', 'website'])['price_cleaned'].mean().unstack().plot.bar(ax=ax)
+    ax.set_title('Average Price by Category and Website')
+    ax.set_ylabel('Average price')
+    ax.tick_params(axis='x', labelrotation=45)
+    _save(fig, path)
+
+
+def price_trend(df, path, figsize=(12, 6)):
+    """Daily median price per category and website."""
+    daily = df.assign(date=pd.to_datetime(df['timestamp'], errors='coerce').dt.normalize()).dropna(subset=['date'])
+    Figure, sns = _plotting()
+    fig = Figure(figsize=figsize)
+    ax = fig.subplots()
+    sns.lineplot(x='date', y='price_cleaned', hue='category', style='website', estimator='median',
+                 errorbar=None, marker='o', data=daily, ax=ax)
+    ax.set_title('Median Price Trend')
+    ax.set_ylabel('Median price')
+    ax.tick_params(axis='x', labelrotation=45)
+    _save(fig, path)
+
+
+def category_price_histogram(df, path, category, figsize=(10, 5), bins=30):
+    """Histogram of the prices of one category, stacked by website."""
+    Figure, sns = _plotting()
+    fig = Figure(figsize=figsize)
+    ax = fig.subplots()
+    sns.histplot(x='price_cleaned', hue='website', multiple='stack', bins=bins,
+                 data=df[df['category'] == category], ax=ax)
+    ax.set_title(f'Price Histogram: {category}')
+    _save(fig, path)
+
+
+def _init_worker():
+    # Ctrl+C is handled by the parent, which shuts the pool down
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _plotting()
+
+
+def _render(chart, df, path, params):
+    start = time.perf_counter()
+    chart(df, path, **params)
+    return time.perf_counter() - start
+
+
+def completed(result):
+    """An already finished future holding result."""
+    future = Future()
+    future.set_result(result)
+    return future
+
+
+class ChartRenderer:
+    def __init__(self, max_workers=2, profiler=None):
+        """
+        Pool of processes rendering charts in the background.
+
+        Args:
+            max_workers (int): Rendering processes; 0 renders in the calling thread
+            profiler (StageProfiler): Optional profiler of the charts rendered in the
+                calling thread, each as stage plot/<image file>
+        """
+        self.max_workers = max_workers
+        self.profiler = profiler
+        self._executor = None
+        self._latest = {}
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def _pool(self):
+        if self._executor is None:
+            # Spawned (not forked) workers do not inherit the parent's threads and locks
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers,
+                                                 mp_context=multiprocessing.get_context('spawn'),
+                                                 initializer=_init_worker)
+        return self._executor
+
+    def _discard_pool(self, executor):
+        """Shut a broken pool down without waiting for it; the next chart starts a new one."""
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def submit(self, chart, df, path, **params):
+        """
+        Render a chart to path in the background.
+
+        Args:
+            chart (callable): Module-level chart(df, path, **params) function
+            df (pandas.DataFrame): Data the chart is drawn from; select only the
+                columns it needs, the frame is copied to the rendering process
+            path (str): Output image file
+            **params: Keyword arguments of the chart function
+
+        Returns:
+            concurrent.futures.Future: Resolves to path once the image is in place,
+                to None when a newer render of path replaced it, or raises the
+                rendering error
+        """
+        root, ext = os.path.splitext(path)
+        with self._lock:
+            tmp_path = f'{root}.{os.getpid()}-{next(self._counter)}.tmp{ext}'
+            self._latest[path] = tmp_path
+        result = Future()
+        result.set_running_or_notify_cancel()
+        render = executor = None
+        if self.max_workers > 0:
+            try:
+                executor = self._pool()
+                render = executor.submit(_render, chart, df, tmp_path, params)
+            except (BrokenProcessPool, RuntimeError, OSError) as e:
+                logging.error(f"Chart rendering pool unavailable, rendering {path} in this thread: {e}")
+                if executor is not None:
+                    self._discard_pool(executor)
+                executor = None
+        if render is None:
+            render = Future()
+            stage = self.profiler.stage(f'plot/{os.path.basename(path)}') if self.profiler else nullcontext()
+            try:
+                with stage:
+                    render.set_result(_render(chart, df, tmp_path, params))
+            except Exception as e:
+                render.set_exception(e)
+        render.add_done_callback(lambda done: self._publish(done, tmp_path, path, result, executor))
+        return result
+
+    def _publish(self, render, tmp_path, path, result, executor=None):
+        with self._lock:
+            latest = self._latest.get(path) == tmp_path
+            if latest:
+                del self._latest[path]
+        error = CancelledError() if render.cancelled() else render.exception()
+        if isinstance(error, BrokenProcessPool) and executor is not None:
+            # A worker died; release the dead pool, the next chart starts a new one
+            self._discard_pool(executor)
+        if error is None and latest:
+            try:
+                os.replace(tmp_path, path)
+            except OSError as e:
+                error = e
+            else:
+                logging.info(f"Rendered {os.path.basename(path)} in {render.result():.2f}s")
+                result.set_result(path)
+                return
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        if error is not None:
+            logging.error(f"Error rendering {os.path.basename(path)}: {error}")
+            result.set_exception(error)
+        else:
+            result.set_result(None)
+
+    def shutdown(self, wait=True):
+        """Stop the rendering processes, by default after the submitted charts are done."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=not wait)
+            self._executor = None
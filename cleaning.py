@@ -0,0 +1,139 @@
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    pa = None
+
+# Plain decimals that every correctly rounded parser (Python's float() and Arrow's
+# cast alike) turns into the same double. Digit counts are capped so the value can
+# never overflow; anything else ("nan", "1_000", " 12", ...) takes the scalar path.
+_PLAIN_NUMBER = r"^[+-]?(?:[0-9]{1,30}(?:\.[0-9]{0,30})?|\.[0-9]{1,30})(?:[eE][+-]?[0-9]{1,2})?$"
+# Digits, a space, more digits ("1299 99"): float() always rejects inner whitespace
+_SPACED_DIGITS = r"^[+-]?[0-9.]+ +[0-9]"
+
+
+def parse_price(price, first_token=False):
+    """
+    Scalar price parser, the reference for parse_prices.
+
+    Strips '$' and ',' and converts to float, e.g. "$1,299.99" -> 1299.99.
+    With first_token only the first whitespace separated part is kept,
+    so improvising.py's joined whole/fraction "1,299 99" -> 1299.0.
+
+    Returns:
+        float: Parsed price, or NaN when the text is not a number
+    """
+    try:
+        cleaned = str(price).replace('$', '').replace(',', '')
+        if first_token:
+            cleaned = cleaned.split()[0]
+        return float(cleaned)
+    except (ValueError, IndexError):
+        return np.nan
+
+
+def parse_rating(rating, strings_only=False, fill=np.nan):
+    """
+    Scalar rating parser, the reference for parse_ratings.
+
+    Keeps the first word and converts it to float, e.g. "4.5 out of 5 stars" -> 4.5.
+    With strings_only, values that are not str (NaN, numbers) give fill,
+    matching group.final.py's rating.split() without str().
+
+    Returns:
+        float: Parsed rating, or fill when it cannot be parsed
+    """
+    if strings_only and not isinstance(rating, str):
+        return fill
+    try:
+        return float(str(rating).split()[0])
+    except (ValueError, IndexError):
+        return fill
+
+
+def _parse_numbers(values, scalar, strip_chars, first_token, strings_only):
+    values = pd.Series(values)
+    if values.dtype.kind in 'iuf':
+        # Numeric columns: str() of a number round-trips exactly through float()
+        if strings_only:
+            return pd.Series(scalar(None), index=values.index, dtype='float64')
+        return values.astype('float64')
+
+    if pa is None:
+        return values.map(scalar).astype('float64')
+    try:
+        # Zero-copy for Arrow-backed string columns, one C pass for object columns
+        text = pa.array(values, type=pa.string(), from_pandas=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Numbers mixed into a text column
+        return values.map(scalar).astype('float64')
+    missing = text.is_null().to_numpy(zero_copy_only=False)
+
+    for char in strip_chars:
+        text = pc.replace_substring(text, char, '')
+    if first_token:
+        # Text up to the first space; when that is a plain number it equals str.split()[0]
+        text = pc.list_element(pc.split_pattern(text, ' ', max_splits=1), 0)
+    matched = pc.fill_null(pc.match_substring_regex(text, _PLAIN_NUMBER), False)
+
+    result = pc.cast(pc.if_else(matched, text, None), pa.float64()).to_numpy(zero_copy_only=False)
+    result = result.copy() if not result.flags.writeable else result
+    matched = matched.to_numpy(zero_copy_only=False)
+
+    # Missing values are NaN, None or NA; each kind always parses the same way
+    missing_positions = np.flatnonzero(missing)
+    if len(missing_positions):
+        kinds = values.iloc[missing_positions].map(type)
+        for kind in kinds.unique():
+            positions = missing_positions[(kinds == kind).to_numpy()]
+            result[positions] = scalar(values.iloc[positions[0]])
+
+    handled = matched | missing
+    if not first_token:
+        spaced = pc.fill_null(pc.match_substring_regex(text, _SPACED_DIGITS), False).to_numpy(zero_copy_only=False)
+        positions = np.flatnonzero(spaced & ~handled)
+        if len(positions):
+            result[positions] = scalar(values.iloc[positions[0]])
+            handled |= spaced
+
+    # Text outside the plain number pattern goes through the reference parser
+    rest = np.flatnonzero(~handled)
+    if len(rest):
+        result[rest] = [scalar(v) for v in values.iloc[rest]]
+    return pd.Series(result, index=values.index)
+
+
+def parse_prices(prices, first_token=False):
+    """
+    Vectorized parse_price for a whole column.
+
+    Output is bit-identical to prices.apply(parse_price). With pyarrow installed
+    the stripping, token split and float conversion run as Arrow compute kernels;
+    without it the scalar parser is used.
+
+    Args:
+        prices (pandas.Series): Raw price column as scraped
+        first_token (bool): Keep only the first whitespace separated part (improvising.py)
+
+    Returns:
+        pandas.Series: float64 prices with NaN where parsing failed
+    """
+    return _parse_numbers(prices, lambda p: parse_price(p, first_token), ('$', ','), first_token, False)
+
+
+def parse_ratings(ratings, strings_only=False, fill=np.nan):
+    """
+    Vectorized parse_rating for a whole column.
+
+    Args:
+        ratings (pandas.Series): Raw rating column as scraped
+        strings_only (bool): Give fill for values that are not str
+        fill (float): Value used when a rating cannot be parsed
+
+    Returns:
+        pandas.Series: float64 ratings
+    """
+    return _parse_numbers(ratings, lambda r: parse_rating(r, strings_only, fill), (), True, strings_only)
@@ -0,0 +1,311 @@
+"""
+Partitioned Parquet storage for raw snapshots and processed data.
+
+Rows are stored under hive style partitions
+
+    <root>/date=YYYY-MM-DD/website=<website>/category=<category>/<snapshot>-<n>.parquet
+
+with an explicit schema, so reads never infer dtypes and can skip whole
+directories (predicate pushdown on date/website/category) and unread columns.
+
+Convert existing CSV snapshots, or export a store back to CSV:
+    python columnar_store.py import logs logs/products
+    python columnar_store.py export processed_data/processed out.csv --website Amazon --since 2024-12-01
+"""
+import argparse
+import glob
+import logging
+import os
+from datetime import datetime
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+# Columns written by save_to_csv, in file order
+RAW_COLUMNS = ['name', 'price', 'rating', 'category', 'website', 'timestamp', 'product_key']
+PARTITION_COLUMNS = ['date', 'website', 'category']
+# Suffix of data files written but not yet published
+PENDING_SUFFIX = '.pending'
+# Text pandas.read_csv reads as missing by default; stored as null so both formats clean the same
+CSV_NA_VALUES = ['', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+                 '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null']
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("pyarrow is required for the parquet storage format (pip install pyarrow)")
+
+
+def raw_schema():
+    """Schema of raw snapshots: the scraped text exactly as saved."""
+    _require_pyarrow()
+    return pa.schema([(name, pa.string()) for name in RAW_COLUMNS])
+
+
+def processed_schema(*float_columns):
+    """Schema of processed data: raw text columns plus the cleaned float columns."""
+    _require_pyarrow()
+    return pa.schema(list(raw_schema()) + [(name, pa.float64()) for name in float_columns])
+
+
+def partition_filter(since=None, until=None, websites=None, categories=None):
+    """
+    Build a dataset filter on the partition columns.
+
+    Args:
+        since (str): First date to include, 'YYYY-MM-DD'
+        until (str): Last date to include, 'YYYY-MM-DD'
+        websites (list): Websites to include
+        categories (list): Categories to include
+
+    Returns:
+        pyarrow.dataset.Expression or None: Filter, or None to read everything
+    """
+    _require_pyarrow()
+    conditions = []
+    if since:
+        conditions.append(ds.field('date') >= since)
+    if until:
+        conditions.append(ds.field('date') <= until)
+    if websites:
+        conditions.append(ds.field('website').isin(list(websites)))
+    if categories:
+        conditions.append(ds.field('category').isin(list(categories)))
+    if not conditions:
+        return None
+    expression = conditions[0]
+    for condition in conditions[1:]:
+        expression = expression & condition
+    return expression
+
+
+def snapshot_id(path):
+    """Snapshot a data file belongs to: 'products_20241209_152336-0.parquet' -> 'products_20241209_152336'"""
+    return os.path.basename(path).rsplit('-', 1)[0]
+
+
+class ParquetStore:
+    def __init__(self, root, schema, compression='zstd'):
+        """
+        Parquet dataset partitioned by date, website and category.
+
+        Args:
+            root (str): Dataset directory
+            schema (pyarrow.Schema): Data columns (must include timestamp, website and category)
+            compression (str): Parquet compression codec
+        """
+        _require_pyarrow()
+        self.root = root
+        self.schema = schema
+        self.compression = compression
+        # Partition values are typed explicitly too, so e.g. a date is never read back as a number
+        self.partitioning = ds.partitioning(
+            pa.schema([('date', pa.string()), ('website', pa.string()), ('category', pa.string())]),
+            flavor='hive',
+        )
+        self.dataset_schema = pa.schema(
+            [field for field in schema if field.name not in PARTITION_COLUMNS]
+            + list(self.partitioning.schema)
+        )
+
+    def files(self):
+        """All data files of the store, in snapshot order."""
+        paths = glob.glob(os.path.join(self.root, '**', '*.parquet'), recursive=True)
+        return sorted(paths, key=lambda p: (snapshot_id(p), p))
+
+    def snapshot_ids(self):
+        return {snapshot_id(path) for path in self.files()}
+
+    def pending_files(self):
+        """Data files written by a snapshot that has not been published yet."""
+        return sorted(glob.glob(os.path.join(self.root, '**', f'*.parquet{PENDING_SUFFIX}'), recursive=True))
+
+    def new_snapshot_id(self, prefix):
+        """Timestamped snapshot name not used by any file in the store yet."""
+        stem = f'{prefix}{datetime.now().strftime("%Y%m%d_%H%M%S")}'
+        existing = self.snapshot_ids() | {snapshot_id(path[:-len(PENDING_SUFFIX)]) for path in self.pending_files()}
+        name, counter = stem, 1
+        while name in existing:
+            name = f'{stem}_{counter}'
+            counter += 1
+        return name
+
+    def _table(self, df):
+        arrays = []
+        for field in self.schema:
+            if field.name in df:
+                array = pa.array(df[field.name], from_pandas=True)
+            else:
+                array = pa.nulls(len(df))
+            array = array.cast(field.type)
+            if pa.types.is_string(field.type):
+                missing = pc.is_in(array, value_set=pa.array(CSV_NA_VALUES))
+                array = pc.if_else(missing, pa.scalar(None, pa.string()), array)
+            arrays.append(array)
+        table = pa.Table.from_arrays(arrays, schema=self.schema)
+        # 'YYYY-MM-DD HH:MM:SS' -> 'YYYY-MM-DD'
+        return table.append_column('date', pc.utf8_slice_codeunits(table['timestamp'], 0, 10))
+
+    def write(self, df, snapshot, batch=None, pending=False):
+        """
+        Append rows to the store as files named <snapshot>-<n>.parquet.
+
+        Args:
+            df (pandas.DataFrame): Rows with the store's columns
+            snapshot (str): Snapshot name, see new_snapshot_id
+            batch (int): Batch number when a snapshot is written in several calls,
+                giving files named <snapshot>-<batch>_<n>.parquet
+            pending (bool): Write the files with a '.pending' suffix, hidden from
+                files() and read() until publish() renames them
+
+        Returns:
+            list: Paths of the written files
+        """
+        basename = f'{snapshot}-' if batch is None else f'{snapshot}-{batch}_'
+        written = []
+        ds.write_dataset(
+            self._table(df),
+            self.root,
+            format='parquet',
+            partitioning=self.partitioning,
+            basename_template=f'{basename}{{i}}.parquet{PENDING_SUFFIX if pending else ""}',
+            existing_data_behavior='overwrite_or_ignore',
+            file_options=ds.ParquetFileFormat().make_write_options(compression=self.compression),
+            file_visitor=lambda written_file: written.append(written_file.path),
+        )
+        logging.info(f"Wrote {len(df)} rows in {len(written)} file(s) to {self.root}")
+        return written
+
+    def publish(self, paths):
+        """
+        Make pending files written with write(..., pending=True) visible to readers.
+
+        Returns:
+            list: Published paths
+        """
+        published = []
+        for path in paths:
+            if path.endswith(PENDING_SUFFIX):
+                os.replace(path, path[:-len(PENDING_SUFFIX)])
+                path = path[:-len(PENDING_SUFFIX)]
+            published.append(path)
+        return published
+
+    def recover_pending(self):
+        """
+        Publish data files left pending by a run that did not finish.
+
+        Files cut off mid-write (no valid Parquet footer) are removed.
+
+        Returns:
+            list: Published paths
+        """
+        recovered = []
+        for path in self.pending_files():
+            try:
+                pq.read_metadata(path)
+            except Exception as e:
+                logging.warning(f"Removed incomplete pending file {path}: {e}")
+                os.remove(path)
+                continue
+            recovered.extend(self.publish([path]))
+        if recovered:
+            logging.info(f"Recovered {len(recovered)} pending file(s) in {self.root}")
+        return recovered
+
+    def read(self, columns=None, filter=None, files=None):
+        """
+        Read rows into a DataFrame, only touching the columns and partitions asked for.
+
+        Args:
+            columns (list): Columns to read (default: all data columns in schema order)
+            filter (pyarrow.dataset.Expression): Row filter, e.g. from partition_filter
+            files (list): Read only these data files instead of the whole store
+
+        Returns:
+            pandas.DataFrame: Matching rows (empty with the requested columns if none)
+        """
+        columns = list(columns or self.schema.names)
+        sources = files if files is not None else self.files()
+        if not sources:
+            return pd.DataFrame({name: pd.Series(dtype=self.dataset_schema.field(name).type.to_pandas_dtype())
+                                 for name in columns})
+        dataset = ds.dataset(sources, schema=self.dataset_schema, format='parquet',
+                             partitioning=self.partitioning, partition_base_dir=self.root)
+        return dataset.to_table(columns=columns, filter=filter).to_pandas()
+
+    def file_rows(self, path):
+        """Row count of one data file, from its footer."""
+        return pq.ParquetFile(path).metadata.num_rows
+
+    def export_csv(self, path, columns=None, filter=None):
+        """
+        Export (part of) the store to one CSV file in the save_to_csv layout.
+
+        Returns:
+            int: Number of exported rows
+        """
+        df = self.read(columns=columns, filter=filter)
+        df.to_csv(path, index=False)
+        logging.info(f"Exported {len(df)} rows from {self.root} to {path}")
+        return len(df)
+
+
+def import_csv_snapshots(csv_dir, root):
+    """
+    Copy raw products_*.csv snapshots into a raw ParquetStore, one snapshot each.
+
+    Returns:
+        list: Names of the imported snapshots
+    """
+    store = ParquetStore(root, raw_schema())
+    existing = store.snapshot_ids()
+    imported = []
+    for name in sorted(os.listdir(csv_dir)):
+        snapshot = name[:-len('.csv')]
+        if not (name.startswith('products_') and name.endswith('.csv')) or snapshot in existing:
+            continue
+        df = pd.read_csv(os.path.join(csv_dir, name), dtype=str, keep_default_na=False)
+        store.write(df, snapshot)
+        imported.append(snapshot)
+    return imported
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+    import_parser = commands.add_parser('import', help='import raw products_*.csv snapshots')
+    import_parser.add_argument('csv_dir')
+    import_parser.add_argument('root')
+    export_parser = commands.add_parser('export', help='export a store to CSV')
+    export_parser.add_argument('root')
+    export_parser.add_argument('output')
+    export_parser.add_argument('--columns', nargs='+')
+    export_parser.add_argument('--since')
+    export_parser.add_argument('--until')
+    export_parser.add_argument('--website', nargs='+')
+    export_parser.add_argument('--category', nargs='+')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s: %(message)s')
+    if args.command == 'import':
+        imported = import_csv_snapshots(args.csv_dir, args.root)
+        logging.info(f"Imported {len(imported)} snapshot(s) into {args.root}")
+    else:
+        # Processed stores carry extra float columns; take them from the files
+        files = ParquetStore(args.root, raw_schema()).files()
+        float_columns = [f.name for f in pq.read_schema(files[0]) if pa.types.is_floating(f.type)] if files else []
+        store = ParquetStore(args.root, processed_schema(*float_columns))
+        store.export_csv(args.output, args.columns,
+                         partition_filter(args.since, args.until, args.website, args.category))
+
+
+if __name__ == '__main__':
+    main()
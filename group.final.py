@@ -1,22 +1,68 @@
 import os
-import csv
 import logging
-import time
 import threading
+import time
+from concurrent.futures import Future, wait
 from datetime import datetime
+from urllib.parse import urlencode
 import pandas as pd
-import numpy as np
-import schedule
-import matplotlib.pyplot as plt
-import seaborn as sns
-
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
+
+from analysis_cache import AnalysisCache, FrameDigest
+from batch_extract import card_spec, extract_cards, field_spec
+from browser_sessions import BrowserManager, ChromeDriverCache
+from chart_renderer import (ChartRenderer, category_price_histogram, completed, price_distribution,
+                            price_trend, website_price_comparison)
+from cleaning import parse_prices, parse_ratings
+from columnar_store import ParquetStore, partition_filter, processed_schema, raw_schema, snapshot_id, RAW_COLUMNS
+from http_fetch import HttpFetcher, next_page_url, parse_cards, search_url
+from job_scheduler import JobScheduler, Stage
+from lean_pages import (DEFAULT_BLOCKED_DOMAINS, PageLoadStats, block_requests, blocked_url_patterns,
+                        lean_chrome_options, log_page_loads, page_metrics)
+from page_crawler import crawl_tabs, fetch_pages, page_urls
+from metrics import MetricsRegistry, MetricsServer, count_webdriver_commands, resident_memory, timed_stage, write_json
+from page_ready import ReadinessStats, log_readiness, wait_until_ready
+from price_alerts import PriceChangeDetector
+from price_history import PriceHistoryStore
+from product_identity import ProductIndex
+from product_matching import price_spread_report
+from rate_limiter import HostRateLimiter
+from run_journal import RunJournal
+from scrape_pool import ScrapePool, log_job_latency
+from snapshot_manifest import SnapshotManifest, processed_path
+from snapshot_writer import CsvSnapshotWriter, ParquetSnapshotWriter, recover_csv_snapshots, snapshot_path
+from storefront import FixtureRecorder, MockStorefront
+from tracker_cli import main as run_command
+
+# Selectors for single-call extraction of a results page
+AMAZON_RESULT_CARDS = card_spec(
+    "div[data-component-type='s-search-result']",
+    name=field_spec("h2 a span", required=True),
+    price=field_spec(".a-price-whole"),
+    rating=field_spec("span.a-icon-alt"),
+    product_id=field_spec(":scope", attr="data-asin"),
+    url=field_spec("h2 a", attr="href"),
+)
+BESTBUY_RESULT_CARDS = card_spec(
+    "li.sku-item",
+    name=field_spec("h4.sku-title", required=True),
+    price=field_spec("div.priceView-hero-price.priceView-customer-price span"),
+    rating=field_spec("span.c-rating.v-small"),
+    product_id=field_spec(":scope", attr="data-sku-id"),
+    url=field_spec("h4.sku-title a", attr="href"),
+)
+RESULT_CARDS = {"Amazon": AMAZON_RESULT_CARDS, "BestBuy": BESTBUY_RESULT_CARDS}
+
+# "Next page" links further result pages are numbered from
+NEXT_PAGE_LINKS = {
+    "Amazon": "a.s-pagination-next",
+    "BestBuy": "a.sku-list-page-next, a.s-pagination-next",
+}
+
+# Columns the cross-site price spread report is computed from
+SPREAD_COLUMNS = ['product_key', 'name', 'website', 'category', 'price', 'price_cleaned']
+
+# Processed columns read back from the Parquet store for analyze_product_data
+ANALYSIS_COLUMNS = ['product_key', 'name', 'category', 'website', 'price', 'price_cleaned', 'rating', 'timestamp']
 
 class EcommerceProductTracker:
     def __init__(self):
@@ -25,6 +71,7 @@ class EcommerceProductTracker:
         self.LOG_DIR = os.path.join(self.BASE_DIR, 'logs')
         self.PROCESSED_DATA_DIR = os.path.join(self.BASE_DIR, 'processed_data')
         self.ANALYSIS_OUTPUT_DIR = os.path.join(self.BASE_DIR, 'analysis_output')
+        self.PROFILE_DIR = os.path.join(self.BASE_DIR, 'profiles')
 
         # Create directories
         for dir_path in [self.LOG_DIR, self.PROCESSED_DATA_DIR, self.ANALYSIS_OUTPUT_DIR]:
@@ -42,278 +89,825 @@ class EcommerceProductTracker:
 
         # Scraping configuration
         self.WEBSITES = ["Amazon", "BestBuy"]
+        self.SITE_URLS = {"Amazon": "https://www.amazon.com", "BestBuy": "https://www.bestbuy.com"}
         self.PRODUCT_CATEGORIES = ["laptops", "smartphones", "headphones"]
         self.SCRAPE_INTERVAL = 24  # hours
-
-    def init_driver(self):
+        self.SCRAPER_POOL_SIZE = 2  # parallel browsers
+        self.SCHEDULES = {"all": (self.SCRAPE_INTERVAL, None)}  # name -> (hours, categories or None for all)
+        self.SCHEDULE_JITTER = 0.05  # Runs start up to this fraction of their interval late
+        self.HOST_RATE_LIMIT = 0.2  # requests per second per host
+        self.HOST_BURST = 1
+        self.rate_limiter = HostRateLimiter(rate=self.HOST_RATE_LIMIT, burst=self.HOST_BURST)
+
+        # Warm browser sessions with persistent profiles, recycled after N pages or past a memory limit
+        self.KEEP_BROWSERS_WARM = True  # Keep browsers open between scheduled runs
+        self.BROWSER_PROFILE_DIR = os.path.join(self.BASE_DIR, 'browser_profiles')
+        self.BROWSER_MAX_PAGES = 200
+        self.BROWSER_MAX_MEMORY_MB = 1500
+        self.CHROMEDRIVER_CACHE = 'chromedriver_path.json'  # Resolved driver path, in PROCESSED_DATA_DIR
+        self._browser_manager = None
+        self._driver_cache = None
+        self.LEAN_PAGES = True  # Skip images, media, fonts and BLOCKED_DOMAINS; eager page loads
+        self.BLOCKED_DOMAINS = list(DEFAULT_BLOCKED_DOMAINS)  # Ad and tracking hosts the browser may not load
+        self.page_loads = PageLoadStats()  # Bytes and ready latency of the browser pages of a run
+        self.PAGE_READY_TIMEOUT = 15  # Seconds a page may take to show the search box or results
+        self.GRID_QUIET_SECONDS = 0.15  # Results are read once the grid stopped changing this long
+        self.readiness = ReadinessStats()  # Histograms of the readiness waits of a run
+        self.metrics = MetricsRegistry()  # Stage durations, products, parse failures, round trips, memory
+        self.METRICS_PORT = 9464  # Local Prometheus-style endpoint while the scheduler runs (None: off)
+        self.RUN_SUMMARY_DIR = 'run_summaries'  # JSON summary of every scrape run, inside LOG_DIR
+        self.last_run_summary = None
+        self.profiler = None  # StageProfiler of profile mode (tracker_cli --profile), writes to PROFILE_DIR
+        self.EXTRACTION_MODE = "batch"  # "batch" (one execute_script per page) or "elements"
+        self.FETCH_MODE = "http_first"  # "http_first" (browser only as fallback) or "browser"
+        self.RESULT_PAGES = 10  # Result pages scraped per website and category
+        self.MAX_TABS = 4  # Result pages loading at once per browser (or HTTP requests)
+        self.http_fetcher = HttpFetcher(pool_size=self.SCRAPER_POOL_SIZE * self.MAX_TABS)
+        self.FIXTURE_MODE = None  # "record", "replay" or None for live scraping
+        self.FIXTURE_DIR = os.path.join(self.BASE_DIR, 'fixtures')
+        self.fixture_recorder = FixtureRecorder(self.FIXTURE_DIR, next_links=NEXT_PAGE_LINKS)
+        self.SNAPSHOT_MANIFEST = 'snapshot_manifest.json'  # Raw snapshots already processed
+        self.STORAGE_FORMAT = "csv"  # "csv" files or "parquet" datasets partitioned by date/website/category
+        self.PRICE_HISTORY_DB = 'price_history.db'  # SQLite price history in PROCESSED_DATA_DIR, None disables it
+        self._history_store = None
+        self.PRODUCT_INDEX = 'product_index.json'  # Product key -> record index in PROCESSED_DATA_DIR
+        self._product_index = None
+        self.WRITE_BATCH_SIZE = 200  # Products per batch streamed to the snapshot as jobs finish
+        self.RUN_JOURNAL = 'run_journal.jsonl'  # Completed jobs of the current run, None disables resuming
+        self.RUN_WINDOW_HOURS = self.SCRAPE_INTERVAL  # Interrupted runs younger than this are resumed
+        self.PRICE_STATE = 'price_state.json'  # Rolling per-product price state, None disables detection
+        self.PRICE_EVENTS = 'price_events.jsonl'  # Price drops and anomalies in PROCESSED_DATA_DIR
+        self._price_detector = None
+        self.ANALYSIS_CACHE = 'analysis_cache'  # Artifacts by input content hash in PROCESSED_DATA_DIR, None disables
+        self.ANALYSIS_CACHE_MAX_MB = 200  # Least recently used cache entries are evicted past this size
+        self._analysis_cache = None
+        self.CHART_WORKERS = 2  # Background processes rendering charts (headless), 0 renders them inline
+        self._chart_renderer = None
+        self.stop_event = threading.Event()  # Set on CTRL+C: scrape workers take no new jobs
+
+    @timed_stage("init_driver")
+    def init_driver(self, profile_dir=None):
         """Initialize Selenium WebDriver"""
+        from selenium import webdriver
+        from selenium.common.exceptions import WebDriverException
+        from selenium.webdriver.chrome.service import Service
+
         options = webdriver.ChromeOptions()
         options.add_argument("--disable-blink-features=AutomationControlled")
         options.add_experimental_option("excludeSwitches", ["enable-automation"])
         options.add_experimental_option('useAutomationExtension', False)
+        if profile_dir:
+            options.add_argument(f"--user-data-dir={profile_dir}")
+        if self.LEAN_PAGES:
+            lean_chrome_options(options, self.BLOCKED_DOMAINS)
 
-        driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+        # The chromedriver path is resolved once and cached; resolve it again when the
+        # cached driver no longer starts (e.g. after a Chrome update)
+        try:
+            driver = webdriver.Chrome(service=Service(self.chromedriver_path()), options=options)
+        except WebDriverException as e:
+            logging.warning(f"Cached chromedriver failed to start, resolving it again: {e}")
+            driver = webdriver.Chrome(service=Service(self.chromedriver_path(refresh=True)), options=options)
+        if self.metrics.enabled:
+            count_webdriver_commands(driver, self.metrics)
         driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        if self.LEAN_PAGES:
+            block_requests(driver, blocked_url_patterns(self.BLOCKED_DOMAINS))
         return driver
 
+    @timed_stage("scrape_amazon", profile_by=("category",))
     def scrape_amazon(self, driver, category):
         """Scrape Amazon for a specific product category"""
+        from selenium.webdriver.common.keys import Keys
+
         try:
-            driver.get("https://www.amazon.com")
-            search_box = WebDriverWait(driver, 30).until(
-                EC.presence_of_element_located((By.ID, "twotabsearchtextbox"))
-            )
+            self.rate_limiter.acquire(self.SITE_URLS["Amazon"])
+            driver.get(self.SITE_URLS["Amazon"])
+            search_box = self.wait_ready(driver, "Amazon", "search box", "#twotabsearchtextbox", quiet=0)
             search_box.clear()
             search_box.send_keys(category)
             search_box.send_keys(Keys.RETURN)
 
-            products = []
-            product_elements = WebDriverWait(driver, 10).until(
-                EC.presence_of_all_elements_located((By.CSS_SELECTOR, "div[data-component-type='s-search-result']"))
-            )
+            self.wait_ready(driver, "Amazon", "results", AMAZON_RESULT_CARDS["card"])
 
-            for product in product_elements[:20]:
-                try:
-                    name = product.find_element(By.CSS_SELECTOR, "h2 a span").text
-                    try:
-                        price = product.find_element(By.CSS_SELECTOR, ".a-price-whole").text
-                    except:
-                        price = "N/A"
-                    try:
-                        rating = product.find_element(By.CSS_SELECTOR, "span.a-icon-alt").text
-                    except:
-                        rating = "N/A"
-
-                    products.append({
-                        "name": name,
-                        "price": price,
-                        "rating": rating,
-                        "category": category,
-                        "website": "Amazon",
-                        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                    })
-                except Exception as e:
-                    logging.error(f"Error parsing Amazon product: {e}")
+            if self.FIXTURE_MODE == "record":
+                self.fixture_recorder.save("Amazon", category, driver.page_source)
+            self.record_page_load(driver, "Amazon", category)
 
+            products = self.extract_amazon_products(driver, category)
+            products.extend(self.crawl_result_pages(driver, "Amazon", category, self.extract_amazon_products))
             return products
         except Exception as e:
             logging.error(f"Error scraping Amazon for {category}: {e}")
             return []
 
+    def extract_amazon_products(self, driver, category):
+        """Read the products of the Amazon results page shown in the driver"""
+        from selenium.webdriver.common.by import By
+
+        products = []
+        # Batch mode: read every card with one execute_script round trip
+        if self.EXTRACTION_MODE == "batch":
+            for card in extract_cards(driver, AMAZON_RESULT_CARDS, self.metrics, website="Amazon"):
+                products.append(dict(card, category=category, website="Amazon",
+                                     timestamp=datetime.now().strftime("%Y-%m-%d %H:%M:%S")))
+            return products
+
+        product_elements = driver.find_elements(By.CSS_SELECTOR, AMAZON_RESULT_CARDS["card"])
+        for product in product_elements[:20]:
+            try:
+                name = product.find_element(By.CSS_SELECTOR, "h2 a span").text
+                try:
+                    price = product.find_element(By.CSS_SELECTOR, ".a-price-whole").text
+                except:
+                    price = "N/A"
+                try:
+                    rating = product.find_element(By.CSS_SELECTOR, "span.a-icon-alt").text
+                except:
+                    rating = "N/A"
+
+                products.append({
+                    "name": name,
+                    "price": price,
+                    "rating": rating,
+                    "product_id": product.get_attribute("data-asin"),
+                    "category": category,
+                    "website": "Amazon",
+                    "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                })
+            except Exception as e:
+                logging.error(f"Error parsing Amazon product: {e}")
+                self.metrics.inc("parse_failures_total", website="Amazon", source="browser")
+
+        return products
+
+    @timed_stage("scrape_bestbuy", profile_by=("category",))
     def scrape_bestbuy(self, driver, category):
         """Scrape Best Buy for a specific product category"""
+        from selenium.webdriver.common.keys import Keys
+
         try:
-            driver.get("https://www.bestbuy.com")
-            search_box = WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "input.search-input"))
-            )
+            self.rate_limiter.acquire(self.SITE_URLS["BestBuy"])
+            driver.get(self.SITE_URLS["BestBuy"])
+            search_box = self.wait_ready(driver, "BestBuy", "search box", "input.search-input", quiet=0)
             search_box.clear()
             search_box.send_keys(category)
             search_box.send_keys(Keys.RETURN)
 
-            products = []
-            product_elements = WebDriverWait(driver, 10).until(
-                EC.presence_of_all_elements_located((By.CSS_SELECTOR, "li.sku-item"))
-            )
+            self.wait_ready(driver, "BestBuy", "results", BESTBUY_RESULT_CARDS["card"])
 
-            for product in product_elements[:20]:
-                try:
-                    name = product.find_element(By.CSS_SELECTOR, "h4.sku-title").text
-                    try:
-                        price = product.find_element(By.CSS_SELECTOR, "div.priceView-hero-price.priceView-customer-price span").text
-                    except:
-                        price = "N/A"
-                    try:
-                        rating = product.find_element(By.CSS_SELECTOR, "span.c-rating.v-small").text
-                    except:
-                        rating = "N/A"
-
-                    products.append({
-                        "name": name,
-                        "price": price,
-                        "rating": rating,
-                        "category": category,
-                        "website": "BestBuy",
-                        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                    })
-                except Exception as e:
-                    logging.error(f"Error parsing Best Buy product: {e}")
+            if self.FIXTURE_MODE == "record":
+                self.fixture_recorder.save("BestBuy", category, driver.page_source)
+            self.record_page_load(driver, "BestBuy", category)
 
+            products = self.extract_bestbuy_products(driver, category)
+            products.extend(self.crawl_result_pages(driver, "BestBuy", category, self.extract_bestbuy_products))
             return products
         except Exception as e:
             logging.error(f"Error scraping Best Buy for {category}: {e}")
             return []
 
+    def extract_bestbuy_products(self, driver, category):
+        """Read the products of the Best Buy results page shown in the driver"""
+        from selenium.webdriver.common.by import By
+
+        products = []
+        # Batch mode: read every card with one execute_script round trip
+        if self.EXTRACTION_MODE == "batch":
+            for card in extract_cards(driver, BESTBUY_RESULT_CARDS, self.metrics, website="BestBuy"):
+                products.append(dict(card, category=category, website="BestBuy",
+                                     timestamp=datetime.now().strftime("%Y-%m-%d %H:%M:%S")))
+            return products
+
+        product_elements = driver.find_elements(By.CSS_SELECTOR, BESTBUY_RESULT_CARDS["card"])
+        for product in product_elements[:20]:
+            try:
+                name = product.find_element(By.CSS_SELECTOR, "h4.sku-title").text
+                try:
+                    price = product.find_element(By.CSS_SELECTOR, "div.priceView-hero-price.priceView-customer-price span").text
+                except:
+                    price = "N/A"
+                try:
+                    rating = product.find_element(By.CSS_SELECTOR, "span.c-rating.v-small").text
+                except:
+                    rating = "N/A"
+
+                products.append({
+                    "name": name,
+                    "price": price,
+                    "rating": rating,
+                    "product_id": product.get_attribute("data-sku-id"),
+                    "category": category,
+                    "website": "BestBuy",
+                    "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                })
+            except Exception as e:
+                logging.error(f"Error parsing Best Buy product: {e}")
+                self.metrics.inc("parse_failures_total", website="BestBuy", source="browser")
+
+        return products
+
+    def crawl_result_pages(self, driver, website, category, extract):
+        """Scrape result pages 2..RESULT_PAGES in up to MAX_TABS tabs of the same browser"""
+        from selenium.webdriver.common.by import By
+
+        if self.RESULT_PAGES < 2:
+            return []
+        links = driver.find_elements(By.CSS_SELECTOR, NEXT_PAGE_LINKS[website])
+        targets = page_urls(links[0].get_attribute("href") if links else None, self.RESULT_PAGES)
+        if not targets:
+            return []
+
+        def read_page(tab, page):
+            self.wait_ready(tab, website, "results", RESULT_CARDS[website]["card"])
+            if self.FIXTURE_MODE == "record":
+                self.fixture_recorder.save(website, category, tab.page_source, page=page)
+            self.record_page_load(tab, website, category, page)
+            return [dict(product, page=page) for product in extract(tab, category)]
+
+        base_url = self.SITE_URLS[website]
+        blocked = blocked_url_patterns(self.BLOCKED_DOMAINS)
+        pages = crawl_tabs(driver, targets, read_page, max_tabs=self.MAX_TABS,
+                           before_open=lambda url: self.rate_limiter.acquire(base_url),
+                           prepare_tab=(lambda tab: block_requests(tab, blocked)) if self.LEAN_PAGES else None)
+        return [product for page in pages for product in page]
+
+    def record_page_load(self, driver, website, category, page=1):
+        """Log the bytes and page-ready latency of the page shown and add them to page_loads"""
+        metrics = page_metrics(driver)
+        if not metrics:
+            return
+        self.page_loads.add(website, metrics)
+        ready = metrics.get("ready_ms")
+        logging.info(
+            f"{website}/{category} page {page}: {metrics['bytes'] / 1024:.0f} KiB in {metrics['requests']} requests"
+            + (f", ready after {ready / 1000:.2f}s" if ready is not None else "")
+        )
+
+    def wait_ready(self, driver, website, what, selector, quiet=None):
+        """Wait until selector is on the page (and, unless quiet=0, stopped changing) and return its first element"""
+        ready = wait_until_ready(driver, selector, timeout=self.PAGE_READY_TIMEOUT,
+                                 quiet=self.GRID_QUIET_SECONDS if quiet is None else quiet,
+                                 stats=self.readiness, label=(website, what))
+        return ready["element"]
+
+    @timed_stage("save_to_csv")
     def save_to_csv(self, products):
-        """Save scraped products to CSV"""
+        """Save scraped products as a new raw snapshot (CSV, or Parquet when STORAGE_FORMAT is parquet)"""
         if not products:
             logging.warning("No products to save")
             return None
 
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = os.path.join(self.LOG_DIR, f'products_{timestamp}.csv')
-
         try:
-            with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-                fieldnames = ['name', 'price', 'rating', 'category', 'website', 'timestamp']
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                writer.writeheader()
-                writer.writerows(products)
-
-            logging.info(f"Saved {len(products)} products to {filename}")
-            return filename
+            with self.open_snapshot() as writer:
+                writer.write(products)
+            return writer.name
         except Exception as e:
-            logging.error(f"Error saving to CSV: {e}")
+            logging.error(f"Error saving snapshot: {e}")
             return None
 
-    def clean_and_process_data(self):
-        """Clean and process scraped data"""
-        logging.info("Starting data processing...")
-        
-        # Find latest CSV file
-        csv_files = [f for f in os.listdir(self.LOG_DIR) if f.startswith('products_') and f.endswith('.csv')]
-        if not csv_files:
-            logging.warning("No data to process.")
+    def open_snapshot(self):
+        """Streaming writer for a new raw snapshot; batches are keyed and recorded in the price history as they are written"""
+        run = {"run_id": None}
+
+        def on_batch(products):
+            # Give every product its stable key before it is written anywhere
+            self.identify_products(products)
+            # A product listed on several result pages (or already saved by the
+            # interrupted run this one resumes) is written once per snapshot
+            products[:] = writer.unseen(products)
+            if not products:
+                return
+            run["run_id"] = self.record_price_history(products, writer.name, run_id=run["run_id"])
+            self.detect_price_changes(products)
+
+        if self.STORAGE_FORMAT == "parquet":
+            store = self.raw_store()
+            writer = ParquetSnapshotWriter(store, store.new_snapshot_id('products_'), self.WRITE_BATCH_SIZE, on_batch)
+        else:
+            writer = CsvSnapshotWriter(snapshot_path(self.LOG_DIR), RAW_COLUMNS, self.WRITE_BATCH_SIZE, on_batch)
+        return writer
+
+    def recover_partial_snapshots(self):
+        """Publish raw snapshots left pending by an interrupted run"""
+        try:
+            if self.STORAGE_FORMAT == "parquet":
+                return self.raw_store().recover_pending()
+            return recover_csv_snapshots(self.LOG_DIR)
+        except Exception as e:
+            logging.error(f"Error recovering partial snapshots: {e}")
+            return []
+
+    def snapshot_keys(self, snapshots):
+        """Product keys saved in published raw snapshots, by SnapshotWriter.name (e.g. RunJournal.snapshots)"""
+        try:
+            if self.STORAGE_FORMAT == "parquet":
+                names = set(snapshots)
+                files = [path for path in self.raw_store().files() if snapshot_id(path) in names]
+                if not files:
+                    return set()
+                keys = self.raw_store().read(columns=['product_key'], files=files)['product_key']
+            else:
+                paths = [path for path in snapshots if os.path.exists(path)]
+                if not paths:
+                    return set()
+                keys = pd.concat([pd.read_csv(path, usecols=['product_key'])['product_key'] for path in paths])
+            return set(keys.dropna())
+        except Exception as e:
+            logging.error(f"Error reading the product keys of {snapshots}: {e}")
+            return set()
+
+    def identify_products(self, products):
+        """Add a stable product_key (ASIN/SKU or name hash) to each product and persist the index"""
+        index = self.product_index()
+        index.identify(products)
+        try:
+            index.save()
+        except OSError as e:
+            logging.error(f"Error saving product index: {e}")
+
+    def product_index(self):
+        """Persistent product key -> record index"""
+        path = os.path.join(self.PROCESSED_DATA_DIR, self.PRODUCT_INDEX)
+        if self._product_index is None or self._product_index.path != path:
+            self._product_index = ProductIndex(path)
+        return self._product_index
+
+    def record_price_history(self, products, source, run_id=None):
+        """Record a saved run, or a batch of one (run_id), in the SQLite price-history store; returns the run_id"""
+        if not self.PRICE_HISTORY_DB:
             return None
+        try:
+            return self.history_store().record_run(products, source=os.path.basename(source),
+                                                   run_id=run_id)
+        except Exception as e:
+            logging.error(f"Error recording price history: {e}")
+            return run_id
+
+    def history_store(self):
+        """SQLite price-history store with the time-series query API"""
+        path = os.path.join(self.PROCESSED_DATA_DIR, self.PRICE_HISTORY_DB)
+        if self._history_store is None or self._history_store.path != path:
+            self._history_store = PriceHistoryStore(path)
+        return self._history_store
+
+    def price_detector(self):
+        """Rolling per-product price state"""
+        state_path = os.path.join(self.PROCESSED_DATA_DIR, self.PRICE_STATE)
+        if self._price_detector is None or self._price_detector.state_path != state_path:
+            events_path = os.path.join(self.PROCESSED_DATA_DIR, self.PRICE_EVENTS)
+            self._price_detector = PriceChangeDetector(state_path, events_path, on_event=self.on_price_event)
+        return self._price_detector
+
+    def detect_price_changes(self, products):
+        """Update the rolling price state with saved products and record price drops and anomalies"""
+        if not self.PRICE_STATE:
+            return []
+        try:
+            detector = self.price_detector()
+            events = detector.observe(products)
+            detector.save()
+            return events
+        except Exception as e:
+            logging.error(f"Error detecting price changes: {e}")
+            return []
 
-        latest_file = max(csv_files)
-        df = pd.read_csv(os.path.join(self.LOG_DIR, latest_file))
+    def on_price_event(self, event):
+        """Report a detected price event (logged; replace to notify elsewhere)"""
+        if event['event'] == 'price_drop':
+            logging.info(f"Price drop: {event['name']} ({event['website']}) "
+                         f"{event['previous_price']} -> {event['price']} ({event['change_pct']}%)")
+        else:
+            logging.info(f"Price {event['event']}: {event['name']} ({event['website']}) at {event['price']}")
 
-        # Clean price data
-        def parse_price(price):
-            try:
-                return float(str(price).replace('$', '').replace(',', ''))
-            except:
-                return np.nan
+    def raw_store(self):
+        """Raw snapshots when STORAGE_FORMAT is parquet"""
+        return ParquetStore(os.path.join(self.LOG_DIR, 'products'), raw_schema())
+
+    def processed_store(self):
+        """Processed data when STORAGE_FORMAT is parquet"""
+        return ParquetStore(os.path.join(self.PROCESSED_DATA_DIR, 'processed'), processed_schema('price_cleaned'))
+
+    def load_processed_data(self, columns=None, since=None, until=None, websites=None, categories=None):
+        """Read processed history from the Parquet store, pruning columns and partitions"""
+        return self.processed_store().read(columns, partition_filter(since, until, websites, categories))
+
+    def clean_snapshot(self, df):
+        """Clean one raw snapshot"""
 
-        df['price_cleaned'] = df['price'].apply(parse_price)
+        # Clean price data
+        df['price_cleaned'] = parse_prices(df['price'])
         
-        # Remove duplicates
-        df = df.drop_duplicates(subset=['name', 'timestamp'])
+        # Remove duplicate listings (one row per product key)
+        df['product_key'] = self.product_index().keys_for(df)
+        df = df.drop_duplicates(subset=['product_key'])
         
         # Handle missing values
         df['rating'] = df['rating'].fillna('N/A')
         df['price_cleaned'] = df['price_cleaned'].fillna(df['price_cleaned'].median())
+        return df
+
+    @timed_stage("clean_and_process_data")
+    def clean_and_process_data(self):
+        """Clean and process the scraped snapshots not processed yet"""
+        logging.info("Starting data processing...")
+        
+        # Raw data files: one CSV per snapshot, or one Parquet file per snapshot partition
+        if self.STORAGE_FORMAT == "parquet":
+            raw_store = self.raw_store()
+            data_files = raw_store.files()
+            load_snapshot = lambda files: raw_store.read(files=files)
+        else:
+            data_files = sorted(os.path.join(self.LOG_DIR, f) for f in os.listdir(self.LOG_DIR)
+                                if f.startswith('products_') and f.endswith('.csv'))
+            load_snapshot = lambda files: pd.read_csv(files[0])
+        if not data_files:
+            logging.warning("No data to process.")
+            return None
+
+        # Only files missing from the manifest (new or changed since processed)
+        manifest = SnapshotManifest(os.path.join(self.PROCESSED_DATA_DIR, self.SNAPSHOT_MANIFEST))
+        new_files = manifest.pending_paths(data_files, self.LOG_DIR)
+        if not new_files:
+            logging.info("No new snapshots to process.")
+            return None
+
+        snapshots = {}
+        for path in new_files:
+            snapshots.setdefault(snapshot_id(path), []).append(path)
+        df = pd.concat([self.clean_snapshot(load_snapshot(files)) for files in snapshots.values()], ignore_index=True)
 
         # Save processed data
-        processed_file = os.path.join(self.PROCESSED_DATA_DIR, f'processed_data_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv')
-        df.to_csv(processed_file, index=False)
-        logging.info(f"Processed data saved to {processed_file}")
+        if self.STORAGE_FORMAT == "parquet":
+            processed_store = self.processed_store()
+            processed_file = processed_store.new_snapshot_id('processed_data_')
+            processed_store.write(df, processed_file)
+        else:
+            processed_file = processed_path(self.PROCESSED_DATA_DIR)
+            df.to_csv(processed_file, index=False)
+        logging.info(f"Processed {len(snapshots)} new snapshot(s) into {processed_file}")
+
+        # Checkpoint after the processed data is saved
+        for path in new_files:
+            manifest.record(path, processed_file, key=os.path.relpath(path, self.LOG_DIR))
+        manifest.save()
 
         return df
 
-    def analyze_product_data(self, df):
-        """Perform data analysis and generate visualizations"""
+    @timed_stage("analyze_product_data")
+    def analyze_product_data(self, df=None):
+        """Perform data analysis and start rendering the charts (whole Parquet history if df is omitted); returns chart futures"""
+        if df is None and self.STORAGE_FORMAT == "parquet":
+            df = self.load_processed_data(columns=ANALYSIS_COLUMNS)
+
         if df is None:
             logging.warning("Cannot perform analysis without data.")
-            return
+            return []
+
+        # Artifacts are only recomputed when the columns they read (content hash) change
+        digest = FrameDigest(df)
 
         # Price Analysis by Category
-        price_by_category = df.groupby('category')['price_cleaned'].agg(['mean', 'median', 'min', 'max'])
-        price_by_category.to_csv(os.path.join(self.ANALYSIS_OUTPUT_DIR, 'price_analysis.csv'))
+        self.cached_artifact(
+            'price_analysis.csv', digest, ['category', 'price_cleaned'],
+            lambda path: df.groupby('category')['price_cleaned'].agg(['mean', 'median', 'min', 'max']).to_csv(path),
+        )
 
         # Price Distribution Visualization
-        plt.figure(figsize=(12, 6))
-        sns.boxplot(x='category', y='price_cleaned', data=df)
-        plt.title('Price Distribution by Product Category')
-        plt.xticks(rotation=45)
-        plt.tight_layout()
-        plt.savefig(os.path.join(self.ANALYSIS_OUTPUT_DIR, 'price_distribution.png'))
-        plt.close()
-
-        # Rating Analysis
-        def parse_rating(rating):
-            try:
-                return float(rating.split()[0])
-            except:
-                return 0
-
-        df['rating_numeric'] = df['rating'].apply(parse_rating)
-        rating_by_category = df.groupby('category')['rating_numeric'].mean()
-        rating_by_category.to_csv(os.path.join(self.ANALYSIS_OUTPUT_DIR, 'rating_analysis.csv'))
+        charts = [self.cached_chart('price_distribution.png', df, digest, price_distribution,
+                                    ['category', 'price_cleaned'], figsize=(12, 6))]
+
+        # Rating Analysis (non-text and unparseable ratings count as 0)
+        self.cached_artifact(
+            'rating_analysis.csv', digest, ['category', 'rating'],
+            lambda path: df.assign(rating_numeric=parse_ratings(df['rating'], strings_only=True, fill=0))
+                           .groupby('category')['rating_numeric'].mean().to_csv(path),
+        )
 
         # Price Comparison Across Websites
-        website_price_comparison = df.groupby(['website', 'category'])['price_cleaned'].mean().unstack()
-        website_price_comparison.to_csv(os.path.join(self.ANALYSIS_OUTPUT_DIR, 'website_price_comparison.csv'))
+        self.cached_artifact(
+            'website_price_comparison.csv', digest, ['website', 'category', 'price_cleaned'],
+            lambda path: df.groupby(['website', 'category'])['price_cleaned'].mean().unstack().to_csv(path),
+        )
+
+        # Cross-Site Price Spread of matched products
+        self.cached_artifact('cross_site_price_spread.csv', digest, SPREAD_COLUMNS,
+                             lambda path: self.write_price_spread(df, path))
+
+        # Average price per website, daily price trend and one histogram per category
+        charts.append(self.cached_chart('website_price_comparison.png', df, digest, website_price_comparison,
+                                        ['website', 'category', 'price_cleaned']))
+        charts.append(self.cached_chart('price_trend.png', df, digest, price_trend,
+                                        ['timestamp', 'website', 'category', 'price_cleaned']))
+        for category in sorted(df['category'].dropna().unique()):
+            charts.append(self.cached_chart(f"price_histogram_{category.replace(' ', '_')}.png", df, digest,
+                                            category_price_histogram, ['website', 'category', 'price_cleaned'],
+                                            category=category))
+
+        logging.info(f"Data analysis completed. Results saved in analysis output directory, "
+                     f"{sum(not chart.done() for chart in charts)} chart(s) still rendering.")
+        return charts
+
+    def write_price_spread(self, df, path):
+        """Match products across websites and write the cross-site price spread report"""
+        spread_report = price_spread_report(df)
+        spread_report.to_csv(path, index=False)
+        logging.info(f"Matched {len(spread_report)} products across websites")
+
+    def analysis_cache(self):
+        """Bounded on-disk cache of analysis artifacts (None when ANALYSIS_CACHE is disabled)"""
+        if not self.ANALYSIS_CACHE:
+            return None
+        directory = os.path.join(self.PROCESSED_DATA_DIR, self.ANALYSIS_CACHE)
+        if self._analysis_cache is None or self._analysis_cache.directory != directory:
+            self._analysis_cache = AnalysisCache(directory, max_bytes=self.ANALYSIS_CACHE_MAX_MB * 2 ** 20)
+        return self._analysis_cache
+
+    def cached_artifact(self, filename, digest, columns, render, **params):
+        """Write an analysis artifact unless the content hash of its input columns and params is unchanged"""
+        path = os.path.join(self.ANALYSIS_OUTPUT_DIR, filename)
+        cache = self.analysis_cache()
+        if cache is not None:
+            key = cache.key(filename, digest.digest(columns), params)
+            status = cache.restore(key, path)
+            if status:
+                logging.info(f"{filename} {status}: inputs did not change, skipped computing it")
+                return completed(path)
+        future = render(path)
+        if not isinstance(future, Future):
+            future = completed(path)
+        if cache is not None:
+            future.add_done_callback(lambda done: self.cache_artifact(cache, key, filename, done))
+        return future
+
+    def cache_artifact(self, cache, key, filename, future):
+        """Add a finished artifact to the analysis cache (not failed or superseded renders)"""
+        if future.cancelled() or future.exception() is not None or future.result() is None:
+            return
+        try:
+            cache.store(key, future.result())
+        except OSError as e:
+            logging.error(f"Error caching {filename}: {e}")
+
+    def cached_chart(self, filename, df, digest, chart, columns, **params):
+        """Render a chart in the background from the given columns unless they are unchanged"""
+        return self.cached_artifact(
+            filename, digest, columns,
+            lambda path: self.chart_renderer().submit(chart, df[columns], path, **params), **params,
+        )
 
-        logging.info("Data analysis completed. Results saved in analysis output directory.")
+    def chart_renderer(self):
+        """Pool of background chart rendering processes, started once"""
+        if self._chart_renderer is None:
+            self._chart_renderer = ChartRenderer(max_workers=0 if self.profiler else self.CHART_WORKERS,
+                                                 profiler=self.profiler)
+        return self._chart_renderer
+
+    @timed_stage("fetch_website", profile_by=("website", "category"))
+    def fetch_website(self, website, category):
+        """Fetch up to RESULT_PAGES result pages over plain HTTP with the browser selectors"""
+        if website not in RESULT_CARDS:
+            return []
+        spec = RESULT_CARDS[website]
 
-    def scrape_all_sources(self):
-        """Scrape all configured websites and categories"""
-        all_products = []
-        driver = self.init_driver()
+        base_url = self.SITE_URLS[website]
+        url, param = search_url(base_url, website)
+        html = self.http_fetcher.get(url, params={param: category}, limiter=self.rate_limiter)
+        if not html:
+            return []
+        if self.FIXTURE_MODE == "record":
+            self.fixture_recorder.save(website, category, html)
+        cards = parse_cards(html, spec, self.metrics, website=website)
+
+        # Result pages 2..RESULT_PAGES, up to MAX_TABS requests at once
+        if cards and self.RESULT_PAGES > 1:
+            def fetch_page(page, page_url):
+                page_html = self.http_fetcher.get(page_url, limiter=self.rate_limiter)
+                if not page_html:
+                    return []
+                if self.FIXTURE_MODE == "record":
+                    self.fixture_recorder.save(website, category, page_html, page=page)
+                return [dict(card, page=page) for card in parse_cards(page_html, spec, self.metrics, website=website)]
+
+            first_url = f"{url}?{urlencode({param: category})}"
+            targets = page_urls(next_page_url(html, NEXT_PAGE_LINKS[website], first_url), self.RESULT_PAGES)
+            for page_cards in fetch_pages(targets, fetch_page, self.MAX_TABS):
+                cards.extend(page_cards)
+
+        return [
+            dict(card, category=category, website=website, timestamp=datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+            for card in cards
+        ]
+
+    def scrape_website(self, driver, website, category):
+        """Scrape one website for one product category"""
+        if website == "Amazon":
+            return self.scrape_amazon(driver, category)
+        elif website == "BestBuy":
+            return self.scrape_bestbuy(driver, category)
+
+        logging.error(f"Unsupported website: {website}")
+        return []
+
+    def scrape_all_sources(self, categories=None):
+        """Scrape all configured websites and categories (or only the given ones) with a pool of browsers"""
+        categories = categories or self.PRODUCT_CATEGORIES
+        self.page_loads = PageLoadStats()
+        self.readiness = ReadinessStats()
+        started_at = time.time()
+        metrics_baseline = self.metrics.totals_since()
+        targets = [(website, category) for website in self.WEBSITES for category in categories]
+
+        # Replay mode points the scrapers at a local mock storefront for the whole run
+        storefront = None
+        live_site_urls = self.SITE_URLS
+        if self.FIXTURE_MODE == "replay":
+            storefront = MockStorefront(self.FIXTURE_DIR).start()
+            self.SITE_URLS = storefront.site_urls()
 
         try:
-            for website in self.WEBSITES:
-                for category in self.PRODUCT_CATEGORIES:
-                    logging.info(f"Scraping {website} for {category}")
-                    
-                    if website == "Amazon":
-                        products = self.scrape_amazon(driver, category)
-                    elif website == "BestBuy":
-                        products = self.scrape_bestbuy(driver, category)
-                    else:
-                        logging.error(f"Unsupported website: {website}")
-                        continue
-
-                    all_products.extend(products)
-                    time.sleep(5)  # Pause between scrapes
-
-            self.save_to_csv(all_products)
+            self.recover_partial_snapshots()
+
+            # Resume an interrupted run: skip the (website, category) jobs it already
+            # completed, each covering all its result pages. A job it had only partly
+            # saved is scraped again, without writing the products it did save again
+            journal = self.run_journal()
+            if journal:
+                done_jobs = journal.open_run(self.RUN_WINDOW_HOURS)
+                if done_jobs:
+                    targets = [target for target in targets if (*target, 1) not in done_jobs]
+                    logging.info(f"Resuming run {journal.run_id}: {len(done_jobs)} jobs already done, "
+                                 f"{len(targets)} remaining")
+            fetch_fn = self.fetch_website if self.FETCH_MODE == "http_first" else None
+
+            # Products are streamed to the snapshot as each job finishes instead of
+            # being merged and saved at the end of the run
+            with self.open_snapshot() as writer:
+                if journal:
+                    # Products saved by any earlier attempt at this run are not written again
+                    writer.exclude(self.snapshot_keys(journal.snapshots))
+                    journal.record_snapshot(writer.name)
+                pool = ScrapePool(self.init_driver, self.scrape_website, pool_size=self.SCRAPER_POOL_SIZE,
+                                  fetch_fn=fetch_fn, on_job_done=lambda job: self.save_job(writer, journal, job),
+                                  browsers=self.browser_manager(), stop_event=self.stop_event)
+                jobs = pool.run(targets)
+            log_job_latency(jobs)
+            log_page_loads(self.page_loads)
+            log_readiness(self.readiness)
+            self.write_run_summary(jobs, categories, started_at, metrics_baseline)
+            if journal and not self.stop_event.is_set():
+                journal.complete()
         except Exception as e:
             logging.error(f"Error during scraping: {e}")
         finally:
-            driver.quit()
+            if storefront:
+                storefront.stop()
+                self.SITE_URLS = live_site_urls
+            if not self.KEEP_BROWSERS_WARM:
+                self.close_browsers()
+
+    def browser_manager(self):
+        """Pool of warm browser sessions, kept across scrape runs"""
+        if self._browser_manager is None or self._browser_manager.closed:
+            self._browser_manager = BrowserManager(
+                self.init_driver, profile_root=self.BROWSER_PROFILE_DIR,
+                max_pages=self.BROWSER_MAX_PAGES, max_memory_mb=self.BROWSER_MAX_MEMORY_MB,
+            )
+        return self._browser_manager
+
+    def close_browsers(self):
+        """Quit the warm browser sessions"""
+        if self._browser_manager is not None:
+            self._browser_manager.close()
+            self._browser_manager = None
+
+    def chromedriver_path(self, refresh=False):
+        """Cached chromedriver path (resolved with webdriver_manager on first use or refresh)"""
+        cache_file = os.path.join(self.PROCESSED_DATA_DIR, self.CHROMEDRIVER_CACHE)
+        if self._driver_cache is None or self._driver_cache.cache_file != cache_file:
+            self._driver_cache = ChromeDriverCache(cache_file)
+        return self._driver_cache.path(refresh=refresh)
+
+    def run_journal(self):
+        """Journal of scrape runs, or None when RUN_JOURNAL is disabled"""
+        if not self.RUN_JOURNAL:
+            return None
+        return RunJournal(os.path.join(self.PROCESSED_DATA_DIR, self.RUN_JOURNAL))
+
+    def save_job(self, writer, journal, job):
+        """Stream a finished job's products to the snapshot; successful jobs are journaled once on disk"""
+        done = None
+        if journal and job.error is None and job.product_count:
+            done = lambda: journal.record(job.website, job.category, job.page, job.product_count)
+        writer.write(job.products, done=done)
+        status = "failed" if job.error else ("ok" if job.product_count else "empty")
+        self.metrics.inc("scrape_jobs_total", website=job.website, status=status)
+        if job.product_count:
+            self.metrics.inc("products_extracted_total", job.product_count, website=job.website,
+                             category=job.category, source=job.source)
+
+    def write_run_summary(self, jobs, categories, started_at, baseline=None):
+        """Write the JSON summary of a scrape run to RUN_SUMMARY_DIR and keep it as last_run_summary"""
+        resident, peak = resident_memory()
+        summary = {
+            "started_at": datetime.fromtimestamp(started_at).isoformat(timespec="seconds"),
+            "seconds": round(time.time() - started_at, 3),
+            "categories": list(categories),
+            "products": sum(job.product_count for job in jobs),
+            "failed_jobs": sum(1 for job in jobs if job.error is not None),
+            "jobs": [
+                {
+                    "website": job.website,
+                    "category": job.category,
+                    "source": job.source,
+                    "products": job.product_count,
+                    "pages": job.pages,
+                    "seconds": None if job.duration is None else round(job.duration, 3),
+                    "error": None if job.error is None else str(job.error),
+                }
+                for job in jobs
+            ],
+            "page_loads": self.page_loads.summary(),
+            "readiness": self.readiness.summary(),
+            "metrics": self.metrics.totals_since(baseline),
+            "memory": {"resident_bytes": resident, "peak_resident_bytes": peak},
+        }
+        self.last_run_summary = summary
+        summary_dir = os.path.join(self.LOG_DIR, self.RUN_SUMMARY_DIR)
+        path = os.path.join(summary_dir, f"run_{datetime.fromtimestamp(started_at):%Y%m%d_%H%M%S}.json")
+        try:
+            os.makedirs(summary_dir, exist_ok=True)
+            write_json(path, summary)
+        except OSError as e:
+            logging.error(f"Error saving the run summary: {e}")
+            return None
+        logging.info(f"Run summary saved to {path}")
+        return path
+
+    def start_metrics_server(self):
+        """Serve /metrics and the last run summary (/summary) on METRICS_PORT, if it is set"""
+        if not self.METRICS_PORT:
+            return None
+        try:
+            return MetricsServer(self.metrics, port=self.METRICS_PORT, summary=lambda: self.last_run_summary).start()
+        except OSError as e:
+            logging.warning(f"Could not serve metrics on port {self.METRICS_PORT}: {e}")
+            return None
+
+    def scrape_pipeline(self, categories=None):
+        """Scrape -> process -> analyze stages of one scheduled run, each started when the previous one commits"""
+        def analyze(results):
+            if results["process"] is None:
+                logging.info("No new processed data to analyze")
+                return None
+            charts = self.analyze_product_data(results["process"])
+            wait(charts)
+            return charts
+
+        # The same stage of two pipelines never runs at once (shared browsers, journal and manifest)
+        return [
+            Stage("scrape", lambda results: self.scrape_all_sources(categories), lock="scrape"),
+            Stage("process", lambda results: self.clean_and_process_data(), after=["scrape"], lock="process"),
+            Stage("analyze", analyze, after=["process"], lock="analyze"),
+        ]
 
     def run_scheduler(self):
-        """Enhanced scheduler with controlled scraping and analysis"""
+        """Run the SCHEDULES pipelines now and on their cadences from an asyncio loop"""
         import signal
-        import sys
+
+        # Overlapping runs of a pipeline are skipped; stage lag and durations are logged
+        scheduler = JobScheduler(jitter=self.SCHEDULE_JITTER, cancel_event=self.stop_event)
 
         def signal_handler(sig, frame):
-            """Handle graceful shutdown"""
-            logging.info("Stopping E-commerce Product Tracker...")
-            sys.exit(0)
+            """Handle graceful shutdown; a second CTRL+C exits right away"""
+            logging.info("Stopping E-commerce Product Tracker, waiting for the running stages...")
+            signal.signal(signal.SIGINT, signal.default_int_handler)
+            scheduler.stop()
 
         # Register signal handler
         signal.signal(signal.SIGINT, signal_handler)
 
         logging.info("E-commerce Product Tracker Starting...")
+        metrics_server = self.start_metrics_server()
         
         try:
-            # Initial scrape and analysis
-            self.scrape_all_sources()
-            processed_data = self.clean_and_process_data()
-            if processed_data is not None:
-                self.analyze_product_data(processed_data)
-            
-            # Schedule periodic scraping
-            schedule.every(24).hours.do(self.scrape_all_sources)
-            
-            # Schedule periodic analysis
-            schedule.every(24).hours.do(self._periodic_analysis)
-            
-            while True:
-                schedule.run_pending()
-                time.sleep(60)  # Check every minute
-        
+            for name, (hours, categories) in self.SCHEDULES.items():
+                scheduler.add_job(name, self.scrape_pipeline(categories), interval=hours * 3600)
+            scheduler.run_forever()
         except Exception as e:
             logging.error(f"Fatal error in scheduler: {e}")
         finally:
             logging.info("E-commerce Product Tracker Shutting Down...")
-
-    def _periodic_analysis(self):
-        """Separate method for periodic data processing and analysis"""
-        try:
-            processed_data = self.clean_and_process_data()
-            if processed_data is not None:
-                self.analyze_product_data(processed_data)
-        except Exception as e:
-            logging.error(f"Error during periodic analysis: {e}")
-
-def main():
-    tracker = EcommerceProductTracker()
-    tracker.run_scheduler()
+            self.close_browsers()
+            if metrics_server is not None:
+                metrics_server.stop()
+            if self._chart_renderer is not None:
+                # Let the charts still rendering finish
+                self._chart_renderer.shutdown()
+
+def main(argv=None):
+    # Subcommands: scrape, process, analyze and run (the default), see tracker_cli
+    run_command(argv, tracker_class=EcommerceProductTracker)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,206 @@
+import importlib.util
+import logging
+import threading
+import time
+
+from batch_extract import record_extraction
+
+# requests and bs4 are imported on first use: only scraping needs them
+HTML_PARSER = "lxml" if importlib.util.find_spec("lxml") else "html.parser"
+
+# Search results path and query parameter for each website
+SEARCH_PATHS = {
+    "Amazon": ("/s", "k"),
+    "BestBuy": ("/site/searchpage.jsp", "st"),
+}
+
+DEFAULT_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+# Server errors a request is retried on (HttpFetcher.get)
+RETRY_STATUSES = (500, 502, 503, 504)
+
+
+def search_url(base_url, website):
+    """
+    Build the search results URL for a website.
+
+    Args:
+        base_url (str): Site root, e.g. 'https://www.amazon.com' (may include a path prefix)
+        website (str): Website name from SEARCH_PATHS
+
+    Returns:
+        tuple: (url, query parameter name)
+    """
+    path, param = SEARCH_PATHS[website]
+    return base_url.rstrip("/") + path, param
+
+
+def _read(el, field):
+    if field.get("attr"):
+        return (el.get(field["attr"]) or "").strip()
+    return el.get_text(strip=True)
+
+
+def _field(card, field):
+    """(value, index of the selector that matched), or (None, None) when no selector matches."""
+    for index, selector in enumerate(field["selectors"]):
+        found = [card] if selector == ":scope" else card.select(selector)
+        if found:
+            value = " ".join(_read(el, field) for el in found[:field.get("join", 1)])
+            if field.get("first_word"):
+                value = value.split()[0] if value.split() else ""
+            return value, index
+    return None, None
+
+
+def parse_cards(html, spec, metrics=None, **labels):
+    """
+    Parse product cards from static HTML with the same card_spec used by batch_extract.
+
+    Args:
+        html (str): Search results page HTML
+        spec (dict): Page specification built with batch_extract.card_spec
+        metrics (MetricsRegistry): Optional registry counting dropped cards and
+            fields read with fallback selectors
+        labels: Labels of those counts (e.g. website='Amazon')
+
+    Returns:
+        list: One dict per card with the fields named in the spec
+    """
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, HTML_PARSER)
+    rows = []
+    skipped, fallbacks = 0, {}
+    for card in soup.select(spec["card"])[:spec["limit"]]:
+        row = {}
+        for name, field in spec["fields"].items():
+            value, index = _field(card, field)
+            if value is None and field.get("required"):
+                row = None
+                break
+            if index:
+                fallbacks[name] = fallbacks.get(name, 0) + 1
+            row[name] = "N/A" if value is None else value
+        if row is not None:
+            rows.append(row)
+        else:
+            skipped += 1
+    if metrics is not None:
+        record_extraction(metrics, skipped, fallbacks, source="http", **labels)
+    return rows
+
+
+def next_page_url(html, selector, page_url):
+    """
+    Absolute URL of the "next page" link of a results page.
+
+    Args:
+        html (str): Search results page HTML
+        selector (str): CSS selector of the next page link
+        page_url (str): URL the page was fetched from, for relative links
+
+    Returns:
+        str or None: Next page URL, or None on the last page
+    """
+    from urllib.parse import urljoin
+
+    from bs4 import BeautifulSoup
+
+    link = BeautifulSoup(html, HTML_PARSER).select_one(selector)
+    href = link.get("href") if link else None
+    return urljoin(page_url, href) if href else None
+
+
+class HttpFetcher:
+    def __init__(self, pool_size=4, timeout=15, headers=None, retries=2, backoff=0.5):
+        """
+        Keep-alive HTTP client for fetching search results without a browser.
+
+        A single requests.Session is shared by all scrape workers; its connection
+        pool keeps up to pool_size connections open per host. The session is
+        created by the first request.
+
+        Args:
+            pool_size (int): Connections kept alive per host
+            timeout (float): Request timeout in seconds
+            headers (dict): Extra headers sent with every request
+            retries (int): Retries of a request that failed to connect or got a server error
+            backoff (float): Seconds before the first retry, doubled for every further one
+        """
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.headers = headers
+        self.retries = retries
+        self.backoff = backoff
+        self._session = None
+        self._lock = threading.Lock()
+
+    @property
+    def session(self):
+        with self._lock:
+            if self._session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                session = requests.Session()
+                session.headers.update(DEFAULT_HEADERS)
+                if self.headers:
+                    session.headers.update(self.headers)
+                # No retries inside urllib3: get() retries, so every attempt passes the rate limiter
+                adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size,
+                                      max_retries=0)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._session = session
+            return self._session
+
+    def get(self, url, params=None, limiter=None):
+        """
+        Fetch a page over the pooled session.
+
+        Connection errors and server errors (RETRY_STATUSES) are retried up to
+        `retries` times with exponential backoff.
+
+        Args:
+            url (str): Page URL
+            params (dict): Optional query parameters
+            limiter (HostRateLimiter): Optional per-host rate limiter, acquired before
+                every attempt (retries included)
+
+        Returns:
+            str or None: Response body, or None if the request failed
+        """
+        import requests
+
+        for attempt in range(self.retries + 1):
+            if limiter is not None:
+                limiter.acquire(url)
+            try:
+                response = self.session.get(url, params=params, timeout=self.timeout)
+                if response.status_code not in RETRY_STATUSES or attempt == self.retries:
+                    response.raise_for_status()
+                    return response.text
+                error = f"{response.status_code} Server Error"
+            except requests.ConnectionError as e:
+                if attempt == self.retries:
+                    logging.warning(f"HTTP fetch failed for {url}: {e}")
+                    return None
+                error = e
+            except requests.RequestException as e:
+                logging.warning(f"HTTP fetch failed for {url}: {e}")
+                return None
+            delay = self.backoff * 2 ** attempt
+            logging.debug(f"Retrying {url} in {delay:.1f}s: {error}")
+            time.sleep(delay)
+
+    def close(self):
+        if self._session is not None:
+            self._session.close()
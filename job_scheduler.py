@@ -0,0 +1,284 @@
+"""
+Asyncio scheduler for the tracker's periodic pipelines.
+
+A scheduled job is a small dependency graph of blocking stages, e.g.
+scrape -> process -> analyze. Every stage runs in a worker thread as soon
+as the stages it depends on have finished, so the analysis of a run
+always consumes the data its own scrape committed, and a failed stage
+skips the stages after it.
+
+- A job never overlaps itself: a run that comes due while the previous one
+  is still going is skipped (and counted).
+- Each run starts up to jitter * interval seconds after it is due, so jobs
+  with the same cadence don't all hit the sites at the same moment.
+- Stages that share a lock name (e.g. every job's "scrape") never run at
+  the same time, while the other stages of different jobs may overlap.
+- Queue lag (how long a ready stage waited for its turn) and stage
+  durations are logged after every run and kept in JobStats.
+- stop() sets cancel_event, which long stages can check to return early,
+  cancels the stages that have not started yet and waits for the ones
+  running in worker threads before run() returns, so the caller can tear
+  down what the stages use once it does.
+"""
+import asyncio
+import contextlib
+import logging
+import math
+import random
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+
+class Stage:
+    def __init__(self, name, fn, after=(), lock=None):
+        """
+        One step of a scheduled pipeline.
+
+        Args:
+            name (str): Stage name, unique within its pipeline
+            fn (callable): fn(results) -> result, run in a worker thread; results maps
+                the names of the finished stages of the run to their results
+            after (iterable): Names of the stages that have to finish first
+            lock (str): Stages with the same lock name never run at the same time,
+                across all jobs (None for no lock)
+        """
+        self.name = name
+        self.fn = fn
+        self.after = tuple(after)
+        self.lock = lock
+
+    def __repr__(self):
+        return f"Stage({self.name!r}, after={list(self.after)})"
+
+
+class StageSkipped(Exception):
+    """A stage did not run because a stage it depends on failed."""
+
+
+class JobStats:
+    """Runs, skipped overlapping runs, queue lag and stage durations of a job."""
+
+    def __init__(self):
+        self.runs = 0
+        self.failed_runs = 0
+        self.skipped_runs = 0
+        self.last_run_seconds = None
+        self.last_lag = {}  # stage -> seconds its last run waited after it was ready
+        self.max_lag = {}
+        self.last_duration = {}  # stage -> seconds its last run took
+        self.total_duration = defaultdict(float)
+        self.stage_runs = defaultdict(int)
+
+    def record_stage(self, stage, lag, duration):
+        self.last_lag[stage] = lag
+        self.max_lag[stage] = max(lag, self.max_lag.get(stage, 0.0))
+        self.last_duration[stage] = duration
+        self.total_duration[stage] += duration
+        self.stage_runs[stage] += 1
+
+    def mean_duration(self, stage):
+        runs = self.stage_runs.get(stage)
+        return self.total_duration[stage] / runs if runs else None
+
+
+class ScheduledJob:
+    """A pipeline of stages and the cadence it runs at."""
+
+    def __init__(self, name, stages, interval, run_now=True):
+        self.name = name
+        self.stages = _topological_order(stages)
+        self.interval = float(interval)
+        self.run_now = run_now
+        self.stats = JobStats()
+
+    def __repr__(self):
+        return f"ScheduledJob({self.name!r}, every {self.interval:g}s)"
+
+
+def _topological_order(stages):
+    """Stages ordered so every stage comes after its dependencies; ValueError on bad graphs."""
+    by_name = {}
+    for stage in stages:
+        if stage.name in by_name:
+            raise ValueError(f"Duplicate stage name {stage.name!r}")
+        by_name[stage.name] = stage
+    for stage in stages:
+        unknown = [name for name in stage.after if name not in by_name]
+        if unknown:
+            raise ValueError(f"Stage {stage.name!r} depends on unknown stages {unknown}")
+
+    ordered, done = [], set()
+    remaining = list(stages)
+    while remaining:
+        ready = [stage for stage in remaining if all(name in done for name in stage.after)]
+        if not ready:
+            raise ValueError(f"Stages {[stage.name for stage in remaining]} depend on each other in a cycle")
+        for stage in ready:
+            ordered.append(stage)
+            done.add(stage.name)
+        remaining = [stage for stage in remaining if stage.name not in done]
+    return ordered
+
+
+class JobScheduler:
+    def __init__(self, jitter=0.05, max_workers=4, cancel_event=None):
+        """
+        Run pipelines of blocking stages on fixed cadences from one asyncio loop.
+
+        Args:
+            jitter (float): Each run starts a random 0..jitter * interval seconds after it is due
+            max_workers (int): Worker threads the stages run in
+            cancel_event (threading.Event): Set by stop(); stages can check it to return
+                early (default: a new event)
+        """
+        self.jitter = jitter
+        self.max_workers = max_workers
+        self.cancel_event = cancel_event if cancel_event is not None else threading.Event()
+        self.jobs = {}
+        self._locks = defaultdict(asyncio.Lock)
+        self._loop = None
+        self._stopping = None
+        self._executor = None
+
+    def add_job(self, name, stages, interval, run_now=True):
+        """
+        Schedule a pipeline.
+
+        Args:
+            name (str): Job name
+            stages (list): Stage objects forming a dependency graph
+            interval (float): Seconds between the starts of two runs
+            run_now (bool): Run once right away instead of waiting a whole interval
+
+        Returns:
+            ScheduledJob: The job, whose stats are updated as it runs
+        """
+        if name in self.jobs:
+            raise ValueError(f"Job {name!r} is already scheduled")
+        if interval <= 0:
+            raise ValueError(f"Job {name!r} needs a positive interval, not {interval}")
+        job = ScheduledJob(name, stages, interval, run_now)
+        self.jobs[name] = job
+        return job
+
+    async def run_job(self, job, scheduled_at=None):
+        """
+        Run the stages of a job once, each as soon as its dependencies finished.
+
+        Args:
+            job (ScheduledJob): Job to run
+            scheduled_at (float): Loop time the run was due to start (default: now)
+
+        Returns:
+            dict: Stage name -> result for the stages that finished
+        """
+        loop = asyncio.get_running_loop()
+        scheduled_at = loop.time() if scheduled_at is None else scheduled_at
+        results, tasks = {}, {}
+
+        async def run_stage(stage):
+            if stage.after:
+                try:
+                    await asyncio.gather(*(tasks[name] for name in stage.after))
+                except Exception as e:
+                    raise StageSkipped(stage.name) from e
+            ready = loop.time() if stage.after else scheduled_at
+            lock = self._locks[stage.lock] if stage.lock else contextlib.nullcontext()
+            async with lock:
+                started = loop.time()
+                result = await loop.run_in_executor(self._executor, stage.fn, results)
+            duration = loop.time() - started
+            job.stats.record_stage(stage.name, started - ready, duration)
+            results[stage.name] = result
+            return result
+
+        start = time.perf_counter()
+        for stage in job.stages:
+            tasks[stage.name] = asyncio.create_task(run_stage(stage), name=f"{job.name}-{stage.name}")
+        outcomes = await asyncio.gather(*tasks.values(), return_exceptions=True)
+
+        job.stats.runs += 1
+        job.stats.last_run_seconds = time.perf_counter() - start
+        report = []
+        failed = False
+        for stage, outcome in zip(job.stages, outcomes):
+            if isinstance(outcome, StageSkipped):
+                report.append(f"{stage.name} skipped")
+            elif isinstance(outcome, BaseException):
+                failed = True
+                report.append(f"{stage.name} failed")
+                logging.error(f"Job {job.name}: stage {stage.name} failed: {outcome!r}")
+            else:
+                report.append(f"{stage.name} {job.stats.last_duration[stage.name]:.2f}s "
+                              f"(waited {job.stats.last_lag[stage.name]:.2f}s)")
+        if failed:
+            job.stats.failed_runs += 1
+        logging.info(f"Job {job.name} run {job.stats.runs} finished in {job.stats.last_run_seconds:.2f}s: "
+                     f"{', '.join(report)}; {job.stats.skipped_runs} overlapping runs skipped so far")
+        return results
+
+    async def _job_loop(self, job):
+        loop = asyncio.get_running_loop()
+        due = loop.time() if job.run_now else loop.time() + job.interval
+        first = job.run_now
+        running = None
+        try:
+            while True:
+                start_at = due if first else due + random.uniform(0, self.jitter * job.interval)
+                first = False
+                await asyncio.sleep(max(0.0, start_at - loop.time()))
+                if running is not None and not running.done():
+                    job.stats.skipped_runs += 1
+                    logging.warning(f"Job {job.name}: the previous run is still going, skipping this run")
+                else:
+                    running = asyncio.create_task(self.run_job(job, scheduled_at=start_at), name=f"job-{job.name}")
+
+                due += job.interval
+                now = loop.time()
+                if due < now:
+                    # Slots missed while the machine was suspended are not made up for
+                    missed = math.ceil((now - due) / job.interval)
+                    logging.warning(f"Job {job.name}: {missed} scheduled runs were missed")
+                    due += missed * job.interval
+        finally:
+            if running is not None and not running.done():
+                running.cancel()
+                await asyncio.gather(running, return_exceptions=True)
+
+    async def run(self):
+        """Run every job on its cadence until stop() is called, then wait for the running stages."""
+        self._loop = asyncio.get_running_loop()
+        self._stopping = asyncio.Event()
+        if self.cancel_event.is_set():
+            self._stopping.set()
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="stage")
+        loops = [asyncio.create_task(self._job_loop(job), name=f"schedule-{job.name}") for job in self.jobs.values()]
+        for job in self.jobs.values():
+            logging.info(f"Scheduled job {job.name}: {' -> '.join(stage.name for stage in job.stages)} "
+                         f"every {job.interval / 3600:g} hours")
+        try:
+            await self._stopping.wait()
+        finally:
+            for task in loops:
+                task.cancel()
+            await asyncio.gather(*loops, return_exceptions=True)
+            # Stages already running in threads can't be interrupted: wait for them
+            # (they return early when they check cancel_event) before returning
+            logging.info("Waiting for the running stages to finish")
+            await asyncio.to_thread(self._executor.shutdown, wait=True, cancel_futures=True)
+
+    def run_forever(self):
+        """Blocking entry point: run the scheduler loop in this thread."""
+        asyncio.run(self.run())
+
+    def stop(self):
+        """
+        Stop scheduling new runs and set cancel_event (thread safe, and safe in a
+        signal handler); stages that have not started are cancelled, run() returns
+        once the running ones finished.
+        """
+        self.cancel_event.set()
+        if self._loop is not None and self._stopping is not None:
+            self._loop.call_soon_threadsafe(self._stopping.set)
@@ -0,0 +1,175 @@
+"""
+Lean page loads for the browser scrapers.
+
+The scrapers only read the text of the result cards, so the browser does not
+need the images, media, fonts, ads and trackers of the pages:
+
+- lean_chrome_options turns images off in the Chrome prefs, makes the hosts
+  of the blocked domains unresolvable for the whole browser (which also
+  covers ad iframes running in their own processes) and sets the "eager"
+  page load strategy, so driver.get returns at DOMContentLoaded;
+- block_requests drops requests for images, media, fonts and the blocked
+  domains of one tab through the DevTools protocol (Network.setBlockedURLs).
+
+page_metrics reads the bytes transferred and the page-ready latency of the
+page shown from the Navigation/Resource Timing API. Cross-origin resources
+that do not send Timing-Allow-Origin report 0 bytes, so the byte counts of
+live pages are a lower bound; against the local MockStorefront they are exact.
+"""
+import logging
+import statistics
+import threading
+
+# Requests a scraper never needs, as Network.setBlockedURLs wildcard patterns
+BLOCKED_RESOURCE_URLS = [
+    f"*.{extension}*" for extension in (
+        "jpg", "jpeg", "png", "gif", "webp", "avif", "svg", "ico",  # images
+        "mp4", "webm", "m3u8", "mp3", "ogg",  # media
+        "woff", "woff2", "ttf", "otf", "eot",  # fonts
+    )
+]
+
+# Ad and tracking hosts loaded by the result pages
+DEFAULT_BLOCKED_DOMAINS = [
+    "doubleclick.net", "googlesyndication.com", "googleadservices.com", "google-analytics.com",
+    "googletagmanager.com", "amazon-adsystem.com", "adsrvr.org", "criteo.com", "criteo.net",
+    "facebook.net", "scorecardresearch.com", "quantserve.com", "bounceexchange.com",
+]
+
+PAGE_METRICS_JS = """
+const nav = performance.getEntriesByType('navigation')[0];
+const resources = performance.getEntriesByType('resource');
+let bytes = nav ? nav.transferSize : 0;
+for (const resource of resources) {
+    bytes += resource.transferSize;
+}
+return {
+    url: location.href,
+    bytes: bytes,
+    requests: resources.length + 1,
+    ready_ms: nav ? nav.domContentLoadedEventEnd : null,
+    load_ms: nav && nav.loadEventEnd ? nav.loadEventEnd : null,
+};
+"""
+
+
+def blocked_url_patterns(blocked_domains=()):
+    """
+    Network.setBlockedURLs patterns for the resource types and domains a scraper skips.
+
+    Args:
+        blocked_domains (iterable): Host names whose requests are dropped, subdomains included
+
+    Returns:
+        list: Wildcard URL patterns
+    """
+    patterns = list(BLOCKED_RESOURCE_URLS)
+    for domain in blocked_domains:
+        patterns += [f"*://{domain}/*", f"*://{domain}:*", f"*://*.{domain}/*", f"*://*.{domain}:*"]
+    return patterns
+
+
+def lean_chrome_options(options, blocked_domains=()):
+    """
+    Configure ChromeOptions for lean page loads (images off, blocked domains, eager loading).
+
+    Args:
+        options (ChromeOptions): Options the browser is started with
+        blocked_domains (iterable): Host names the browser may not connect to
+
+    Returns:
+        ChromeOptions: The same options
+    """
+    options.page_load_strategy = "eager"
+    options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+    options.add_argument("--blink-settings=imagesEnabled=false")
+    options.add_argument("--autoplay-policy=user-gesture-required")
+    rules = [f"MAP {host} ~NOTFOUND" for domain in blocked_domains for host in (domain, f"*.{domain}")]
+    if rules:
+        options.add_argument(f"--host-resolver-rules={', '.join(rules)}")
+    return options
+
+
+def block_requests(driver, patterns):
+    """
+    Drop requests matching patterns in the tab the driver is focused on.
+
+    Args:
+        driver (WebDriver): Chrome WebDriver instance
+        patterns (list): Wildcard URL patterns from blocked_url_patterns
+
+    Returns:
+        bool: False when the browser does not support the DevTools protocol
+    """
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(patterns)})
+        return True
+    except Exception as e:
+        logging.debug(f"Request blocking is not available: {e}")
+        return False
+
+
+def page_metrics(driver):
+    """
+    Bytes transferred and load timings of the page shown in the driver.
+
+    Returns:
+        dict or None: url, bytes, requests, ready_ms (DOMContentLoaded) and load_ms
+            (load event, None while still loading); None if they cannot be read
+    """
+    try:
+        return driver.execute_script(PAGE_METRICS_JS)
+    except Exception as e:
+        logging.debug(f"Could not read page metrics: {e}")
+        return None
+
+
+class PageLoadStats:
+    """Thread safe per-website collection of page_metrics results for a scrape run."""
+
+    def __init__(self):
+        self._pages = {}
+        self._lock = threading.Lock()
+
+    def add(self, website, metrics):
+        with self._lock:
+            self._pages.setdefault(website, []).append(metrics)
+
+    @property
+    def pages(self):
+        with self._lock:
+            return sum(len(pages) for pages in self._pages.values())
+
+    def summary(self):
+        """
+        Per-website totals of the collected pages.
+
+        Returns:
+            dict: website -> {pages, bytes, mean_bytes, mean_ready_ms, max_ready_ms}
+        """
+        with self._lock:
+            collected = {website: list(pages) for website, pages in self._pages.items()}
+        report = {}
+        for website, pages in collected.items():
+            ready = [page["ready_ms"] for page in pages if page.get("ready_ms") is not None]
+            total = sum(page.get("bytes") or 0 for page in pages)
+            report[website] = {
+                "pages": len(pages),
+                "bytes": total,
+                "mean_bytes": total / len(pages),
+                "mean_ready_ms": statistics.fmean(ready) if ready else None,
+                "max_ready_ms": max(ready) if ready else None,
+            }
+        return report
+
+
+def log_page_loads(stats):
+    """Log the per-website page weight and ready latency of a finished scrape run."""
+    for website, report in stats.summary().items():
+        ready = ""
+        if report["mean_ready_ms"] is not None:
+            ready = (f", ready after {report['mean_ready_ms'] / 1000:.2f}s on average "
+                     f"(slowest {report['max_ready_ms'] / 1000:.2f}s)")
+        logging.info(f"{website}: {report['pages']} browser pages, "
+                     f"{report['mean_bytes'] / 1024:.0f} KiB transferred per page{ready}")
@@ -0,0 +1,369 @@
+"""
+Low-overhead metrics for the tracker, exposed in the Prometheus text format.
+
+MetricsRegistry keeps counters, gauges and histograms in memory; recording
+a value is a dict update under a lock, so the instrumentation stays on in
+production. The tracker records:
+
+- the duration and failures of its hot-path stages (timed_stage), with the
+  process memory after each stage;
+- every WebDriver command sent to a browser and the time spent waiting for
+  it (count_webdriver_commands), i.e. the browser round trips;
+- products scraped per website, category and source, product cards dropped
+  for missing fields and fields read with a fallback selector.
+
+MetricsServer serves the registry on a local port (/metrics) together with
+the summary of the last scrape run (/summary, JSON).
+"""
+import functools
+import inspect
+import json
+import logging
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from page_ready import LatencyHistogram
+
+# Upper bounds (seconds) of the stage duration buckets
+DURATION_BUCKETS = (0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+
+# Metric name -> (type, help text); names are exported with the registry prefix
+METRICS = {
+    "stage_duration_seconds": ("histogram", "Duration of the tracker's instrumented stages"),
+    "stage_failures_total": ("counter", "Instrumented stage calls that raised an exception"),
+    "scrape_jobs_total": ("counter", "Finished website/category scrape jobs by outcome"),
+    "products_extracted_total": ("counter", "Products scraped by website, category and source"),
+    "parse_failures_total": ("counter", "Product cards dropped because a required field could not be read"),
+    "fallback_selector_hits_total": ("counter", "Product fields read with a fallback selector"),
+    "webdriver_commands_total": ("counter", "WebDriver commands sent to the browsers (round trips)"),
+    "webdriver_command_seconds_total": ("counter", "Time spent waiting for WebDriver commands"),
+    "resident_memory_bytes": ("gauge", "Resident memory of the tracker process"),
+    "peak_resident_memory_bytes": ("gauge", "Peak resident memory of the tracker process"),
+}
+
+# Metrics in a run summary and the label they are broken down by
+SUMMARY_TOTALS = {
+    "stage_duration_seconds": "stage",
+    "stage_failures_total": "stage",
+    "products_extracted_total": "website",
+    "parse_failures_total": "website",
+    "fallback_selector_hits_total": "field",
+    "webdriver_commands_total": "command",
+    "webdriver_command_seconds_total": "command",
+}
+
+
+def resident_memory():
+    """(current, peak) resident memory of this process in bytes; either may be None."""
+    current = peak = None
+    try:
+        with open("/proc/self/statm", encoding="utf-8") as f:
+            current = int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import resource
+
+        # ru_maxrss is in KiB on Linux
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    except (ImportError, OSError):
+        pass
+    return current, peak
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in pairs) + "}"
+
+
+def _format_number(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class MetricsRegistry:
+    def __init__(self, prefix="tracker", enabled=True):
+        """
+        Thread safe in-memory counters, gauges and histograms.
+
+        Args:
+            prefix (str): Prefix of the exported metric names
+            enabled (bool): When False every recording call returns right away
+        """
+        self.prefix = prefix
+        self.enabled = enabled
+        self._values = {}  # (name, sorted label pairs) -> float or LatencyHistogram
+        self._lock = threading.Lock()
+
+    def inc(self, name, value=1, **labels):
+        """Add value to a counter."""
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + value
+
+    def set(self, name, value, **labels):
+        """Set a gauge."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._values[(name, tuple(sorted(labels.items())))] = value
+
+    def observe(self, name, value, **labels):
+        """Add an observation to a histogram."""
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._values.get(key)
+            if histogram is None:
+                histogram = self._values[key] = LatencyHistogram(DURATION_BUCKETS)
+            histogram.observe(value)
+
+    def record_memory(self):
+        """Update the resident memory gauges."""
+        if not self.enabled:
+            return
+        current, peak = resident_memory()
+        if current is not None:
+            self.set("resident_memory_bytes", current)
+        if peak is not None:
+            self.set("peak_resident_memory_bytes", peak)
+
+    def totals(self, name, label=None):
+        """
+        Values of a metric summed by one of its labels.
+
+        Args:
+            name (str): Metric name
+            label (str): Label to group by (None sums everything under the key None)
+
+        Returns:
+            dict: Label value -> value (histograms: {"count": n, "sum": seconds})
+        """
+        totals = {}
+        with self._lock:
+            for (metric, labels), value in self._values.items():
+                if metric != name:
+                    continue
+                group = dict(labels).get(label) if label else None
+                if isinstance(value, LatencyHistogram):
+                    total = totals.setdefault(group, {"count": 0, "sum": 0.0})
+                    total["count"] += value.count
+                    total["sum"] += value.sum
+                else:
+                    totals[group] = totals.get(group, 0) + value
+        return totals
+
+    def totals_since(self, baseline=None):
+        """
+        SUMMARY_TOTALS of the registry, minus those of an earlier call.
+
+        Args:
+            baseline (dict): Result of an earlier totals_since() call, e.g. at the start of a run
+
+        Returns:
+            dict: Metric name -> {label value: value}
+        """
+        report = {}
+        for name, label in SUMMARY_TOTALS.items():
+            before = (baseline or {}).get(name, {})
+            totals = {}
+            for group, value in self.totals(name, label).items():
+                if isinstance(value, dict):
+                    previous = before.get(group, {"count": 0, "sum": 0.0})
+                    value = {"count": value["count"] - previous["count"], "sum": value["sum"] - previous["sum"]}
+                    if value["count"]:
+                        totals[group] = value
+                elif value - before.get(group, 0):
+                    totals[group] = value - before.get(group, 0)
+            report[name] = totals
+        return report
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format (version 0.0.4)."""
+        with self._lock:
+            items = []
+            for (name, labels), value in self._values.items():
+                if isinstance(value, LatencyHistogram):
+                    value = (value.cumulative(), value.count, value.sum)
+                items.append((name, labels, value))
+
+        lines = []
+        for name in sorted({name for name, _, _ in items}):
+            kind, help_text = METRICS.get(name, ("untyped", name))
+            full_name = f"{self.prefix}_{name}" if self.prefix else name
+            lines.append(f"# HELP {full_name} {help_text}")
+            lines.append(f"# TYPE {full_name} {kind}")
+            for _, labels, value in sorted((item for item in items if item[0] == name), key=lambda item: item[1]):
+                if isinstance(value, tuple):
+                    buckets, count, total = value
+                    for bound, cumulative in buckets:
+                        lines.append(f"{full_name}_bucket{_format_labels(labels, [('le', _format_number(bound))])} "
+                                     f"{cumulative}")
+                    lines.append(f"{full_name}_sum{_format_labels(labels)} {_format_number(total)}")
+                    lines.append(f"{full_name}_count{_format_labels(labels)} {count}")
+                else:
+                    lines.append(f"{full_name}{_format_labels(labels)} {_format_number(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def timed_stage(stage, profile_by=()):
+    """
+    Method decorator recording the duration (and failures) of every call in self.metrics.
+
+    When the tracker has a profiler (self.profiler, see profiling.StageProfiler)
+    every call is also profiled as a stage.
+
+    Args:
+        stage (str): Value of the "stage" label
+        profile_by (tuple): Arguments of the method appended to the stage name of its
+            profile, e.g. ("website", "category") profiles every scrape job on its own
+    """
+    def decorate(method):
+        signature = inspect.signature(method)
+
+        def measured(self, *args, **kwargs):
+            metrics = getattr(self, "metrics", None)
+            if metrics is None or not metrics.enabled:
+                return method(self, *args, **kwargs)
+            start = time.perf_counter()
+            failed = True
+            try:
+                result = method(self, *args, **kwargs)
+                failed = False
+                return result
+            finally:
+                metrics.observe("stage_duration_seconds", time.perf_counter() - start, stage=stage)
+                if failed:
+                    metrics.inc("stage_failures_total", stage=stage)
+                metrics.record_memory()
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            profiler = getattr(self, "profiler", None)
+            if profiler is None:
+                return measured(self, *args, **kwargs)
+            name = stage
+            if profile_by:
+                arguments = signature.bind_partial(self, *args, **kwargs).arguments
+                name = "/".join([stage] + [str(arguments[arg]) for arg in profile_by if arg in arguments])
+            with profiler.stage(name):
+                return measured(self, *args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def count_webdriver_commands(driver, metrics):
+    """
+    Count every command the driver sends to its browser, and the time spent waiting for it.
+
+    All WebDriver calls (driver and element methods, scripts, DevTools commands)
+    go through driver.execute, which is wrapped on this driver instance.
+
+    Args:
+        driver (WebDriver): Selenium WebDriver instance
+        metrics (MetricsRegistry): Registry the commands are counted in
+
+    Returns:
+        WebDriver: The same driver
+    """
+    execute = driver.execute
+
+    def counted(driver_command, params=None):
+        start = time.perf_counter()
+        try:
+            return execute(driver_command, params)
+        finally:
+            metrics.inc("webdriver_commands_total", command=driver_command)
+            metrics.inc("webdriver_command_seconds_total", time.perf_counter() - start, command=driver_command)
+
+    driver.execute = counted
+    return driver
+
+
+def write_json(path, data):
+    """Write data as JSON, replacing path atomically."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, default=str)
+    os.replace(tmp_path, path)
+
+
+class MetricsServer:
+    def __init__(self, registry, host="127.0.0.1", port=9464, summary=None):
+        """
+        Local HTTP endpoint for the metrics of a running tracker.
+
+        GET /metrics returns the registry in the Prometheus text format and
+        GET /summary the summary of the last scrape run as JSON.
+
+        Args:
+            registry (MetricsRegistry): Metrics to serve
+            host (str): Interface to bind (keep it local)
+            port (int): Port to bind (0 picks a free port)
+            summary (callable): Optional summary() -> dict of the last run, or None
+        """
+        self.registry = registry
+        self.summary = summary
+        self.server = ThreadingHTTPServer((host, port), self._handler())
+        self.server.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, name="metrics-server", daemon=True)
+        self.thread.start()
+        logging.info(f"Serving metrics at {self.url}/metrics")
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                path = self.path.split("?", 1)[0].rstrip("/")
+                if path == "/metrics":
+                    content_type = "text/plain; version=0.0.4; charset=utf-8"
+                    data = server.registry.render().encode("utf-8")
+                elif path == "/summary":
+                    content_type = "application/json"
+                    summary = server.summary() if server.summary else None
+                    data = json.dumps(summary or {}, indent=2, default=str).encode("utf-8")
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                logging.debug(f"metrics: {format % args}")
+
+        return Handler
@@ -0,0 +1,181 @@
+"""
+Crawl several result pages of a search at once.
+
+The scrapers read the first results page of a search and then follow its
+pagination: the URLs of pages 2..K are derived from the "next page" link
+(page_urls), and the pages are loaded with a bounded number in flight,
+either as tabs of the browser already showing page 1 (crawl_tabs) or as
+concurrent requests over the pooled HTTP session (fetch_pages). Pacing is
+left to the caller's per-host rate limiter, which is consulted before every
+page is requested.
+"""
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Query parameters the sites number their result pages with
+PAGE_PARAMS = ("page", "cp", "pg", "p")
+
+
+def page_urls(next_url, pages):
+    """
+    URLs of result pages 2..pages, derived from the link to page 2.
+
+    The page number is the query parameter of next_url whose value is 2
+    (preferring the usual page parameter names). When there is none, only
+    next_url itself can be crawled.
+
+    Args:
+        next_url (str): Absolute URL of the second results page
+        pages (int): Number of result pages to crawl in total, counting page 1
+
+    Returns:
+        list: (page number, url) tuples
+    """
+    if not next_url or pages < 2:
+        return []
+    parts = urlsplit(next_url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    numbered = [i for i, (key, value) in enumerate(query) if value == "2"]
+    if not numbered:
+        logging.warning(f"Could not find the page number in {next_url}, crawling the next page only")
+        return [(2, next_url)]
+    index = next((i for i in numbered if query[i][0] in PAGE_PARAMS), numbered[-1])
+
+    urls = []
+    for page in range(2, pages + 1):
+        query[index] = (query[index][0], str(page))
+        urls.append((page, urlunsplit(parts._replace(query=urlencode(query)))))
+    return urls
+
+
+def crawl_tabs(driver, targets, read_page, max_tabs=3, before_open=None, prepare_tab=None):
+    """
+    Load pages in new tabs of one browser, up to max_tabs at a time.
+
+    Every tab is opened with window.open, so the browser loads the pages in
+    flight concurrently while the oldest one is read. Tabs are read and
+    closed in order, and the next page is opened as soon as one closes. A
+    page without products ends the crawl (it is past the last page of
+    results): the tabs still loading are closed unread and no further pages
+    are opened. The driver is switched back to its original tab afterwards.
+
+    Args:
+        driver (WebDriver): Selenium WebDriver instance
+        targets (list): (page number, url) tuples from page_urls
+        read_page (callable): read_page(driver, page) -> list of products, called
+            with the page's tab focused
+        max_tabs (int): Pages loading or waiting to be read at the same time
+        before_open (callable): Optional before_open(url) called before a page is
+            requested (e.g. to wait for the rate limiter)
+        prepare_tab (callable): Optional prepare_tab(driver) called with every new tab
+            focused while it is still blank, before it starts loading its page
+            (e.g. to set up request blocking)
+
+    Returns:
+        list: read_page results in the order of targets (empty for failed pages)
+    """
+    main_window = driver.current_window_handle
+    pending = deque(targets)
+    in_flight = deque()
+    results = {}
+
+    def open_tab(page, url):
+        if before_open:
+            before_open(url)
+        known = set(driver.window_handles)
+        driver.execute_script("window.open(arguments[0], '_blank');", "about:blank" if prepare_tab else url)
+        handle = next((h for h in driver.window_handles if h not in known), None)
+        if handle is None:
+            raise RuntimeError("the browser did not open a new tab")
+        in_flight.append((page, handle))
+        if prepare_tab:
+            driver.switch_to.window(handle)
+            prepare_tab(driver)
+            # Assigning location returns at once, the page loads in the background
+            driver.execute_script("window.location.href = arguments[0];", url)
+
+    try:
+        while pending or in_flight:
+            while pending and len(in_flight) < max(1, max_tabs):
+                page, url = pending.popleft()
+                try:
+                    open_tab(page, url)
+                except Exception as e:
+                    logging.warning(f"Could not open results page {page} ({url}): {e}")
+                    results[page] = []
+
+            if not in_flight:
+                continue
+            page, handle = in_flight.popleft()
+            try:
+                driver.switch_to.window(handle)
+                results[page] = read_page(driver, page) or []
+            except Exception as e:
+                logging.warning(f"Error reading results page {page}: {e}")
+                results[page] = []
+            finally:
+                try:
+                    driver.close()
+                except Exception:
+                    pass
+            if not results[page] and (pending or in_flight):
+                logging.info(f"Results page {page} has no products, skipping the "
+                             f"{len(pending) + len(in_flight)} pages after it")
+                break
+    finally:
+        for _, handle in in_flight:
+            try:
+                driver.switch_to.window(handle)
+                driver.close()
+            except Exception:
+                pass
+        driver.switch_to.window(main_window)
+
+    return [results.get(page, []) for page, _ in targets]
+
+
+def fetch_pages(targets, fetch_page, max_in_flight=3):
+    """
+    Fetch pages with up to max_in_flight requests at a time.
+
+    Results are read in page order, and the next page is requested as soon as
+    one is read. As in crawl_tabs, a page without products ends the crawl:
+    no further pages are requested and the pages still in flight are dropped.
+
+    Args:
+        targets (list): (page number, url) tuples from page_urls
+        fetch_page (callable): fetch_page(page, url) -> list of products
+        max_in_flight (int): Requests running at the same time
+
+    Returns:
+        list: fetch_page results in the order of targets (empty for failed pages)
+    """
+    if not targets:
+        return []
+
+    def fetch(page, url):
+        try:
+            return fetch_page(page, url) or []
+        except Exception as e:
+            logging.warning(f"Error fetching results page {page} ({url}): {e}")
+            return []
+
+    pending = deque(targets)
+    in_flight = deque()
+    results = {}
+    workers = max(1, min(max_in_flight, len(targets)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="page-fetch") as pool:
+        while pending or in_flight:
+            while pending and len(in_flight) < workers:
+                page, url = pending.popleft()
+                in_flight.append((page, pool.submit(fetch, page, url)))
+            page, future = in_flight.popleft()
+            results[page] = future.result()
+            if not results[page] and (pending or in_flight):
+                logging.info(f"Results page {page} has no products, skipping the "
+                             f"{len(pending) + len(in_flight)} pages after it")
+                break
+
+    return [results.get(page, []) for page, _ in targets]
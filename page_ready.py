@@ -0,0 +1,294 @@
+"""
+Event-driven readiness detection for the browser scrapers.
+
+Instead of sleeping or polling WebDriverWait conditions (every 0.5s by
+default), wait_until_ready injects a probe into the page and blocks in a
+single execute_async_script call until the page is ready:
+
+- a MutationObserver wakes the probe as soon as the selector matches, so
+  a search box or the first result cards are picked up the moment they
+  are inserted;
+- the result grid is then ready once it stopped changing (no result cards
+  added, removed or modified) and no fetch/XHR request has been in flight
+  or finished for `quiet` seconds - the time a page that renders its
+  results with scripts needs to fill the grid. A grid that keeps changing
+  (e.g. a carousel inside the cards) is read after at most `max_settle`
+  seconds.
+
+The quiet period counts from the later of DOMContentLoaded and the last
+fetch/XHR response, so a page that was loaded a while ago (a tab opened
+in the background) is ready right away. The time every wait took is
+collected in per-website histograms (ReadinessStats) and logged after
+each scrape run.
+"""
+import bisect
+import logging
+import threading
+import time
+
+# Upper bounds (seconds) of the readiness histogram buckets
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Error messages of a probe whose document was replaced while it waited
+# (e.g. by submitting a search); the probe is injected again into the new page
+NAVIGATION_ERRORS = ("unloaded", "navigat", "execution context", "target frame detached")
+
+READY_PROBE_JS = """
+const [selector, minCount, quietMs, maxSettleMs, timeoutMs] = arguments;
+const done = arguments[arguments.length - 1];
+const start = performance.now();
+
+// fetch/XHR requests are counted from the first probe injected into a document
+if (!window.__readyNetwork) {
+    const net = window.__readyNetwork = {inFlight: 0, last: 0};
+    const settle = () => { net.inFlight = Math.max(0, net.inFlight - 1); net.last = performance.now(); };
+    if (window.fetch) {
+        const fetch = window.fetch;
+        window.fetch = function () {
+            net.inFlight++;
+            try {
+                return fetch.apply(this, arguments).finally(settle);
+            } catch (e) {
+                settle();
+                throw e;
+            }
+        };
+    }
+    const send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        net.inFlight++;
+        this.addEventListener('loadend', settle, {once: true});
+        try {
+            return send.apply(this, arguments);
+        } catch (e) {
+            settle();
+            throw e;
+        }
+    };
+}
+const net = window.__readyNetwork;
+
+// Before the probe was injected: the parser finished at DOMContentLoaded, and
+// scripts change the page after the responses they fetched
+const nav = performance.getEntriesByType('navigation')[0];
+const requests = performance.getEntriesByType('resource')
+    .filter(entry => entry.initiatorType === 'fetch' || entry.initiatorType === 'xmlhttprequest');
+let lastChange = nav && nav.domContentLoadedEventEnd ? nav.domContentLoadedEventEnd : start;
+for (const entry of requests) {
+    lastChange = Math.max(lastChange, entry.responseEnd);
+}
+
+let changes = 0, firstSeen = null, finished = false, timer = null;
+const touchesGrid = node => node.nodeType === 1 && (node.matches(selector) || node.querySelector(selector) !== null);
+const observer = new MutationObserver(records => {
+    for (const record of records) {
+        const target = record.target.nodeType === 1 ? record.target : record.target.parentElement;
+        if ((target && target.closest(selector)) || [...record.addedNodes].some(touchesGrid)
+                || [...record.removedNodes].some(touchesGrid)) {
+            changes++;
+            lastChange = performance.now();
+            break;
+        }
+    }
+    check();
+});
+let requestObserver = null;
+try {
+    requestObserver = new PerformanceObserver(list => {
+        for (const entry of list.getEntries()) {
+            if (entry.initiatorType === 'fetch' || entry.initiatorType === 'xmlhttprequest') {
+                lastChange = Math.max(lastChange, performance.now());
+            }
+        }
+        check();
+    });
+    requestObserver.observe({type: 'resource'});
+} catch (e) {}
+
+function finish(status, cards) {
+    finished = true;
+    clearTimeout(timer);
+    clearTimeout(deadline);
+    observer.disconnect();
+    if (requestObserver) requestObserver.disconnect();
+    done({
+        status: status,
+        cards: cards,
+        changes: changes,
+        elapsed_ms: performance.now() - start,
+        element: document.querySelector(selector),
+    });
+}
+
+function check() {
+    if (finished) return;
+    const now = performance.now();
+    const cards = document.querySelectorAll(selector).length;
+    if (cards < minCount) {
+        if (now - start >= timeoutMs) finish('timeout', cards);
+        return;  // The observer calls check again once the page changes
+    }
+    if (firstSeen === null) firstSeen = now;
+    const quietFor = now - Math.max(lastChange, net.last);
+    if (quietMs <= 0 || (net.inFlight === 0 && quietFor >= quietMs)) return finish('settled', cards);
+    if (now - firstSeen >= maxSettleMs || now - start >= timeoutMs) return finish('unsettled', cards);
+    clearTimeout(timer);
+    timer = setTimeout(check, Math.max(10, Math.min(quietMs - quietFor, maxSettleMs - (now - firstSeen))));
+}
+
+observer.observe(document.documentElement, {childList: true, subtree: true, attributes: true, characterData: true});
+const deadline = setTimeout(check, timeoutMs);
+check();
+"""
+
+
+class PageNotReady(TimeoutError):
+    """The selector did not appear on the page before the timeout."""
+
+
+def wait_until_ready(driver, selector, timeout=15, quiet=0.15, max_settle=2.0, min_count=1, stats=None, label=None):
+    """
+    Block until selector is on the page and, for quiet > 0, the elements it matches stopped changing.
+
+    Args:
+        driver (WebDriver): Selenium WebDriver instance
+        selector (str): CSS selector of the search box or of the result cards
+        timeout (float): Seconds to wait for the selector before giving up
+        quiet (float): Seconds without changes to the matching elements and without
+            fetch/XHR activity after which the page is ready (0: ready once present)
+        max_settle (float): Seconds after the selector first matched after which a page
+            that keeps changing is read anyway
+        min_count (int): Elements the selector has to match
+        stats (ReadinessStats): Optional collection the wait is recorded in
+        label (tuple): (website, what) key of the wait in stats
+
+    Returns:
+        dict: status ("settled" or "unsettled"), cards (elements matched), changes (changes
+            to them seen while waiting), seconds waited and element (first match)
+
+    Raises:
+        PageNotReady: When the selector did not match within timeout
+    """
+    start = time.monotonic()
+    deadline = start + timeout
+    attempts = 0
+    while True:
+        remaining = max(0.0, deadline - time.monotonic())
+        attempts += 1
+        try:
+            driver.set_script_timeout(remaining + 5)
+            result = driver.execute_async_script(READY_PROBE_JS, selector, min_count, quiet * 1000,
+                                                 max_settle * 1000, remaining * 1000)
+            break
+        except Exception as e:
+            navigated = any(error in str(e) for error in NAVIGATION_ERRORS)
+            if not navigated or attempts >= 5 or time.monotonic() >= deadline:
+                raise
+            logging.debug(f"The page navigated while waiting for {selector}, waiting on the new page")
+
+    result = dict(result or {"status": "timeout", "cards": 0, "changes": 0, "element": None})
+    result["seconds"] = time.monotonic() - start
+    if stats is not None:
+        stats.record(label, result)
+    if result["status"] == "timeout":
+        raise PageNotReady(f"{selector} did not appear within {timeout:g}s")
+    return result
+
+
+class LatencyHistogram:
+    """Counts of durations per LATENCY_BUCKETS bucket, with their count, sum and maximum."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # The last bucket is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+
+    def cumulative(self):
+        """(upper bound, observations <= bound) pairs, ending with (inf, count)."""
+        pairs, total = [], 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            pairs.append((bound, total))
+        return pairs
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-quantile (the maximum for the +Inf bucket)."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        for bound, total in self.cumulative():
+            if total >= rank:
+                return min(bound, self.max)
+        return self.max
+
+
+class ReadinessStats:
+    """Thread safe readiness wait histograms and outcomes per (website, what) of a scrape run."""
+
+    def __init__(self):
+        self.histograms = {}
+        self.outcomes = {}
+        self._lock = threading.Lock()
+
+    def record(self, label, result):
+        with self._lock:
+            if label not in self.histograms:
+                self.histograms[label] = LatencyHistogram()
+                self.outcomes[label] = {"settled": 0, "unsettled": 0, "timeout": 0}
+            self.histograms[label].observe(result["seconds"])
+            self.outcomes[label][result["status"]] = self.outcomes[label].get(result["status"], 0) + 1
+
+    def snapshot(self):
+        """Copies of the histograms and outcomes, safe to read while scrapers record."""
+        with self._lock:
+            histograms = {}
+            for label, histogram in self.histograms.items():
+                copy = LatencyHistogram(histogram.buckets)
+                copy.counts, copy.count = list(histogram.counts), histogram.count
+                copy.sum, copy.max = histogram.sum, histogram.max
+                histograms[label] = copy
+            return histograms, {label: dict(outcomes) for label, outcomes in self.outcomes.items()}
+
+    def summary(self):
+        """
+        Per (website, what) distribution of the recorded waits.
+
+        Returns:
+            dict: "website what" -> {waits, mean_seconds, p50_seconds, p95_seconds, max_seconds, outcomes}
+        """
+        histograms, outcomes = self.snapshot()
+        return {
+            " ".join(map(str, label)) if label else "page": {
+                "waits": histogram.count,
+                "mean_seconds": histogram.sum / histogram.count,
+                "p50_seconds": histogram.quantile(0.5),
+                "p95_seconds": histogram.quantile(0.95),
+                "max_seconds": histogram.max,
+                "outcomes": outcomes[label],
+            }
+            for label, histogram in histograms.items()
+        }
+
+
+def log_readiness(stats):
+    """Log the readiness wait distribution of every website and page element of a finished run."""
+    histograms, outcomes = stats.snapshot()
+    for label, histogram in sorted(histograms.items(), key=lambda item: tuple(map(str, item[0] or ()))):
+        name = " ".join(map(str, label)) if label else "page"
+        late = ", ".join(f"{count} {status}" for status, count in outcomes[label].items()
+                         if status != "settled" and count)
+        buckets = " ".join(f"<={bound:g}s:{count}" for bound, count in zip(histogram.buckets, histogram.counts)
+                           if count)
+        if histogram.counts[-1]:
+            buckets += f" >{histogram.buckets[-1]:g}s:{histogram.counts[-1]}"
+        logging.info(f"{name} ready: {histogram.count} waits, mean {histogram.sum / histogram.count:.2f}s, "
+                     f"p50 <={histogram.quantile(0.5):.2f}s, p95 <={histogram.quantile(0.95):.2f}s, "
+                     f"max {histogram.max:.2f}s{f' ({late})' if late else ''} [{buckets}]")
@@ -0,0 +1,283 @@
+"""
+Incremental price-change detection.
+
+Each product keeps a small rolling state (last price, exponentially weighted
+mean and variance, min/max over its last observations) that is updated in
+O(1) per observation as the scrapers save products, so detecting a change
+never rescans history. Detected events are appended to a JSON-lines file:
+
+    price_drop  price fell by at least drop_pct percent since the last observation
+    new_low     price is below every price in the rolling window
+    anomaly     price is more than z_threshold weighted standard deviations
+                away from the weighted mean ("spike" or "dip")
+
+Show the latest events, or rebuild the state from the price-history database:
+    python price_alerts.py processed_data --events 20
+    python price_alerts.py processed_data --rebuild processed_data/price_history.db
+"""
+import argparse
+import json
+import logging
+import math
+import os
+import sqlite3
+from collections import deque
+
+import pandas as pd
+
+from cleaning import parse_prices
+from state_log import StateLog
+
+
+class ProductState:
+    """Rolling price statistics of one product."""
+
+    __slots__ = ('count', 'last_price', 'last_timestamp', 'ewma', 'ewmvar', 'lows', 'highs')
+
+    def __init__(self):
+        self.count = 0
+        self.last_price = None
+        self.last_timestamp = None
+        self.ewma = None
+        self.ewmvar = 0.0
+        # Monotonic deques of (observation number, price): the window min/max is at the front
+        self.lows = deque()
+        self.highs = deque()
+
+    def window_low(self):
+        return self.lows[0][1] if self.lows else None
+
+    def window_high(self):
+        return self.highs[0][1] if self.highs else None
+
+    def update(self, price, timestamp, alpha, window):
+        """Add one observation; amortized O(1)."""
+        if self.ewma is None:
+            self.ewma = price
+        else:
+            # Exponentially weighted mean and variance (incremental form)
+            delta = price - self.ewma
+            self.ewma += alpha * delta
+            self.ewmvar = (1 - alpha) * (self.ewmvar + alpha * delta * delta)
+
+        self.count += 1
+        for extremes, is_dominated in ((self.lows, lambda p: p >= price), (self.highs, lambda p: p <= price)):
+            while extremes and is_dominated(extremes[-1][1]):
+                extremes.pop()
+            extremes.append((self.count, price))
+            while extremes[0][0] <= self.count - window:
+                extremes.popleft()
+
+        self.last_price = price
+        self.last_timestamp = timestamp
+
+    def to_dict(self):
+        return {
+            'count': self.count, 'last_price': self.last_price, 'last_timestamp': self.last_timestamp,
+            'ewma': self.ewma, 'ewmvar': self.ewmvar,
+            'lows': [list(item) for item in self.lows], 'highs': [list(item) for item in self.highs],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        state = cls()
+        state.count = data['count']
+        state.last_price = data['last_price']
+        state.last_timestamp = data['last_timestamp']
+        state.ewma = data['ewma']
+        state.ewmvar = data['ewmvar']
+        state.lows = deque(tuple(item) for item in data['lows'])
+        state.highs = deque(tuple(item) for item in data['highs'])
+        return state
+
+
+class PriceChangeDetector:
+    def __init__(self, state_path, events_path, alpha=0.3, window=30, drop_pct=5.0,
+                 z_threshold=3.0, min_observations=5, on_event=None):
+        """
+        Per-product rolling price state with price-drop and anomaly events.
+
+        Not thread safe; the tracker feeds it one saved batch at a time.
+
+        Args:
+            state_path (str): JSON file the rolling state is kept in; save() only appends
+                the states changed since the last save, see state_log.StateLog
+            events_path (str): JSON-lines file events are appended to
+            alpha (float): Weight of the newest price in the moving mean and variance
+            window (int): Observations covered by the rolling min/max
+            drop_pct (float): Smallest drop from the last price reported as price_drop
+            z_threshold (float): Weighted standard deviations from the mean reported as anomaly
+            min_observations (int): Observations needed before new_low and anomaly events
+            on_event (callable): Optional on_event(event) called for every event, e.g. queue.put
+        """
+        self.state_path = state_path
+        self.events_path = events_path
+        self.alpha = alpha
+        self.window = window
+        self.drop_pct = drop_pct
+        self.z_threshold = z_threshold
+        self.min_observations = min_observations
+        self.on_event = on_event
+        self.log = StateLog(state_path)
+        self.states = {}
+        self._changed = set()
+        try:
+            self.states = {key: ProductState.from_dict(item) for key, item in self.log.load().items()}
+        except (OSError, ValueError, KeyError) as e:
+            logging.error(f"Could not read price state {state_path}, starting a new one: {e}")
+
+    def update(self, key, price, timestamp, **details):
+        """
+        Add one price observation of a product and detect changes against its prior state.
+
+        Observations not newer than the product's last one (replayed or duplicate
+        rows) are ignored.
+
+        Args:
+            key (str): Product key
+            price (float): Observed price
+            timestamp (str): Observation time, 'YYYY-MM-DD HH:MM:SS'
+            **details: Extra fields copied into the events (name, website, ...)
+
+        Returns:
+            list: Event dicts
+        """
+        if price is None or math.isnan(price):
+            return []
+        state = self.states.get(key)
+        if state is None:
+            state = self.states[key] = ProductState()
+        elif state.last_timestamp is not None and timestamp is not None and timestamp <= state.last_timestamp:
+            return []
+
+        events = []
+
+        def event(kind, **fields):
+            events.append({'event': kind, 'product_key': key, 'timestamp': timestamp, 'price': price,
+                           **details, **fields})
+
+        if state.last_price:
+            change_pct = (price - state.last_price) / state.last_price * 100
+            if change_pct <= -self.drop_pct:
+                event('price_drop', previous_price=state.last_price, change_pct=round(change_pct, 2))
+        if state.count >= self.min_observations:
+            low = state.window_low()
+            if price < low:
+                event('new_low', previous_low=low, window=min(state.count, self.window))
+            # A floor of 1% of the mean keeps a perfectly flat history from flagging every cent
+            deviation = max(math.sqrt(state.ewmvar), abs(state.ewma) * 0.01)
+            zscore = (price - state.ewma) / deviation if deviation else 0.0
+            if abs(zscore) >= self.z_threshold:
+                event('anomaly', direction='spike' if zscore > 0 else 'dip',
+                      ewma=round(state.ewma, 2), zscore=round(zscore, 2))
+
+        state.update(price, timestamp, self.alpha, self.window)
+        self._changed.add(key)
+        return events
+
+    def observe(self, products, first_token=False):
+        """
+        Update the state with a batch of saved products and append its events to the events file.
+
+        Args:
+            products (list): Product dicts with product_key, price, timestamp (and name, website, category)
+            first_token (bool): Price parsing mode, see cleaning.parse_price
+
+        Returns:
+            list: Event dicts
+        """
+        df = pd.DataFrame(products, columns=['product_key', 'name', 'website', 'category', 'timestamp', 'price'])
+        prices = parse_prices(df['price'], first_token=first_token)
+        events = []
+        for key, price, timestamp, name, website, category in zip(
+                df['product_key'], prices, df['timestamp'], df['name'], df['website'], df['category']):
+            if isinstance(key, str):
+                events.extend(self.update(key, float(price), timestamp, name=name, website=website, category=category))
+        self.emit(events)
+        return events
+
+    def emit(self, events):
+        if not events:
+            return
+        with open(self.events_path, 'a', encoding='utf-8') as f:
+            for event in events:
+                f.write(json.dumps(event) + '\n')
+        if self.on_event:
+            for event in events:
+                self.on_event(event)
+
+    def get(self, key):
+        """Rolling state of a product, or None."""
+        return self.states.get(key)
+
+    def save(self):
+        """Persist the states changed since the last save (O(changes))."""
+        changes = {key: self.states[key].to_dict() for key in self._changed}
+        self.log.append(changes, self._state)
+        self._changed = set()
+
+    def compact(self):
+        """Rewrite the state file with every product (atomically) and drop the change log."""
+        self._changed = set()
+        self.log.compact(self._state())
+
+    def _state(self):
+        return {key: state.to_dict() for key, state in self.states.items()}
+
+
+def recent_events(events_path, limit=20):
+    """Last events of the events file, oldest first."""
+    if not os.path.exists(events_path):
+        return []
+    with open(events_path, encoding='utf-8') as f:
+        lines = deque(f, maxlen=limit)
+    return [json.loads(line) for line in lines]
+
+
+def rebuild_state(detector, db_path, batch_size=10000):
+    """
+    Replay every observation of a price-history database into an empty detector.
+
+    Events are not written; this only rebuilds the rolling state.
+    """
+    detector.states = {}
+    detector._changed = set()
+    conn = sqlite3.connect(db_path)
+    try:
+        cursor = conn.execute(
+            "SELECT product_key, price_value, timestamp FROM observations "
+            "WHERE price_value IS NOT NULL ORDER BY timestamp, observation_id"
+        )
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            for key, price, timestamp in rows:
+                detector.update(key, price, timestamp)
+    finally:
+        conn.close()
+    detector.compact()
+    return len(detector.states)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("directory", help="directory with price_state.json and price_events.jsonl")
+    parser.add_argument("--events", type=int, default=20, help="number of recent events to show")
+    parser.add_argument("--rebuild", metavar="DB", help="rebuild the rolling state from a price-history database")
+    args = parser.parse_args()
+
+    state_path = os.path.join(args.directory, 'price_state.json')
+    events_path = os.path.join(args.directory, 'price_events.jsonl')
+    if args.rebuild:
+        products = rebuild_state(PriceChangeDetector(state_path, events_path), args.rebuild)
+        print(f"Rebuilt the price state of {products} products from {args.rebuild}")
+        return
+    events = recent_events(events_path, args.events)
+    if events:
+        pd.set_option("display.width", 200)
+        print(pd.DataFrame(events).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
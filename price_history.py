@@ -0,0 +1,237 @@
+"""
+Embedded SQLite store of every scraped price, for time-series lookups without
+reading old snapshot files.
+
+Query a product's price history from the command line:
+    python price_history.py processed_data/price_history.db --product "Amazon:..." --days 90
+    python price_history.py processed_data/price_history.db --search "echo buds"
+"""
+import argparse
+import logging
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from cleaning import parse_prices
+from product_identity import name_key
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY,
+    recorded_at TEXT NOT NULL,
+    source TEXT,
+    product_count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS products (
+    product_key TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    website TEXT,
+    category TEXT,
+    first_seen TEXT,
+    last_seen TEXT
+);
+CREATE TABLE IF NOT EXISTS observations (
+    observation_id INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL REFERENCES runs (run_id),
+    product_key TEXT NOT NULL REFERENCES products (product_key),
+    website TEXT,
+    category TEXT,
+    timestamp TEXT NOT NULL,
+    price TEXT,
+    price_value REAL,
+    rating TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_observations_product_time ON observations (product_key, timestamp);
+CREATE INDEX IF NOT EXISTS idx_observations_site_category_time ON observations (website, category, timestamp);
+"""
+
+
+class PriceHistoryStore:
+    def __init__(self, path):
+        """
+        SQLite database with runs, products and price observations.
+
+        Observations are indexed on (product_key, timestamp) and
+        (website, category, timestamp), so time-series lookups touch only the
+        rows they return however many runs have been recorded.
+
+        The connection may be used from several threads (scrape workers record
+        batches as their jobs finish); calls are serialized by a lock.
+
+        Args:
+            path (str): Database file (created if missing)
+        """
+        self.path = path
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def record_run(self, products, source=None, first_token=False, run_id=None):
+        """
+        Record one scrape run, or one batch of a run, in a single transaction.
+
+        Args:
+            products (list): Product dicts as passed to save_to_csv
+            source (str): Snapshot the products were saved to
+            first_token (bool): Price parsing mode, see cleaning.parse_price
+            run_id (int): Add the products to this earlier run instead of starting a new one
+
+        Returns:
+            int: The run_id
+        """
+        df = pd.DataFrame(products, columns=['name', 'price', 'rating', 'category', 'website', 'timestamp', 'product_key'])
+        # Keys assigned by product_identity, or the name hash for products saved without one
+        keys = [key if isinstance(key, str) else name_key(website, name)
+                for key, website, name in zip(df['product_key'], df['website'], df['name'])]
+        prices = parse_prices(df['price'], first_token=first_token)
+        recorded_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+        with self._lock, self.conn:
+            if run_id is None:
+                cursor = self.conn.execute(
+                    "INSERT INTO runs (recorded_at, source, product_count) VALUES (?, ?, ?)",
+                    (recorded_at, source, len(df)),
+                )
+                run_id = cursor.lastrowid
+            else:
+                self.conn.execute("UPDATE runs SET product_count = product_count + ? WHERE run_id = ?",
+                                  (len(df), run_id))
+            self.conn.executemany(
+                """INSERT INTO products (product_key, name, website, category, first_seen, last_seen)
+                   VALUES (?, ?, ?, ?, ?, ?)
+                   ON CONFLICT (product_key) DO UPDATE SET
+                       name = excluded.name,
+                       first_seen = MIN(first_seen, excluded.first_seen),
+                       last_seen = MAX(last_seen, excluded.last_seen)""",
+                [(key, name, website, category, timestamp, timestamp)
+                 for key, name, website, category, timestamp
+                 in zip(keys, df['name'], df['website'], df['category'], df['timestamp'])],
+            )
+            self.conn.executemany(
+                """INSERT INTO observations
+                   (run_id, product_key, website, category, timestamp, price, price_value, rating)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                [(run_id, key, website, category, timestamp, price,
+                  None if pd.isna(value) else float(value), rating)
+                 for key, website, category, timestamp, price, value, rating
+                 in zip(keys, df['website'], df['category'], df['timestamp'], df['price'], prices, df['rating'])],
+            )
+        logging.info(f"Recorded {len(df)} observations as run {run_id} in {self.path}")
+        return run_id
+
+    def _query(self, sql, params):
+        with self._lock:
+            return pd.read_sql_query(sql, self.conn, params=params)
+
+    @staticmethod
+    def _time_range(since, until):
+        clauses, params = "", []
+        if since:
+            clauses += " AND timestamp >= ?"
+            params.append(since)
+        if until:
+            try:
+                # A bare date includes that whole day
+                day = datetime.strptime(until, "%Y-%m-%d")
+            except ValueError:
+                clauses += " AND timestamp <= ?"
+                params.append(until)
+            else:
+                clauses += " AND timestamp < ?"
+                params.append((day + timedelta(days=1)).strftime("%Y-%m-%d"))
+        return clauses, params
+
+    def price_history(self, key, since=None, until=None):
+        """
+        Observations of one product in time order.
+
+        Args:
+            key (str): Product key, see product_identity.product_key
+            since (str): First timestamp to include, e.g. '2024-12-01'
+            until (str): Last timestamp to include; a date such as '2024-12-31'
+                includes the whole day
+
+        Returns:
+            pandas.DataFrame: timestamp, price, price_value, rating, run_id
+        """
+        clauses, params = self._time_range(since, until)
+        return self._query(
+            "SELECT timestamp, price, price_value, rating, run_id FROM observations "
+            f"WHERE product_key = ?{clauses} ORDER BY timestamp",
+            [key] + params,
+        )
+
+    def category_history(self, website, category, since=None, until=None):
+        """
+        Observations of every product in a website's category in time order.
+
+        Returns:
+            pandas.DataFrame: product_key, timestamp, price_value, rating
+        """
+        clauses, params = self._time_range(since, until)
+        return self._query(
+            "SELECT product_key, timestamp, price_value, rating FROM observations "
+            f"WHERE website = ? AND category = ?{clauses} ORDER BY timestamp",
+            [website, category] + params,
+        )
+
+    def latest_prices(self, website, category):
+        """
+        Most recent observation of each product in a website's category.
+
+        Returns:
+            pandas.DataFrame: product_key, name, timestamp, price_value
+        """
+        return self._query(
+            """SELECT p.product_key, p.name, o.timestamp, o.price_value
+               FROM products p JOIN observations o
+                 ON o.product_key = p.product_key AND o.timestamp = p.last_seen
+               WHERE p.website = ? AND p.category = ?
+               GROUP BY p.product_key
+               ORDER BY p.name""",
+            (website, category),
+        )
+
+    def find_products(self, text, limit=20):
+        """Products whose name contains text (case-insensitive)."""
+        return self._query(
+            "SELECT * FROM products WHERE name LIKE ? ORDER BY last_seen DESC LIMIT ?",
+            (f"%{text}%", limit),
+        )
+
+    def runs(self):
+        return self._query("SELECT * FROM runs ORDER BY run_id", ())
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("db")
+    parser.add_argument("--product", help="product key to show the history of")
+    parser.add_argument("--days", type=int, default=90, help="history window for --product")
+    parser.add_argument("--search", help="list products whose name contains this text")
+    args = parser.parse_args()
+
+    store = PriceHistoryStore(args.db)
+    pd.set_option("display.width", 200)
+    pd.set_option("display.max_colwidth", 80)
+    if args.product:
+        since = (datetime.now() - timedelta(days=args.days)).strftime("%Y-%m-%d")
+        print(store.price_history(args.product, since=since).to_string(index=False))
+    elif args.search:
+        print(store.find_products(args.search).to_string(index=False))
+    else:
+        print(store.runs().to_string(index=False))
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+import hashlib
+import logging
+import re
+import string
+
+import numpy as np
+import pandas as pd
+
+from state_log import StateLog
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    pa = None
+
+# Listing ids as they appear on the cards and in product URLs
+LISTING_IDS = {
+    "Amazon": ("asin", re.compile(r"^[A-Z0-9]{10}$"), re.compile(r"/(?:dp|gp/product)/([A-Z0-9]{10})(?:[/?#]|$)")),
+    "BestBuy": ("sku", re.compile(r"^\d{6,8}$"), re.compile(r"[?&]skuId=(\d{6,8})|/(\d{6,8})\.p(?:[?#]|$)")),
+}
+
+
+# Only ASCII letters are lowercased, so Python and Arrow normalize every name the same way
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+_NOT_ALNUM = r"[^a-z0-9]+"
+
+
+def normalize_name(name):
+    """Lowercase the name and collapse punctuation and spacing, e.g. 'Echo  Buds (2023)' -> 'echo buds 2023'"""
+    if pd.isna(name):
+        return ""
+    return re.sub(_NOT_ALNUM, " ", str(name).translate(_ASCII_LOWER)).strip()
+
+
+def _name_hash(normalized):
+    return hashlib.sha1(normalized.encode('utf-8')).hexdigest()[:16]
+
+
+def name_key(website, name):
+    """Fallback product key: website plus a hash of the normalized name."""
+    return f"{website}:{_name_hash(normalize_name(name))}"
+
+
+def name_keys(websites, names):
+    """
+    Vectorized name_key for whole columns; each distinct normalized name is hashed once.
+
+    Returns:
+        pandas.Series: name_key per row
+    """
+    websites, names = pd.Series(websites), pd.Series(names)
+    if pa is None:
+        normalized = names.map(normalize_name)
+    else:
+        text = pc.ascii_lower(pa.array(names.astype(object).where(names.notna(), "").astype(str), type=pa.string()))
+        text = pc.utf8_trim(pc.replace_substring_regex(text, _NOT_ALNUM, " "), " ")
+        normalized = pd.Series(text.to_numpy(zero_copy_only=False), index=names.index)
+    codes, uniques = pd.factorize(normalized)
+    hashes = np.array([_name_hash(name) for name in uniques.tolist()], dtype=object)[codes]
+    return websites.astype(object).astype(str) + ":" + pd.Series(hashes, index=names.index, dtype=object)
+
+
+def listing_id(website, product_id=None, url=None):
+    """
+    Site listing id (ASIN, SKU) from a card attribute or, failing that, the product URL.
+
+    Returns:
+        str or None: The id, or None when neither contains a valid one
+    """
+    _, id_pattern, url_pattern = LISTING_IDS.get(website, (None, None, None))
+    if isinstance(product_id, str):
+        product_id = product_id.strip()
+        if product_id and product_id != "N/A" and (id_pattern is None or id_pattern.match(product_id)):
+            return product_id
+    if url_pattern is not None and isinstance(url, str):
+        match = url_pattern.search(url)
+        if match:
+            return next(group for group in match.groups() if group)
+    return None
+
+
+def product_key(website, name, product_id=None, url=None):
+    """
+    Stable key of a product listing: '<website>:<asin|sku>:<id>' when the listing id
+    is known, otherwise the name_key.
+    """
+    found = listing_id(website, product_id, url)
+    if found:
+        kind = LISTING_IDS[website][0] if website in LISTING_IDS else "id"
+        return f"{website}:{kind}:{found}"
+    return name_key(website, name)
+
+
+class ProductIndex:
+    def __init__(self, path):
+        """
+        Persistent hash index from product key to product record.
+
+        Besides the records it keeps aliases from each product's name_key to its
+        listing id key, so rows scraped without an id (older snapshots, element
+        mode, pages without the attribute) resolve to the same product. save()
+        only appends the records and aliases changed since the last save, see
+        state_log.StateLog.
+
+        Args:
+            path (str): Location of the index JSON file
+        """
+        self.path = path
+        self.log = StateLog(path, depth=2)
+        self.products = {}
+        self.aliases = {}
+        self._changed = set()
+        self._new_aliases = {}
+        try:
+            data = self.log.load()
+            self.products = data.get('products', {})
+            self.aliases = data.get('aliases', {})
+        except (OSError, ValueError) as e:
+            logging.error(f"Could not read product index {path}, starting a new one: {e}")
+
+    def resolve(self, website, name, product_id=None, url=None):
+        """Product key for one listing, learning the name alias when the id is known."""
+        alias = name_key(website, name)
+        key = product_key(website, name, product_id, url)
+        if key != alias:
+            if self.aliases.get(alias) != key:
+                self.aliases[alias] = self._new_aliases[alias] = key
+            return key
+        return self.aliases.get(alias, alias)
+
+    def identify(self, products):
+        """
+        Add a 'product_key' to each product dict and update the index records.
+
+        Args:
+            products (list): Product dicts as scraped (may carry 'product_id' and 'url')
+        """
+        for product in products:
+            key = self.resolve(product.get('website'), product.get('name'),
+                               product.get('product_id'), product.get('url'))
+            product['product_key'] = key
+            self._changed.add(key)
+            timestamp = product.get('timestamp')
+            record = self.products.get(key)
+            if record is None:
+                self.products[key] = {
+                    'name': product.get('name'),
+                    'website': product.get('website'),
+                    'category': product.get('category'),
+                    'url': product.get('url') if product.get('url') != 'N/A' else None,
+                    'first_seen': timestamp,
+                    'last_seen': timestamp,
+                }
+            else:
+                record['name'] = product.get('name')
+                record['last_seen'] = max(record['last_seen'] or '', timestamp or '')
+
+    def keys_for(self, df):
+        """
+        Product keys for a snapshot DataFrame.
+
+        Rows saved with a product_key keep it; older rows are resolved through
+        the name aliases.
+
+        Returns:
+            pandas.Series: Product key per row
+        """
+        if 'product_key' in df:
+            keys = df['product_key'].astype(object)
+        else:
+            keys = pd.Series(None, index=df.index, dtype=object)
+        missing = keys.isna()
+        if missing.any():
+            aliases = name_keys(df.loc[missing, 'website'], df.loc[missing, 'name']).astype(object)
+            keys[missing] = aliases.map(self.aliases).where(lambda resolved: resolved.notna(), aliases)
+        return keys
+
+    def get(self, key):
+        """Product record for a key (O(1)), or None."""
+        return self.products.get(key)
+
+    def save(self):
+        """Persist the records and aliases changed since the last save (O(changes))."""
+        changes = {}
+        if self._changed:
+            changes['products'] = {key: self.products[key] for key in self._changed}
+        if self._new_aliases:
+            changes['aliases'] = self._new_aliases
+        self.log.append(changes, lambda: {'products': self.products, 'aliases': self.aliases})
+        self._changed = set()
+        self._new_aliases = {}
+
+    def compact(self):
+        """Rewrite the index file with every record and alias (atomically) and drop the change log."""
+        self.save()
+        self.log.compact({'products': self.products, 'aliases': self.aliases})
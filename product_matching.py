@@ -0,0 +1,209 @@
+"""
+Cross-site product matching: pairs listings of the same product on different
+websites from their long, noisy scraped titles.
+
+Listings are first blocked on category, brand and model tokens ("laptops",
+"lenovo", "v15"), so titles with model tokens are only compared when they
+share one; titles without any are compared with the listings of the same
+category and brand that have none either. Candidate pairs are then scored
+by TF-IDF cosine similarity and matched one-to-one, best score first.
+"""
+import logging
+import math
+import re
+from collections import Counter, defaultdict
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+from cleaning import parse_prices
+from product_identity import normalize_name
+
+# Tokens that say nothing about which product a title is
+STOPWORDS = frozenset("""
+a an and the with for of in to by on at from or new renewed latest edition model version
+""".split())
+# Spec and unit tokens ("16gb", "1080p", "65w") mix letters and digits but are shared by many models
+SPEC_TOKEN = re.compile(r"^\d+(?:gb|tb|mb|ghz|mhz|hz|w|mah|in|inch|mm|cm|p|k|x|th|st|nd|rd|gen|ft|oz|lb|lbs|pk|pack)$")
+LETTERS_AND_DIGITS = re.compile(r"^(?=[a-z0-9]*[a-z])(?=[a-z0-9]*[0-9])[a-z0-9]{2,}$")
+
+
+def _model_parts(a, b):
+    """Whether adjacent tokens look like two halves of one model code."""
+    a_mixed, b_mixed = bool(LETTERS_AND_DIGITS.match(a)), bool(LETTERS_AND_DIGITS.match(b))
+    if a_mixed and b_mixed:
+        return True
+    if a_mixed or b_mixed:
+        other = b if a_mixed else a
+        return other.isdigit() or (other.isalpha() and len(other) <= 3)
+    return False
+
+
+def title_tokens(name):
+    """
+    Split a title into matching features.
+
+    Adjacent pieces of a model code are also joined, so "WH-1000XM5" and
+    "WH1000XM5" share "wh1000xm5" and "V15 G2" gives "v15g2".
+
+    Returns:
+        tuple: (brand, set of feature tokens, set of model tokens)
+    """
+    words = [w for w in normalize_name(name).split() if w not in STOPWORDS]
+    if not words:
+        return None, set(), set()
+    features = set(words)
+    features.update(a + b for a, b in zip(words, words[1:]) if _model_parts(a, b))
+    models = {t for t in features if LETTERS_AND_DIGITS.match(t) and not SPEC_TOKEN.match(t)}
+    return words[0], features, models
+
+
+class TitleIndex:
+    def __init__(self, titles):
+        """
+        TF-IDF vectors (binary term frequency, smoothed IDF, L2 normalized) of titles.
+
+        Args:
+            titles (list): Token sets from title_tokens
+        """
+        document_frequency = Counter(token for tokens in titles for token in tokens)
+        n = len(titles)
+        idf = {token: math.log((n + 1) / (df + 1)) + 1 for token, df in document_frequency.items()}
+        self.vectors = []
+        for tokens in titles:
+            norm = math.sqrt(sum(idf[t] ** 2 for t in tokens)) or 1.0
+            self.vectors.append({t: idf[t] / norm for t in tokens})
+
+    def similarity(self, i, j):
+        a, b = self.vectors[i], self.vectors[j]
+        if len(a) > len(b):
+            a, b = b, a
+        return sum(weight * b[token] for token, weight in a.items() if token in b)
+
+
+def candidate_pairs(listings, max_block_pairs=2500):
+    """
+    Pairs of listings from different websites that share a blocking key.
+
+    Blocking keys are (category, brand, model token); listings without a model
+    token share a (category, brand, None) block. Blocks whose pairs exceed
+    max_block_pairs are skipped, since such a key is too common to tell
+    products apart.
+
+    Args:
+        listings (list): Dicts with 'website', 'category', 'brand' and 'models'
+        max_block_pairs (int): Largest number of cross-site pairs compared for one key
+
+    Returns:
+        set: (i, j) index pairs with i < j
+    """
+    blocks = defaultdict(lambda: defaultdict(list))
+    for i, listing in enumerate(listings):
+        if listing['brand'] is None:
+            continue
+        for model in listing['models'] or [None]:
+            blocks[(listing['category'], listing['brand'], model)][listing['website']].append(i)
+
+    pairs = set()
+    skipped = 0
+    for by_site in blocks.values():
+        for site_a, site_b in combinations(sorted(by_site), 2):
+            left, right = by_site[site_a], by_site[site_b]
+            if len(left) * len(right) > max_block_pairs:
+                skipped += 1
+                continue
+            pairs.update((min(i, j), max(i, j)) for i in left for j in right)
+    if skipped:
+        logging.info(f"Skipped {skipped} oversized matching blocks")
+    return pairs
+
+
+def match_products(df, threshold=0.4, max_block_pairs=2500):
+    """
+    Match the same products across websites.
+
+    Args:
+        df (pandas.DataFrame): One row per product with product_key, name, website,
+            category and price_cleaned
+        threshold (float): Minimum TF-IDF cosine similarity for a match
+        max_block_pairs (int): See candidate_pairs
+
+    Returns:
+        list: (i, j, similarity) for matched row positions, each row matched at most once
+    """
+    listings = []
+    for website, category, name in zip(df['website'], df['category'], df['name']):
+        brand, features, models = title_tokens(name)
+        listings.append({'website': website, 'category': category, 'brand': brand,
+                         'features': features, 'models': models})
+
+    index = TitleIndex([listing['features'] for listing in listings])
+    scored = []
+    for i, j in candidate_pairs(listings, max_block_pairs):
+        score = index.similarity(i, j)
+        if score >= threshold:
+            scored.append((score, i, j))
+
+    # One-to-one: best pairs first, and a listing matches at most one listing per other website
+    scored.sort(key=lambda pair: (-pair[0], pair[1], pair[2]))
+    taken = set()
+    matches = []
+    for score, i, j in scored:
+        if (i, listings[j]['website']) in taken or (j, listings[i]['website']) in taken:
+            continue
+        taken.add((i, listings[j]['website']))
+        taken.add((j, listings[i]['website']))
+        matches.append((i, j, score))
+    return matches
+
+
+def price_spread_report(df, threshold=0.4, max_block_pairs=2500, first_token=False):
+    """
+    Per-product cross-site price spread.
+
+    Uses the latest row of each product_key, matches products across websites
+    and reports both prices and how far apart they are. Processing fills
+    missing prices in price_cleaned with the median, so when the scraped
+    price column is there it is parsed again and products without a price
+    are left out instead of being compared at a made-up price.
+
+    Args:
+        df (pandas.DataFrame): Processed product data (product_key, name, website,
+            category, price_cleaned and, preferably, price)
+        first_token (bool): Price parsing mode, see cleaning.parse_price
+
+    Returns:
+        pandas.DataFrame: One row per matched pair, largest relative spread first
+    """
+    columns = ['product_key_a', 'website_a', 'name_a', 'price_a',
+               'product_key_b', 'website_b', 'name_b', 'price_b',
+               'category', 'similarity', 'price_spread', 'spread_pct', 'cheaper_website']
+    if 'price' in df:
+        df = df.assign(price_cleaned=parse_prices(df['price'], first_token=first_token))
+    latest = df.dropna(subset=['name', 'price_cleaned'])
+    latest = latest.drop_duplicates(subset=['product_key'], keep='last').reset_index(drop=True)
+    if latest['website'].nunique() < 2:
+        return pd.DataFrame(columns=columns)
+
+    matches = match_products(latest, threshold, max_block_pairs)
+    if not matches:
+        return pd.DataFrame(columns=columns)
+    first, second, scores = (np.array(values) for values in zip(*matches))
+    # Order each pair by website name so 'a' is always the same site
+    swap = latest['website'].to_numpy(dtype=object)[first] > latest['website'].to_numpy(dtype=object)[second]
+    left, right = np.where(swap, second, first), np.where(swap, first, second)
+
+    a, b = latest.iloc[left].reset_index(drop=True), latest.iloc[right].reset_index(drop=True)
+    spread = b['price_cleaned'] - a['price_cleaned']
+    low = np.minimum(a['price_cleaned'], b['price_cleaned'])
+    report = pd.DataFrame({
+        'product_key_a': a['product_key'], 'website_a': a['website'], 'name_a': a['name'], 'price_a': a['price_cleaned'],
+        'product_key_b': b['product_key'], 'website_b': b['website'], 'name_b': b['name'], 'price_b': b['price_cleaned'],
+        'category': a['category'],
+        'similarity': np.round(scores, 4),
+        'price_spread': spread,
+        'spread_pct': (spread.abs() / low.where(low != 0) * 100).round(2),
+        'cheaper_website': np.where(spread > 0, a['website'], np.where(spread < 0, b['website'], 'same')),
+    }, columns=columns)
+    return report.sort_values('spread_pct', ascending=False, na_position='last').reset_index(drop=True)
@@ -0,0 +1,222 @@
+"""
+Per-stage profiling of a tracker run (tracker_cli --profile).
+
+StageProfiler is handed to the tracker as self.profiler; every method
+instrumented with metrics.timed_stage (driver startup, each website and
+category scrape, saving, cleaning, aggregation) and every chart rendered
+then runs inside profiler.stage(name), which
+
+- profiles the stage with cProfile (deterministic: every Python and C call
+  with its call count and own/cumulative time), merged per stage name, and
+- samples its thread's Python stack every `interval` seconds from a
+  background thread (wall clock, so time spent blocked on a WebDriver
+  round trip or an HTTP response shows up as well).
+
+close() writes one <stage>.prof per stage (pstats format, e.g. for snakeviz
+or python -m pstats), the samples of all stages in the collapsed stack format
+of flamegraph.pl / speedscope / inferno (stacks.collapsed, one
+"stage;outer;...;inner count" line per distinct stack) and summary.txt with
+the hottest functions of every stage.
+
+A stage entered inside another one (scrape_amazon inside a scrape job, a
+chart inside analyze_product_data) is profiled on its own: the outer
+profile is paused meanwhile, and in the flame graph the inner stage shows
+up as a [name] frame. Only the thread that runs a stage is profiled, work
+it hands to other threads is not. Python 3.12+ allows a single cProfile
+at a time per process, so there stages running concurrently in other
+threads are only sampled.
+"""
+import cProfile
+import io
+import logging
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+from collections import Counter
+
+
+def frame_name(frame):
+    """Flame graph name of a stack frame: function (file:line)."""
+    code = frame.f_code
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})".replace(";", ":")
+
+
+def file_name(stage):
+    """File name (without extension) of the profile of a stage."""
+    return re.sub(r"[^\w.-]+", "_", stage).strip("_") or "stage"
+
+
+class _Stage:
+    """Context manager profiling one call of a stage, see StageProfiler.stage."""
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.profile = None
+
+    def __enter__(self):
+        self.frame = sys._getframe(1)
+        self.start = time.perf_counter()
+        self.profiler._enter(self)
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler._exit(self, time.perf_counter() - self.start)
+
+
+class StageProfiler:
+    def __init__(self, output_dir, interval=0.01, top=25):
+        """
+        Deterministic and sampling profiles of the stages of a tracker run.
+
+        Args:
+            output_dir (str): Directory the profiles are written to (created by close)
+            interval (float): Seconds between two stack samples of a running stage
+            top (int): Functions per stage listed in summary.txt
+        """
+        self.output_dir = output_dir
+        self.interval = interval
+        self.top = top
+        self.stats = {}             # stage -> merged pstats.Stats
+        self.durations = {}         # stage -> [calls, wall seconds]
+        self.samples = Counter()    # collapsed stack -> samples
+        self._threads = {}          # thread id -> stages entered, outermost first
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sampler = None
+
+    def stage(self, name):
+        """Context manager profiling the code it wraps as stage name."""
+        return _Stage(self, name)
+
+    def _enter(self, stage):
+        thread_id = threading.get_ident()
+        with self._lock:
+            stack = self._threads.setdefault(thread_id, [])
+            outer = stack[-1] if stack else None
+            stack.append(stage)
+            if self._sampler is None and not self._stop.is_set():
+                self._sampler = threading.Thread(target=self._sample, name="stage-profiler", daemon=True)
+                self._sampler.start()
+        if outer is not None and outer.profile is not None:
+            outer.profile.disable()
+        stage.profile = cProfile.Profile()
+        try:
+            stage.profile.enable()
+        except ValueError as e:
+            # Another profile is active in this process (Python 3.12+, or an external profiler)
+            logging.debug(f"Only sampling {stage.name}: {e}")
+            stage.profile = None
+
+    def _exit(self, stage, seconds):
+        if stage.profile is not None:
+            stage.profile.disable()
+        thread_id = threading.get_ident()
+        with self._lock:
+            stack = self._threads.get(thread_id, [])
+            if stack and stack[-1] is stage:
+                stack.pop()
+            if not stack:
+                self._threads.pop(thread_id, None)
+            outer = stack[-1] if stack else None
+            duration = self.durations.setdefault(stage.name, [0, 0.0])
+            duration[0] += 1
+            duration[1] += seconds
+            if stage.profile is not None:
+                if stage.name in self.stats:
+                    self.stats[stage.name].add(stage.profile)
+                else:
+                    self.stats[stage.name] = pstats.Stats(stage.profile)
+        if outer is not None and outer.profile is not None:
+            try:
+                outer.profile.enable()
+            except ValueError:
+                outer.profile = None
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            with self._lock:
+                running = [(thread_id, list(stack)) for thread_id, stack in self._threads.items() if stack]
+            stacks = []
+            for thread_id, stages in running:
+                stack = self._collapse(frames.get(thread_id), stages)
+                if stack:
+                    stacks.append(stack)
+            with self._lock:
+                self.samples.update(stacks)
+
+    @staticmethod
+    def _collapse(frame, stages):
+        """Collapsed stack of a thread below the frame that entered its outermost stage."""
+        nested = {id(stage.frame): stage.name for stage in stages[1:]}
+        names = []
+        while frame is not None and frame is not stages[0].frame:
+            if id(frame) in nested:
+                names.append(f"[{nested[id(frame)]}]")
+            names.append(frame_name(frame))
+            frame = frame.f_back
+        if frame is None:
+            # The thread left the stage since the stage list was copied
+            return None
+        names.append(stages[0].name)
+        return ";".join(reversed(names))
+
+    def close(self):
+        """
+        Stop sampling and write the profiles of the stages run so far.
+
+        Returns:
+            dict: Paths of the written files ("profiles": {stage: path}, "flamegraph",
+                "summary"), or None when no stage ran
+        """
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+            self._sampler = None
+        with self._lock:
+            stats = dict(self.stats)
+            durations = {stage: list(duration) for stage, duration in self.durations.items()}
+            samples = Counter(self.samples)
+        if not durations:
+            logging.info("No stage ran, no profile written")
+            return None
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        paths = {"profiles": {}}
+        for stage, stage_stats in stats.items():
+            path = os.path.join(self.output_dir, f"{file_name(stage)}.prof")
+            stage_stats.dump_stats(path)
+            paths["profiles"][stage] = path
+
+        paths["flamegraph"] = os.path.join(self.output_dir, "stacks.collapsed")
+        with open(paths["flamegraph"], "w", encoding="utf-8") as f:
+            for stack, count in sorted(samples.items()):
+                f.write(f"{stack} {count}\n")
+
+        # Samples of the innermost stage of every stack
+        stage_samples = Counter()
+        for stack, count in samples.items():
+            names = stack.split(";")
+            nested = [name[1:-1] for name in names if name.startswith("[") and name.endswith("]")]
+            stage_samples[nested[-1] if nested else names[0]] += count
+        paths["summary"] = os.path.join(self.output_dir, "summary.txt")
+        with open(paths["summary"], "w", encoding="utf-8") as f:
+            f.write(f"{'stage':<50} {'calls':>6} {'wall (s)':>9} {'samples':>8}\n")
+            for stage, (calls, seconds) in sorted(durations.items(), key=lambda item: -item[1][1]):
+                f.write(f"{stage:<50} {calls:>6} {seconds:>9.3f} {stage_samples[stage]:>8}\n")
+            for stage in sorted(stats, key=lambda stage: -durations[stage][1]):
+                out = io.StringIO()
+                stats[stage].stream = out
+                stats[stage].sort_stats("tottime").print_stats(self.top)
+                f.write(f"\n=== {stage}: {durations[stage][0]} call(s), {durations[stage][1]:.3f}s ===\n")
+                f.write(out.getvalue())
+
+        logging.info(f"Profiled {len(durations)} stage(s) into {self.output_dir}: summary.txt, "
+                     f"stacks.collapsed ({sum(samples.values())} samples, for flamegraph.pl or speedscope) "
+                     f"and a .prof per stage")
+        return paths
@@ -0,0 +1,81 @@
+import threading
+import time
+from urllib.parse import urlparse
+
+
+class TokenBucket:
+    def __init__(self, rate, burst=1):
+        """
+        Thread-safe token bucket.
+
+        Args:
+            rate (float): Tokens added per second (sustained requests per second)
+            burst (int): Maximum number of tokens the bucket can hold
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _reserve(self):
+        """Take one token, returning how long the caller must wait for it."""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            # Tokens may go negative: each waiting caller reserves its slot in order
+            self.tokens -= 1
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def acquire(self):
+        """
+        Block until a token is available.
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class HostRateLimiter:
+    def __init__(self, rate=0.2, burst=1, host_limits=None):
+        """
+        One token bucket per host, so requests to different hosts never wait on each other.
+
+        Args:
+            rate (float): Default requests per second allowed for each host
+            burst (int): Default bucket size for each host
+            host_limits (dict): Optional {host: (rate, burst)} overrides
+        """
+        self.rate = rate
+        self.burst = burst
+        self.host_limits = host_limits or {}
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+    def bucket_for(self, host):
+        with self.lock:
+            bucket = self.buckets.get(host)
+            if bucket is None:
+                rate, burst = self.host_limits.get(host, (self.rate, self.burst))
+                bucket = self.buckets[host] = TokenBucket(rate, burst)
+            return bucket
+
+    def acquire(self, url_or_host):
+        """
+        Wait for permission to send one request to a host.
+
+        Args:
+            url_or_host (str): Full URL or bare host name
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        host = urlparse(url_or_host).netloc or url_or_host
+        return self.bucket_for(host.lower()).acquire()
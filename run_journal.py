@@ -0,0 +1,104 @@
+"""
+Persistent journal of the scrape jobs a run has completed, so an interrupted
+run can be resumed instead of started over.
+
+The journal is a JSON-lines file holding the current run only:
+
+    {"event": "start", "run_id": "20241209_152336", "started_at": 1733757816.0}
+    {"event": "snapshot", "name": "logs/products_20241209_152336.csv"}
+    {"event": "job", "website": "Amazon", "category": "laptops", "page": 1, "products": 20}
+    {"event": "complete"}
+
+Every attempt at the run (the first one and each resume) adds the snapshot it
+writes to, so a resumed run can leave out the products any of them saved.
+
+Every line is flushed and fsynced when it is appended, and a torn last line
+(the process died mid-write) is ignored when the journal is read back.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+
+
+class RunJournal:
+    def __init__(self, path):
+        """
+        Args:
+            path (str): Location of the journal file
+        """
+        self.path = path
+        self.run_id = None
+        self.completed = set()
+        self.snapshots = []  # Snapshots written by the earlier attempts at the run
+        self._lock = threading.Lock()
+
+    def _read(self):
+        entries = []
+        if not os.path.exists(self.path):
+            return entries
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entries.append(json.loads(line))
+                    except ValueError:
+                        logging.warning(f"Ignoring unreadable line in run journal {self.path}")
+        except OSError as e:
+            logging.error(f"Could not read run journal {self.path}: {e}")
+        return entries
+
+    def open_run(self, window_hours):
+        """
+        Resume the journal's run if it was interrupted less than window_hours after
+        it started, otherwise start a new run. The snapshots the run's earlier
+        attempts wrote to are kept in self.snapshots.
+
+        Returns:
+            set: (website, category, page) jobs already completed by the run
+        """
+        entries = self._read()
+        start = entries[0] if entries and entries[0].get('event') == 'start' else None
+        finished = any(entry.get('event') == 'complete' for entry in entries)
+        if start and not finished and time.time() - start.get('started_at', 0) < window_hours * 3600:
+            self.run_id = start['run_id']
+            self.completed = {(entry['website'], entry['category'], entry.get('page', 1))
+                              for entry in entries if entry.get('event') == 'job'}
+            self.snapshots = [entry['name'] for entry in entries if entry.get('event') == 'snapshot']
+            return set(self.completed)
+
+        self.run_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.completed = set()
+        self.snapshots = []
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({'event': 'start', 'run_id': self.run_id, 'started_at': time.time()}) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        return set()
+
+    def _append(self, entry):
+        with self._lock:
+            try:
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(entry) + '\n')
+                    f.flush()
+                    os.fsync(f.fileno())
+            except OSError as e:
+                logging.error(f"Error writing run journal {self.path}: {e}")
+
+    def record_snapshot(self, name):
+        """Note the snapshot this attempt at the run writes to; call before writing to it."""
+        self._append({'event': 'snapshot', 'name': name})
+
+    def record(self, website, category, page=1, products=0):
+        """Mark a job completed; call only once its products are on disk."""
+        self._append({'event': 'job', 'website': website, 'category': category, 'page': page, 'products': products})
+        self.completed.add((website, category, page))
+
+    def complete(self):
+        """Mark the run finished, so the next run starts from scratch."""
+        self._append({'event': 'complete'})
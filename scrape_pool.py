@@ -0,0 +1,186 @@
+import logging
+import queue
+import threading
+import time
+
+
+class ScrapeJob:
+    """A single (website, category) unit of scraping work."""
+
+    def __init__(self, index, website, category):
+        self.index = index
+        self.website = website
+        self.category = category
+        self.page = 1  # Page of the products without a page number; a job covers all its result pages
+        self.pages = 0  # Result pages it loaded
+        self.products = []
+        self.product_count = 0
+        self.duration = None
+        self.error = None
+        self.source = None  # "http" or "browser"
+
+    def __repr__(self):
+        return f"ScrapeJob({self.website!r}, {self.category!r})"
+
+
+class ScrapePool:
+    def __init__(self, init_driver, scrape_fn, pool_size=2, fetch_fn=None, on_job_done=None, browsers=None,
+                 stop_event=None):
+        """
+        Bounded pool of browser workers that scrape (website, category) jobs in parallel.
+
+        Each worker owns its own WebDriver (WebDriver sessions are not thread safe)
+        and pulls jobs from a shared queue until the queue is empty. Pacing between
+        requests to the same site is left to the scrapers' per-host rate limiter.
+
+        When fetch_fn is given it is tried first for every job; the worker only
+        starts its browser the first time fetch_fn comes back without products.
+
+        When on_job_done is given each job's products are handed to it from the
+        worker as soon as the job finishes (e.g. to stream them to disk) and are
+        not kept on the job, so memory does not grow with the size of the run.
+
+        When browsers (a browser_sessions.BrowserManager) is given, workers borrow
+        warm sessions from it for every browser job and hand them back afterwards
+        instead of starting and quitting their own browser.
+
+        When stop_event is set, workers finish the job they are on and take no
+        new ones; the jobs left are returned without a duration.
+
+        Args:
+            init_driver (callable): Returns a new WebDriver instance, or None on failure
+            scrape_fn (callable): scrape_fn(driver, website, category) -> list of product dicts
+            pool_size (int): Maximum number of browsers running at the same time
+            fetch_fn (callable): Optional fetch_fn(website, category) -> list of product dicts
+            on_job_done (callable): Optional on_job_done(job) called with every finished job
+            browsers (BrowserManager): Optional shared pool of warm browser sessions
+            stop_event (threading.Event): Optional event that stops the workers taking new jobs
+        """
+        self.init_driver = init_driver
+        self.scrape_fn = scrape_fn
+        self.pool_size = max(1, int(pool_size))
+        self.fetch_fn = fetch_fn
+        self.on_job_done = on_job_done
+        self.browsers = browsers
+        self.stop_event = stop_event
+
+    def _run_job(self, job, get_driver):
+        if self.fetch_fn:
+            try:
+                job.products = self.fetch_fn(job.website, job.category) or []
+            except Exception as e:
+                logging.warning(f"HTTP fetch failed for {job.website} - {job.category}: {e}")
+            if job.products:
+                job.source = "http"
+                return
+            logging.info(f"No products over HTTP for {job.website}/{job.category}, falling back to browser")
+
+        driver = get_driver()
+        if not driver:
+            raise RuntimeError("web driver is not available")
+        job.products = self.scrape_fn(driver, job.website, job.category) or []
+        job.source = "browser"
+
+    def _worker(self, worker_id, jobs):
+        state = {"driver": None, "session": None, "failed": False}
+
+        def get_driver():
+            # Start the browser on first use only, and don't retry after a failed start
+            if state["driver"] is None and not state["failed"]:
+                if self.browsers:
+                    state["session"] = self.browsers.acquire()
+                    state["driver"] = state["session"].driver if state["session"] else None
+                else:
+                    state["driver"] = self.init_driver()
+                if not state["driver"]:
+                    state["failed"] = True
+                    logging.error(f"Worker {worker_id}: failed to initialize web driver")
+            return state["driver"]
+
+        try:
+            while not (self.stop_event and self.stop_event.is_set()):
+                try:
+                    job = jobs.get_nowait()
+                except queue.Empty:
+                    break
+
+                logging.info(f"Worker {worker_id}: scraping {job.website} for {job.category}")
+                start = time.perf_counter()
+                try:
+                    self._run_job(job, get_driver)
+                except Exception as e:
+                    job.error = e
+                    logging.error(f"Error scraping {job.website} - {job.category}: {e}")
+                job.duration = time.perf_counter() - start
+                job.product_count = len(job.products)
+                # Products from result pages after the first carry their page number
+                job.pages = len({product.get("page", job.page) for product in job.products}) or 1
+                if state["session"]:
+                    # Back to the shared pool, which recycles worn-out sessions
+                    self.browsers.release(state["session"], pages=job.pages)
+                    state["session"] = state["driver"] = None
+                logging.info(
+                    f"Worker {worker_id}: {job.website}/{job.category} finished in "
+                    f"{job.duration:.2f}s with {job.product_count} products from {job.pages} pages"
+                )
+                if self.on_job_done:
+                    try:
+                        self.on_job_done(job)
+                    except Exception as e:
+                        logging.error(f"Error saving {job.website} - {job.category} products: {e}")
+                    job.products = []
+        finally:
+            if state["session"]:
+                self.browsers.release(state["session"])
+            elif state["driver"]:
+                state["driver"].quit()
+
+    def run(self, targets):
+        """
+        Scrape every (website, category) pair and wait for all workers to finish.
+
+        Args:
+            targets (iterable): (website, category) tuples
+
+        Returns:
+            list: Completed ScrapeJob objects in submission order
+        """
+        scrape_jobs = [ScrapeJob(i, website, category) for i, (website, category) in enumerate(targets)]
+        jobs = queue.Queue()
+        for job in scrape_jobs:
+            jobs.put(job)
+
+        workers = [
+            threading.Thread(target=self._worker, args=(i, jobs), name=f"scrape-worker-{i}", daemon=True)
+            for i in range(min(self.pool_size, len(scrape_jobs)))
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        not_run = [job for job in scrape_jobs if job.duration is None]
+        if not_run and self.stop_event and self.stop_event.is_set():
+            logging.info(f"Stopped with {len(not_run)} jobs not run")
+        else:
+            for job in not_run:
+                logging.warning(f"Job {job} was not run")
+        return scrape_jobs
+
+
+def log_job_latency(jobs):
+    """Log a per-job latency report for a finished pool run."""
+    finished = [job for job in jobs if job.duration is not None]
+    if not finished:
+        return
+    for job in finished:
+        status = "failed" if job.error else job.source
+        logging.info(
+            f"{job.website}/{job.category}: {job.duration:.2f}s, {job.product_count} products "
+            f"from {job.pages} pages ({status})"
+        )
+    total = sum(job.duration for job in finished)
+    logging.info(
+        f"Scraped {len(finished)} jobs, mean latency {total / len(finished):.2f}s, "
+        f"slowest {max(job.duration for job in finished):.2f}s"
+    )
@@ -0,0 +1,108 @@
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime
+
+
+def file_fingerprint(path):
+    """
+    Identify a raw snapshot by size, modification time and content hash.
+
+    Returns:
+        dict: {'size', 'mtime', 'sha256'}
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    stat = os.stat(path)
+    return {'size': stat.st_size, 'mtime': stat.st_mtime, 'sha256': digest.hexdigest()}
+
+
+def processed_path(directory, prefix='processed_data_'):
+    """
+    Path for a new processed file, never one written by an earlier run.
+
+    Runs finishing within the same second get a numbered suffix instead of
+    overwriting each other's output.
+    """
+    stem = f'{prefix}{datetime.now().strftime("%Y%m%d_%H%M%S")}'
+    path = os.path.join(directory, f'{stem}.csv')
+    counter = 1
+    while os.path.exists(path):
+        path = os.path.join(directory, f'{stem}_{counter}.csv')
+        counter += 1
+    return path
+
+
+class SnapshotManifest:
+    def __init__(self, path):
+        """
+        Checkpoint of raw snapshot files that have already been cleaned.
+
+        The manifest is a JSON file mapping each ingested file name to its
+        fingerprint and the processed file it went into. It is rewritten
+        atomically, and only after the processed data has been saved, so an
+        interrupted run reprocesses its snapshots instead of losing them.
+
+        Args:
+            path (str): Location of the manifest JSON file
+        """
+        self.path = path
+        self.entries = {}
+        if os.path.exists(path):
+            try:
+                with open(path, encoding='utf-8') as f:
+                    self.entries = json.load(f).get('files', {})
+            except (OSError, ValueError) as e:
+                logging.error(f"Could not read snapshot manifest {path}, starting a new one: {e}")
+
+    def is_ingested(self, path, key=None):
+        """Check whether a file was ingested with exactly its current content."""
+        entry = self.entries.get(key or os.path.basename(path))
+        if entry is None:
+            return False
+        stat = os.stat(path)
+        if stat.st_size != entry['size']:
+            return False
+        if stat.st_mtime == entry['mtime']:
+            return True  # Unchanged since ingestion, no need to hash it again
+        return file_fingerprint(path)['sha256'] == entry['sha256']
+
+    def pending(self, directory, prefix='products_', suffix='.csv'):
+        """
+        List raw snapshots in directory that have not been ingested yet.
+
+        Returns:
+            list: File names in chronological (name) order
+        """
+        names = sorted(f for f in os.listdir(directory) if f.startswith(prefix) and f.endswith(suffix))
+        return [name for name in names if not self.is_ingested(os.path.join(directory, name))]
+
+    def pending_paths(self, paths, root):
+        """
+        Filter data files (e.g. Parquet partitions) down to those not ingested yet.
+
+        Entries are keyed by the path relative to root, since partition
+        directories reuse the same file names.
+
+        Returns:
+            list: Paths not ingested yet, in the given order
+        """
+        return [path for path in paths if not self.is_ingested(path, os.path.relpath(path, root))]
+
+    def record(self, path, processed_file, key=None):
+        """Mark a raw snapshot (or data file, keyed by key) as ingested into processed_file."""
+        entry = file_fingerprint(path)
+        entry.update({
+            'processed_file': os.path.basename(processed_file),
+            'ingested_at': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        })
+        self.entries[key or os.path.basename(path)] = entry
+
+    def save(self):
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'files': self.entries}, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
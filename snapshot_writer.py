@@ -0,0 +1,249 @@
+"""
+Streaming writers for raw snapshots.
+
+Scraped products are appended to the run's snapshot in batches as scrape jobs
+finish, instead of being held in memory until the whole run is over. Batches
+go to pending files (PENDING_SUFFIX) that processing never reads; close()
+publishes them under their final names, so readers only ever see finished
+snapshots. When a run dies before close(), the batches it flushed are still
+on disk and are published by recover_csv_snapshots (or
+ParquetStore.recover_pending) at the start of the next run.
+"""
+import csv
+import glob
+import logging
+import os
+import threading
+from datetime import datetime
+
+import pandas as pd
+
+from columnar_store import PENDING_SUFFIX, RAW_COLUMNS
+
+
+def snapshot_path(directory, prefix='products_'):
+    """Timestamped path for a new CSV snapshot, not taken by a finished or pending snapshot."""
+    stem = f'{prefix}{datetime.now().strftime("%Y%m%d_%H%M%S")}'
+    path = os.path.join(directory, f'{stem}.csv')
+    counter = 1
+    while os.path.exists(path) or os.path.exists(path + PENDING_SUFFIX):
+        path = os.path.join(directory, f'{stem}_{counter}.csv')
+        counter += 1
+    return path
+
+
+class SnapshotWriter:
+    def __init__(self, name, batch_size=200, on_batch=None):
+        """
+        Thread-safe batching writer; subclasses store the batches.
+
+        Args:
+            name (str): Snapshot file or name, as returned by close()
+            batch_size (int): Products buffered before a batch is written out
+            on_batch (callable): on_batch(products) runs on every batch just before
+                it is written, e.g. to assign product keys; it may remove products
+                from the list (see unseen)
+        """
+        self.name = name
+        self.batch_size = max(1, int(batch_size))
+        self.on_batch = on_batch
+        self.seen_keys = set()
+        self.rows = 0
+        self.batches = 0
+        self.closed = False
+        self._buffer = []
+        self._done = []
+        self._lock = threading.Lock()
+
+    def write(self, products, done=None):
+        """
+        Add products, writing out a batch whenever batch_size are buffered.
+
+        Args:
+            products (list): Product dicts
+            done (callable): Optional done() called once these products are on disk
+        """
+        with self._lock:
+            if self.closed:
+                logging.warning(f"Dropping {len(products)} products written after {self.name} was closed")
+                return
+            self._buffer.extend(products)
+            if done:
+                self._done.append(done)
+            if len(self._buffer) >= self.batch_size:
+                self._flush()
+
+    def exclude(self, keys):
+        """Never write products with these product keys, e.g. ones an interrupted run already saved."""
+        with self._lock:
+            self.seen_keys.update(keys)
+
+    def unseen(self, products):
+        """
+        Products whose product_key was not written to (or excluded from) this snapshot yet.
+
+        Call from on_batch once the products have their keys; the keys of the
+        returned products count as written.
+
+        Returns:
+            list: The new products, in order (products without a key are kept)
+        """
+        new = []
+        for product in products:
+            key = product.get('product_key')
+            if isinstance(key, str):
+                if key in self.seen_keys:
+                    continue
+                self.seen_keys.add(key)
+            new.append(product)
+        return new
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        # Callbacks go with their batch: if writing it fails they are never called
+        batch, self._buffer = self._buffer, []
+        callbacks, self._done = self._done, []
+        if batch and self.on_batch:
+            self.on_batch(batch)
+        if batch:
+            self._write_batch(batch)
+            self.rows += len(batch)
+            self.batches += 1
+        for done in callbacks:
+            done()
+
+    def close(self):
+        """
+        Write the remaining products and publish the snapshot.
+
+        Returns:
+            str or None: The snapshot name, or None when no products were written
+        """
+        with self._lock:
+            if self.closed:
+                return self.name if self.rows else None
+            try:
+                self._flush()
+            finally:
+                self.closed = True
+                self._publish()
+        if not self.rows:
+            logging.warning("No products to save")
+            return None
+        logging.info(f"Saved {self.rows} products to {self.name} in {self.batches} batch(es)")
+        return self.name
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # Publish what was scraped so far even when the run fails part way
+        if exc_type is not None:
+            logging.error(f"Run stopped by {exc_type.__name__}, saving the products scraped so far")
+        self.close()
+        return False
+
+    def _write_batch(self, products):
+        raise NotImplementedError
+
+    def _publish(self):
+        raise NotImplementedError
+
+
+class CsvSnapshotWriter(SnapshotWriter):
+    def __init__(self, path, fieldnames=RAW_COLUMNS, batch_size=200, on_batch=None):
+        """
+        Stream a snapshot to <path>.pending and rename it to path on close.
+
+        Every batch is flushed and fsynced, so a crash loses at most the
+        products still buffered.
+
+        Args:
+            path (str): Final CSV path, see snapshot_path
+            fieldnames (list): CSV columns; other product keys are ignored
+        """
+        super().__init__(path, batch_size, on_batch)
+        self.path = path
+        self.fieldnames = fieldnames
+        self._file = None
+        self._writer = None
+
+    def _write_batch(self, products):
+        if self._file is None:
+            self._file = open(self.path + PENDING_SUFFIX, 'w', newline='', encoding='utf-8')
+            self._writer = csv.DictWriter(self._file, fieldnames=self.fieldnames, extrasaction='ignore')
+            self._writer.writeheader()
+        self._writer.writerows(products)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def _publish(self):
+        if self._file is None:
+            return
+        self._file.close()
+        os.replace(self.path + PENDING_SUFFIX, self.path)
+
+
+class ParquetSnapshotWriter(SnapshotWriter):
+    def __init__(self, store, snapshot, batch_size=200, on_batch=None):
+        """
+        Stream a snapshot into a ParquetStore as pending files, published on close.
+
+        Args:
+            store (ParquetStore): Raw snapshot store
+            snapshot (str): Snapshot name, see ParquetStore.new_snapshot_id
+        """
+        super().__init__(snapshot, batch_size, on_batch)
+        self.store = store
+        self._pending = []
+
+    def _write_batch(self, products):
+        df = pd.DataFrame(products, columns=RAW_COLUMNS)
+        self._pending.extend(self.store.write(df, self.name, batch=self.batches, pending=True))
+
+    def _publish(self):
+        self.store.publish(self._pending)
+        self._pending = []
+
+
+def _complete_length(f):
+    """Length of the file up to and including its last newline."""
+    position = f.seek(0, os.SEEK_END)
+    while position > 0:
+        step = min(1 << 16, position)
+        position -= step
+        f.seek(position)
+        newline = f.read(step).rfind(b'\n')
+        if newline != -1:
+            return position + newline + 1
+    return 0
+
+
+def recover_csv_snapshots(directory, prefix='products_'):
+    """
+    Publish CSV snapshots left pending by a run that did not finish.
+
+    A trailing partial line (the process died mid-write) is cut off, and
+    snapshots without a single complete row are removed.
+
+    Returns:
+        list: Paths of the recovered snapshots
+    """
+    recovered = []
+    for pending in sorted(glob.glob(os.path.join(directory, f'{prefix}*.csv{PENDING_SUFFIX}'))):
+        path = pending[:-len(PENDING_SUFFIX)]
+        with open(pending, 'rb+') as f:
+            header_length = len(f.readline())
+            length = _complete_length(f)
+            f.truncate(length)
+        if length <= header_length:
+            os.remove(pending)
+            logging.warning(f"Removed pending snapshot {pending} without complete rows")
+            continue
+        os.replace(pending, path)
+        logging.info(f"Recovered partial snapshot {path}")
+        recovered.append(path)
+    return recovered
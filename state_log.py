@@ -0,0 +1,100 @@
+"""
+Incrementally persisted JSON state.
+
+The product index and the rolling price state are dicts that every saved
+batch changes a few entries of. Rewriting the whole file after every batch
+costs O(entries) per batch, O(entries x batches) over a run. StateLog keeps
+the state as a compacted JSON file plus an append-only JSON-lines log of the
+entries each batch changed:
+
+- append() writes only the changed entries (O(batch));
+- load() reads the JSON file and replays the log over it; a line cut short
+  by a crash is skipped, so at most the last batch is lost;
+- once the log has grown past the size of the JSON file, the full state is
+  written to a temporary file, moved over the JSON file (os.replace) and the
+  log is removed, so compaction is amortized O(1) per changed entry.
+
+Replaying an entry twice gives the same state, so a crash between the
+os.replace and the removal of the log does no harm.
+"""
+import json
+import logging
+import os
+
+
+def _apply(state, changes, depth):
+    if depth <= 1:
+        state.update(changes)
+        return
+    for section, values in changes.items():
+        _apply(state.setdefault(section, {}), values, depth - 1)
+
+
+class StateLog:
+    def __init__(self, path, depth=1, min_compact_bytes=1 << 20):
+        """
+        Compacted JSON file plus append-only change log.
+
+        Args:
+            path (str): JSON file of the compacted state; the log is path + '.log'
+            depth (int): Nesting of the entries: 1 for {key: entry}, 2 for
+                {section: {key: entry}}
+            min_compact_bytes (int): Log size below which it is never compacted
+        """
+        self.path = path
+        self.log_path = path + '.log'
+        self.depth = depth
+        self.min_compact_bytes = min_compact_bytes
+
+    def load(self):
+        """
+        Read the state.
+
+        Returns:
+            dict: The compacted state with the logged changes applied
+        """
+        state = {}
+        if os.path.exists(self.path):
+            with open(self.path, encoding='utf-8') as f:
+                state = json.load(f)
+        if os.path.exists(self.log_path):
+            with open(self.log_path, encoding='utf-8') as f:
+                for number, line in enumerate(f, 1):
+                    if not line.strip():
+                        continue
+                    try:
+                        _apply(state, json.loads(line), self.depth)
+                    except ValueError:
+                        logging.warning(f"Skipping unreadable line {number} of {self.log_path}")
+        return state
+
+    def append(self, changes, state):
+        """
+        Persist the changed entries, compacting the log when it outgrew the state file.
+
+        Args:
+            changes (dict): Changed entries, nested like the state
+            state (callable): state() -> the full state, only called to compact
+        """
+        if not changes:
+            return
+        with open(self.log_path, 'a+b') as f:
+            # Start on a new line after a line a crash cut short
+            if f.tell():
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    f.write(b'\n')
+            f.write(json.dumps(changes).encode('utf-8') + b'\n')
+        log_size = os.path.getsize(self.log_path)
+        state_size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        if log_size > max(state_size, self.min_compact_bytes):
+            self.compact(state())
+
+    def compact(self, state):
+        """Write the full state atomically and drop the log."""
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.path)
+        if os.path.exists(self.log_path):
+            os.remove(self.log_path)
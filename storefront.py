@@ -0,0 +1,377 @@
+"""
+Offline fixtures for the scrapers: a recorder for live page HTML and a local
+mock storefront that replays recorded pages or generates synthetic results.
+
+Run a storefront on its own (e.g. for load tests):
+    python storefront.py --port 8000 --results 200
+"""
+import argparse
+import html
+import logging
+import os
+import random
+import re
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlparse
+
+from http_fetch import HTML_PARSER, SEARCH_PATHS
+
+# URL prefix each website is served under, e.g. http://127.0.0.1:8000/amazon
+SITE_PREFIXES = {"Amazon": "/amazon", "BestBuy": "/bestbuy"}
+BESTSELLERS_PATH = "/Best-Sellers/zgbs"
+
+AMAZON_HOME = """<html><body>
+<form action="{prefix}{search_path}" method="get">
+  <input type="text" id="twotabsearchtextbox" name="{param}">
+</form>
+</body></html>"""
+
+BESTBUY_HOME = """<html><body>
+<form action="{prefix}{search_path}" method="get">
+  <input type="text" class="search-input" name="{param}">
+</form>
+</body></html>"""
+
+# Result markup carries every class used by the scrapers' selectors and fallbacks
+AMAZON_CARD = """<div data-component-type="s-search-result" data-asin="{sku}">{image}
+  <h2><a href="/dp/{sku}"><span>{name}</span></a></h2>
+  <span class="a-price"><span class="a-price-whole">{whole}</span><span class="a-price-fraction">{fraction}</span></span>
+  <span class="a-icon-alt">{rating} out of 5 stars</span>
+</div>"""
+
+BESTBUY_CARD = """<li class="sku-item" data-sku-id="{sku}">{image}
+  <h4 class="sku-title"><a href="/site/{sku}.p?skuId={sku}">{name}</a></h4>
+  <div class="priceView-hero-price priceView-customer-price"><span>${whole}.{fraction}</span></div>
+  <span class="c-rating v-small">{rating} out of 5 stars</span>
+  <span class="c-review-average">{rating}</span>
+</li>"""
+
+BESTSELLER_ITEM = """<div class="zg-item">
+  <div class="p13n-sc-truncate">{name}</div>
+  <span class="p13n-sc-price">${whole}.{fraction}</span>
+</div>"""
+
+RESULTS_PAGE = """<html>{head}<body>
+{banner}{cards}
+<a class="s-pagination-next" href="{next_url}">Next</a>
+</body></html>"""
+
+# With page_assets=True, synthetic results pages weigh about as much as real ones:
+# an image per card, a web font, an autoplaying promo video and a third-party ad
+# script (served from the storefront's other host name), so lean page loads can
+# be measured locally
+ASSET_TYPES = {
+    "/static/img/": ("image/jpeg", 30 * 1024),
+    "/static/fonts/": ("font/woff2", 120 * 1024),
+    "/static/media/": ("video/mp4", 512 * 1024),
+    "/ads/": ("application/javascript", 80 * 1024),
+}
+RESULTS_HEAD = """<head>
+<style>@font-face {{font-family: "Storefront"; src: url("/static/fonts/storefront.woff2") format("woff2");}}
+body {{font-family: "Storefront", sans-serif;}}</style>
+<script async src="{third_party}/ads/tag.js"></script>
+</head>"""
+PROMO_VIDEO = '<video src="/static/media/promo.mp4" autoplay muted></video>\n'
+CARD_IMAGES = {
+    "Amazon": '\n  <img class="s-image" src="/static/img/{sku}.jpg">',
+    "BestBuy": '\n  <img class="product-image" src="/static/img/{sku}.jpg">',
+}
+
+# With script_results=True, results pages fill their grid client-side: the page
+# fetches its cards in two halves after it loaded, like sites rendering with scripts
+RESULTS_SCRIPT = """<div id="results"></div>
+<script>
+(async function () {
+  const grid = document.getElementById("results");
+  for (const part of [0, 1]) {
+    const response = await fetch(location.href + "&fragment=" + part);
+    grid.insertAdjacentHTML("beforeend", await response.text());
+  }
+})();
+</script>
+"""
+
+BRANDS = ["Lenovo", "HP", "Dell", "Acer", "ASUS", "Apple", "Sony", "Bose", "Samsung", "JBL"]
+FEATURES = ["15.6\" FHD", "16GB RAM", "512GB SSD", "Wireless", "Noise Cancelling", "Bluetooth 5.3", "Wi-Fi 6"]
+
+
+def fixture_slug(text):
+    """Make a file-name friendly slug from a category or page name."""
+    return re.sub(r"[^a-z0-9]+", "-", str(text).lower()).strip("-") or "page"
+
+
+def fixture_path(fixture_dir, website, name, page=1):
+    """Location of a recorded page: <fixture_dir>/<website>/<name>[_p<page>].html"""
+    suffix = "" if page == 1 else f"_p{page}"
+    return os.path.join(fixture_dir, fixture_slug(website), f"{fixture_slug(name)}{suffix}.html")
+
+
+def replay_url(website, name, page):
+    """Path of a results page on the mock storefront, e.g. /amazon/s?k=laptops&page=2"""
+    search_path, param = SEARCH_PATHS[website]
+    return f"{SITE_PREFIXES[website]}{search_path}?{urlencode({param: name, 'page': page})}"
+
+
+def replay_next_links(page_html, website, name, page, selector):
+    """
+    Point the "next page" links of a recorded results page at the mock storefront.
+
+    Live pages link to the next page relative to the live site (or absolutely),
+    which the storefront does not serve; the links are rewritten to the
+    storefront path of recorded page page + 1.
+
+    Returns:
+        str: The page HTML, unchanged when it has no next page link
+    """
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(page_html, HTML_PARSER)
+    links = soup.select(selector)
+    if not links:
+        return page_html
+    for link in links:
+        link["href"] = replay_url(website, name, page + 1)
+    return str(soup)
+
+
+class FixtureRecorder:
+    def __init__(self, fixture_dir, next_links=None):
+        """
+        Save page HTML seen by the scrapers so it can be replayed offline.
+
+        Args:
+            fixture_dir (str): Directory that receives <website>/<name>.html snapshots
+            next_links (dict): Optional {website: CSS selector} of the "next page" links
+                of results pages, rewritten to the mock storefront so replays can paginate
+        """
+        self.fixture_dir = fixture_dir
+        self.next_links = next_links or {}
+
+    def save(self, website, name, page_html, page=1):
+        """
+        Write one page snapshot, replacing any previous recording.
+
+        Returns:
+            str: Path of the written snapshot
+        """
+        if website in self.next_links and website in SITE_PREFIXES:
+            page_html = replay_next_links(page_html, website, name, page, self.next_links[website])
+        path = fixture_path(self.fixture_dir, website, name, page)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(page_html)
+        logging.info(f"Recorded {website} '{name}' page {page} to {path}")
+        return path
+
+
+def synthetic_cards(website, category, page, count, images=False):
+    """Generate deterministic product cards for a (website, category, page), optionally with product images."""
+    rng = random.Random(zlib.crc32(f"{website}|{category}|{page}".encode()))
+    template = AMAZON_CARD if website == "Amazon" else BESTBUY_CARD
+    cards = []
+    for i in range(count):
+        index = (page - 1) * count + i
+        listing = zlib.crc32(f'{category}|{index}'.encode())
+        sku = f"B0{listing:08X}" if website == "Amazon" else str(6000000 + listing % 3000000)
+        name = f"{rng.choice(BRANDS)} {category.title()} {index}, " + ", ".join(rng.sample(FEATURES, 3))
+        cards.append(template.format(
+            sku=sku,
+            image=CARD_IMAGES[website].format(sku=sku) if images else "",
+            name=html.escape(name),
+            whole=f"{rng.randint(10, 2500):,}",
+            fraction=f"{rng.randint(0, 99):02d}",
+            rating=f"{rng.uniform(3.0, 5.0):.1f}",
+        ))
+    return cards
+
+
+class MockStorefront:
+    def __init__(self, fixture_dir=None, results_per_page=20, host="127.0.0.1", port=0, latency=0.0,
+                 page_assets=False, script_results=False):
+        """
+        Local HTTP server that mimics the Amazon and BestBuy pages the scrapers visit.
+
+        Recorded snapshots in fixture_dir are served when present (replay);
+        anything else is generated synthetically with results_per_page cards.
+
+        Args:
+            fixture_dir (str): Directory of FixtureRecorder snapshots, or None
+            results_per_page (int): Cards on each synthetic results page
+            host (str): Interface to bind
+            port (int): Port to bind (0 picks a free port)
+            latency (float): Seconds every response is delayed by, to mimic a remote site
+            page_assets (bool): Give synthetic results pages images, a font, a video and
+                a third-party script, like the pages of the real sites
+            script_results (bool): Have synthetic results pages fetch their cards with
+                scripts after loading instead of shipping them in the HTML
+        """
+        self.fixture_dir = fixture_dir
+        self.results_per_page = results_per_page
+        self.latency = latency
+        self.page_assets = page_assets
+        self.script_results = script_results
+        self.server = ThreadingHTTPServer((host, port), self._handler())
+        self.server.daemon_threads = True
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def third_party_url(self):
+        """The same server under its other host name, for "third-party" resources."""
+        host, port = self.server.server_address[:2]
+        return f"http://{'127.0.0.1' if host == 'localhost' else 'localhost'}:{port}"
+
+    def site_urls(self):
+        """SITE_URLS mapping that points the tracker at this storefront."""
+        return {website: self.base_url + prefix for website, prefix in SITE_PREFIXES.items()}
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, name="mock-storefront", daemon=True)
+        self.thread.start()
+        logging.info(f"Mock storefront serving at {self.base_url}")
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _recorded(self, website, name, page):
+        if not self.fixture_dir:
+            return None
+        path = fixture_path(self.fixture_dir, website, name, page)
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                return f.read()
+        return None
+
+    def render(self, path, query):
+        """
+        Build the response body for a request path.
+
+        Returns:
+            str or None: Page HTML, or None for unknown paths
+        """
+        for website, prefix in SITE_PREFIXES.items():
+            if path != prefix and not path.startswith(prefix + "/"):
+                continue
+            route = path[len(prefix):] or "/"
+            search_path, param = SEARCH_PATHS[website]
+
+            if route == "/":
+                home = AMAZON_HOME if website == "Amazon" else BESTBUY_HOME
+                return home.format(prefix=prefix, search_path=search_path, param=param)
+
+            if route == search_path:
+                category = query.get(param, ["products"])[0]
+                page = max(1, int(query.get("page", ["1"])[0]))
+                recorded = self._recorded(website, category, page)
+                if recorded is not None:
+                    return recorded
+                cards = synthetic_cards(website, category, page, self.results_per_page, self.page_assets)
+                if "fragment" in query:
+                    half = (len(cards) + 1) // 2
+                    return "\n".join(cards[:half] if query["fragment"][0] == "0" else cards[half:])
+                next_url = replay_url(website, category, page + 1)
+                return RESULTS_PAGE.format(
+                    head=RESULTS_HEAD.format(third_party=self.third_party_url) if self.page_assets else "",
+                    banner=PROMO_VIDEO if self.page_assets else "",
+                    cards=RESULTS_SCRIPT if self.script_results else "\n".join(cards),
+                    next_url=html.escape(next_url),
+                )
+
+            if website == "Amazon" and route == BESTSELLERS_PATH:
+                recorded = self._recorded(website, "bestsellers", 1)
+                if recorded is not None:
+                    return recorded
+                rng = random.Random(0)
+                items = [
+                    BESTSELLER_ITEM.format(name=f"{rng.choice(BRANDS)} Best Seller {i}", whole=rng.randint(5, 500),
+                                           fraction=f"{rng.randint(0, 99):02d}")
+                    for i in range(self.results_per_page)
+                ]
+                return f"<html><body>{''.join(items)}</body></html>"
+        return None
+
+    def asset(self, path):
+        """
+        Body of a static asset (page_assets), padded to a realistic size.
+
+        Returns:
+            tuple or None: (content type, bytes), or None for other paths
+        """
+        for prefix, (content_type, size) in ASSET_TYPES.items():
+            if path.startswith(prefix) and len(path) > len(prefix):
+                if content_type == "application/javascript":
+                    return content_type, b"/*" + b" " * (size - 4) + b"*/"
+                return content_type, bytes(size)
+        return None
+
+    def _handler(self):
+        storefront = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                if storefront.latency:
+                    time.sleep(storefront.latency)
+                asset = storefront.asset(url.path)
+                if asset is not None:
+                    content_type, data = asset
+                else:
+                    body = storefront.render(url.path.rstrip("/") or "/", parse_qs(url.query))
+                    if body is None:
+                        self.send_error(404)
+                        return
+                    content_type, data = "text/html; charset=utf-8", body.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                logging.debug(f"storefront: {format % args}")
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--fixtures", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures"),
+                        help="directory of recorded snapshots to replay")
+    parser.add_argument("--results", type=int, default=20, help="cards per synthetic results page")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds every response is delayed by")
+    parser.add_argument("--page-assets", action="store_true",
+                        help="serve images, a font, a video and a third-party script with every results page")
+    parser.add_argument("--script-results", action="store_true",
+                        help="have results pages fetch their cards with scripts after loading")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s: %(message)s')
+    storefront = MockStorefront(args.fixtures, args.results, args.host, args.port, args.latency, args.page_assets,
+                                args.script_results)
+    for website, url in storefront.site_urls().items():
+        logging.info(f"{website}: {url}")
+    try:
+        storefront.server.serve_forever()
+    except KeyboardInterrupt:
+        storefront.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from cleaning import parse_prices, parse_ratings
+
+PRICES = ["1,299", "$1,299.99", "1,299 99", "$12", "N/A", "", " 12", "12 ", "1e3", "nan", "inf", "1_000",
+          "-5", ".5", "5.", "$", "1 2 3", "１２", None, np.nan, 12, 3.5]
+RATINGS = ["4.5 out of 5 stars", "4.5", "N/A", "", " 4", "5 stars", "nan", "4,5", None, np.nan, 4, 3.5]
+
+
+# The scalar parsers clean_and_process_data applied row by row before parse_prices
+def old_price(price):
+    try:
+        return float(str(price).replace('$', '').replace(',', ''))
+    except Exception:
+        return np.nan
+
+
+def old_first_token_price(price):  # improvising.py
+    try:
+        cleaned_price = str(price).replace('$', '').replace(',', '').split()[0]
+        return float(cleaned_price)
+    except Exception:
+        return np.nan
+
+
+def old_rating(rating):  # improvising.py
+    try:
+        if rating == 'N/A':
+            return np.nan
+        return float(str(rating).split()[0])
+    except Exception:
+        return np.nan
+
+
+def old_string_rating(rating):  # group.final.py
+    try:
+        return float(rating.split()[0])
+    except Exception:
+        return 0
+
+
+def assert_same(new, old):
+    np.testing.assert_array_equal(new.to_numpy(), old.to_numpy())
+    assert new.dtype == "float64"
+
+
+def test_parse_prices_matches_the_old_parsers():
+    prices = pd.Series(PRICES, dtype=object)
+    assert_same(parse_prices(prices), prices.apply(old_price).astype("float64"))
+    assert_same(parse_prices(prices, first_token=True), prices.apply(old_first_token_price).astype("float64"))
+
+
+def test_parse_ratings_matches_the_old_parsers():
+    ratings = pd.Series(RATINGS, dtype=object)
+    assert_same(parse_ratings(ratings), ratings.apply(old_rating).astype("float64"))
+    assert_same(parse_ratings(ratings, strings_only=True, fill=0), ratings.apply(old_string_rating).astype("float64"))
+
+
+def test_numeric_and_csv_read_columns():
+    numbers = pd.Series([1299.0, np.nan, 5.0])
+    assert_same(parse_prices(numbers), numbers.apply(old_price))
+    assert_same(parse_ratings(numbers, strings_only=True, fill=0), numbers.apply(old_string_rating).astype("float64"))
+    # Columns read back from a snapshot hold str and NaN
+    text = pd.Series(["4.5 out of 5 stars", np.nan, "N/A"] * 1000)
+    assert_same(parse_ratings(text), text.apply(old_rating).astype("float64"))
@@ -0,0 +1,71 @@
+import importlib.util
+import logging
+import os
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from rate_limiter import HostRateLimiter
+from scrape_pool import ScrapePool
+from storefront import MockStorefront
+
+# Keep test runs out of logs/scraper.log; the tracker's basicConfig becomes a no-op
+logging.basicConfig(level=logging.WARNING)
+
+
+def load_tracker(work_dir):
+    spec = importlib.util.spec_from_file_location("tracker_under_test", os.path.join(REPO_DIR, "web_scraping_final.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    tracker = module.EcommerceProductTracker()
+    tracker.LOG_DIR = os.path.join(work_dir, "logs")
+    tracker.PROCESSED_DATA_DIR = os.path.join(work_dir, "processed_data")
+    tracker.ANALYSIS_OUTPUT_DIR = os.path.join(work_dir, "analysis_output")
+    tracker.rate_limiter = HostRateLimiter(rate=1000, burst=100)
+    return tracker
+
+
+def test_fetch_website_reads_every_result_page_over_http(tmp_path):
+    tracker = load_tracker(str(tmp_path))
+    tracker.RESULT_PAGES = 3
+    with MockStorefront(results_per_page=5) as storefront:
+        tracker.SITE_URLS = storefront.site_urls()
+        for website in ("Amazon", "BestBuy"):
+            products = tracker.fetch_website(website, "laptops")
+            assert len(products) == 15
+            assert [product.get("page", 1) for product in products] == [1] * 5 + [2] * 5 + [3] * 5
+            assert all(product["website"] == website and product["category"] == "laptops" for product in products)
+            assert all(product["name"] and product["price"] != "N/A" for product in products)
+            assert len({product["product_id"] for product in products}) == 15
+    tracker.http_fetcher.close()
+
+
+class FakeDriver:
+    quit_calls = 0
+
+    def quit(self):
+        self.quit_calls += 1
+
+
+def test_pool_falls_back_to_the_browser_without_http_results(tmp_path):
+    tracker = load_tracker(str(tmp_path))
+    driver = FakeDriver()
+    browser_jobs = []
+
+    def scrape(driver, website, category):
+        browser_jobs.append((driver, website, category))
+        return [{"name": "From the browser"}]
+
+    # Results pages that load their cards with scripts have none in the HTML
+    with MockStorefront(results_per_page=5, script_results=True) as storefront:
+        tracker.SITE_URLS = storefront.site_urls()
+        jobs = ScrapePool(lambda: driver, scrape, pool_size=1, fetch_fn=tracker.fetch_website).run(
+            [("Amazon", "laptops"), ("BestBuy", "laptops")])
+    tracker.http_fetcher.close()
+
+    assert [job.source for job in jobs] == ["browser", "browser"]
+    # One worker started one browser for both jobs and quit it at the end
+    assert browser_jobs == [(driver, "Amazon", "laptops"), (driver, "BestBuy", "laptops")]
+    assert driver.quit_calls == 1
+    assert [job.product_count for job in jobs] == [1, 1]
@@ -0,0 +1,31 @@
+import os
+import sys
+import threading
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from job_scheduler import JobScheduler, Stage
+
+
+def test_stop_waits_for_the_running_stage():
+    scheduler = JobScheduler(jitter=0)
+    started = threading.Event()
+    ran = []
+
+    def scrape(results):
+        started.set()
+        # A cooperative stage: returns once the scheduler is stopped
+        scheduler.cancel_event.wait(5)
+        time.sleep(0.2)
+        ran.append("scrape")
+
+    scheduler.add_job("job", [Stage("scrape", scrape),
+                              Stage("process", lambda results: ran.append("process"), after=["scrape"])],
+                      interval=3600)
+    threading.Thread(target=lambda: started.wait(5) and scheduler.stop()).start()
+    scheduler.run_forever()
+
+    # run_forever returned after the running stage, and the stage after it never started
+    assert ran == ["scrape"]
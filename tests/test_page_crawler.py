@@ -0,0 +1,39 @@
+import os
+import sys
+import threading
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from page_crawler import fetch_pages, page_urls
+
+
+def test_page_urls_number_the_pages_from_the_next_link():
+    targets = page_urls("https://example.com/s?k=laptops&page=2&ref=sr_pg_1", 4)
+    assert targets == [(2, "https://example.com/s?k=laptops&page=2&ref=sr_pg_1"),
+                       (3, "https://example.com/s?k=laptops&page=3&ref=sr_pg_1"),
+                       (4, "https://example.com/s?k=laptops&page=4&ref=sr_pg_1")]
+
+
+def test_fetch_stops_at_the_first_page_without_products():
+    lock = threading.Lock()
+    requested = []
+
+    def fetch_page(page, url):
+        with lock:
+            requested.append(page)
+        return [{"page": page}] if page < 4 else []
+
+    targets = [(page, f"https://example.com/s?page={page}") for page in range(2, 11)]
+    results = fetch_pages(targets, fetch_page, max_in_flight=2)
+
+    assert results == [[{"page": 2}], [{"page": 3}]] + [[]] * 7
+    # Page 4 is empty: at most the one page in flight with it is requested after it
+    assert sorted(requested) in ([2, 3, 4], [2, 3, 4, 5])
+
+
+def test_failed_page_is_empty():
+    def fetch_page(page, url):
+        raise ConnectionError("reset")
+
+    assert fetch_pages([(2, "https://example.com/s?page=2")], fetch_page) == [[]]
@@ -0,0 +1,31 @@
+import os
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from price_alerts import PriceChangeDetector
+
+
+def test_save_appends_only_changed_states(tmp_path):
+    state_path = str(tmp_path / "price_state.json")
+    events_path = str(tmp_path / "price_events.jsonl")
+    detector = PriceChangeDetector(state_path, events_path)
+    detector.update("a", 10.0, "2026-10-17 10:00:00")
+    detector.update("b", 20.0, "2026-10-17 10:00:00")
+    detector.save()
+    detector.update("b", 18.0, "2026-10-18 10:00:00")
+    detector.save()
+
+    with open(state_path + ".log", encoding="utf-8") as f:
+        batches = f.read().splitlines()
+    assert len(batches) == 2
+    assert '"a"' not in batches[1]
+
+    reloaded = PriceChangeDetector(state_path, events_path)
+    assert reloaded.get("a").to_dict() == detector.get("a").to_dict()
+    assert reloaded.get("b").to_dict() == detector.get("b").to_dict()
+
+    detector.compact()
+    assert not os.path.exists(state_path + ".log")
+    assert PriceChangeDetector(state_path, events_path).get("b").to_dict() == detector.get("b").to_dict()
@@ -0,0 +1,24 @@
+import os
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from price_history import PriceHistoryStore
+
+
+def product(timestamp, price):
+    return {"name": "Echo Buds", "price": price, "rating": "4.5", "category": "headphones",
+            "website": "Amazon", "timestamp": timestamp, "product_key": "Amazon:echo-buds"}
+
+
+def test_until_date_includes_the_whole_day(tmp_path):
+    store = PriceHistoryStore(str(tmp_path / "history.db"))
+    store.record_run([product("2026-10-16 23:00:00", "$50.00"), product("2026-10-17 09:30:00", "$45.00"),
+                      product("2026-10-18 00:00:00", "$40.00")])
+
+    by_day = store.price_history("Amazon:echo-buds", since="2026-10-17", until="2026-10-17")
+    assert list(by_day["timestamp"]) == ["2026-10-17 09:30:00"]
+    by_time = store.price_history("Amazon:echo-buds", until="2026-10-17 09:30:00")
+    assert list(by_time["price_value"]) == [50.0, 45.0]
+    store.close()
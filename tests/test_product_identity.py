@@ -0,0 +1,39 @@
+import os
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from product_identity import ProductIndex
+
+
+def listing(number):
+    return {"website": "Amazon", "name": f"Echo Buds {number}", "product_id": f"B0{number:08d}",
+            "timestamp": "2026-10-17 10:00:00"}
+
+
+def test_save_appends_only_changed_entries(tmp_path):
+    path = str(tmp_path / "product_index.json")
+    index = ProductIndex(path)
+    index.identify([listing(1), listing(2)])
+    index.save()
+    index.identify([listing(3)])
+    index.save()
+
+    with open(path + ".log", encoding="utf-8") as f:
+        batches = f.read().splitlines()
+    assert len(batches) == 2
+    assert "B000000001" not in batches[1]
+
+    # A batch cut short by a crash is skipped, the others are kept
+    with open(path + ".log", "a", encoding="utf-8") as f:
+        f.write('{"products": {"Amazon:asin:B0')
+    index.identify([listing(4)])
+    index.save()
+    reloaded = ProductIndex(path)
+    assert sorted(reloaded.products) == [f"Amazon:asin:B0{n:08d}" for n in (1, 2, 3, 4)]
+    assert reloaded.aliases == index.aliases
+
+    index.compact()
+    assert not os.path.exists(path + ".log")
+    assert ProductIndex(path).products == index.products
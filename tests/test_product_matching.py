@@ -0,0 +1,25 @@
+import os
+import sys
+
+import pandas as pd
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from product_matching import price_spread_report
+
+
+def test_products_without_a_price_are_not_in_spreads():
+    df = pd.DataFrame({
+        "product_key": ["Amazon:1", "BestBuy:1", "Amazon:2", "BestBuy:2"],
+        "name": ["Sony WH-1000XM5 Wireless Headphones", "Sony WH-1000XM5 Wireless Noise Canceling Headphones",
+                 "Apple AirPods Pro 2nd Generation", "Apple AirPods Pro (2nd Generation)"],
+        "website": ["Amazon", "BestBuy", "Amazon", "BestBuy"],
+        "category": ["headphones"] * 4,
+        "price": ["$348.00", "$399.99", "$189.99", "N/A"],
+        # Processing fills a missing price with the median
+        "price_cleaned": [348.0, 399.99, 189.99, 348.0],
+    })
+    report = price_spread_report(df)
+    assert list(report["product_key_a"]) == ["Amazon:1"]
+    assert report["price_b"].iloc[0] == 399.99
@@ -0,0 +1,35 @@
+import os
+import sys
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from rate_limiter import HostRateLimiter, TokenBucket
+
+
+def test_bucket_allows_a_burst_then_paces_at_its_rate():
+    bucket = TokenBucket(rate=20, burst=3)
+    start = time.monotonic()
+    waits = [bucket.acquire() for _ in range(5)]
+    elapsed = time.monotonic() - start
+
+    assert waits[:3] == [0.0, 0.0, 0.0]
+    # Two tokens beyond the burst take 2 / rate seconds in total
+    assert 0.09 <= elapsed < 0.5
+    assert all(wait > 0.03 for wait in waits[3:])
+
+
+def test_waiting_callers_reserve_their_slots_in_order():
+    bucket = TokenBucket(rate=10, burst=1)
+    assert [round(bucket._reserve(), 2) for _ in range(4)] == [0.0, 0.1, 0.2, 0.3]
+
+
+def test_hosts_are_limited_independently():
+    limiter = HostRateLimiter(rate=1, burst=1, host_limits={"fast.example": (1000, 10)})
+    assert limiter.acquire("https://www.amazon.com/s?k=laptops") == 0.0
+    assert limiter.acquire("https://www.bestbuy.com/site/searchpage.jsp") == 0.0
+    # Buckets are keyed by the lower-cased host of the URL
+    assert sorted(limiter.buckets) == ["www.amazon.com", "www.bestbuy.com"]
+    assert limiter.bucket_for("www.amazon.com")._reserve() > 0.5
+    assert [limiter.acquire("fast.example") for _ in range(10)] == [0.0] * 10
@@ -0,0 +1,30 @@
+import os
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from run_journal import RunJournal
+
+
+def test_resume_keeps_the_snapshots_of_every_attempt(tmp_path):
+    path = str(tmp_path / "run_journal.jsonl")
+    first = RunJournal(path)
+    assert first.open_run(window_hours=6) == set()
+    first.record_snapshot("logs/products_1.csv")
+    first.record("Amazon", "laptops", products=20)
+
+    # Interrupted twice: the second attempt completed no job
+    second = RunJournal(path)
+    assert second.open_run(window_hours=6) == {("Amazon", "laptops", 1)}
+    second.record_snapshot("logs/products_2.csv")
+
+    third = RunJournal(path)
+    third.open_run(window_hours=6)
+    assert third.run_id == first.run_id
+    assert third.snapshots == ["logs/products_1.csv", "logs/products_2.csv"]
+    third.complete()
+
+    fresh = RunJournal(path)
+    assert fresh.open_run(window_hours=6) == set()
+    assert fresh.snapshots == []
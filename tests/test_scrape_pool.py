@@ -0,0 +1,70 @@
+import os
+import sys
+import threading
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from scrape_pool import ScrapePool
+
+
+class FakeDriver:
+    def quit(self):
+        pass
+
+
+def test_pool_bounds_the_browsers_running_at_once():
+    lock = threading.Lock()
+    running, peak, drivers = [0], [0], []
+    done = []
+
+    def init_driver():
+        driver = FakeDriver()
+        with lock:
+            drivers.append(driver)
+        return driver
+
+    def scrape(driver, website, category):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.05)
+        with lock:
+            running[0] -= 1
+        return [{"name": f"{website} {category}"}]
+
+    targets = [(website, f"category-{i}") for website in ("Amazon", "BestBuy") for i in range(4)]
+    jobs = ScrapePool(init_driver, scrape, pool_size=3, on_job_done=done.append).run(targets)
+
+    assert peak[0] == 3
+    assert len(drivers) == 3
+    assert [(job.website, job.category) for job in jobs] == targets
+    assert all(job.product_count == 1 and job.error is None for job in jobs)
+    # Products were handed to on_job_done instead of being kept on the jobs
+    assert sorted(done, key=lambda job: job.index) == jobs
+    assert all(job.products == [] for job in jobs)
+
+
+def test_failed_job_does_not_stop_the_others():
+    def scrape(driver, website, category):
+        if category == "bad":
+            raise ValueError("no results grid")
+        return [{"name": category}]
+
+    jobs = ScrapePool(FakeDriver, scrape, pool_size=1).run([("Amazon", "bad"), ("Amazon", "good")])
+    assert isinstance(jobs[0].error, ValueError)
+    assert jobs[1].products == [{"name": "good"}]
+
+
+def test_stop_event_leaves_the_remaining_jobs_unrun():
+    stop = threading.Event()
+
+    def scrape(driver, website, category):
+        stop.set()
+        return [{"name": category}]
+
+    jobs = ScrapePool(FakeDriver, scrape, pool_size=1, stop_event=stop).run(
+        [("Amazon", "laptops"), ("Amazon", "headphones")])
+    assert jobs[0].duration is not None
+    assert jobs[1].duration is None
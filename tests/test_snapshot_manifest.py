@@ -0,0 +1,45 @@
+import os
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from snapshot_manifest import SnapshotManifest
+
+
+def write(path, text):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def test_only_new_or_changed_snapshots_are_pending(tmp_path):
+    logs = tmp_path / "logs"
+    logs.mkdir()
+    write(logs / "products_20261017_100000.csv", "name,price\nA,1\n")
+    write(logs / "products_20261016_100000.csv", "name,price\nB,2\n")
+    write(logs / "scraper.log", "not a snapshot\n")
+    manifest_path = str(tmp_path / "manifest.json")
+
+    manifest = SnapshotManifest(manifest_path)
+    assert manifest.pending(str(logs)) == ["products_20261016_100000.csv", "products_20261017_100000.csv"]
+    manifest.record(str(logs / "products_20261016_100000.csv"), "processed_data_1.csv")
+    # Nothing is marked ingested until the manifest is saved
+    assert SnapshotManifest(manifest_path).entries == {}
+    manifest.save()
+
+    reloaded = SnapshotManifest(manifest_path)
+    assert reloaded.pending(str(logs)) == ["products_20261017_100000.csv"]
+    assert reloaded.entries["products_20261016_100000.csv"]["processed_file"] == "processed_data_1.csv"
+
+    # Same size and a new mtime: the content hash decides
+    path = str(logs / "products_20261016_100000.csv")
+    os.utime(path, (1, 1))
+    assert reloaded.is_ingested(path)
+    write(path, "name,price\nC,3\n")
+    assert reloaded.pending(str(logs)) == ["products_20261016_100000.csv", "products_20261017_100000.csv"]
+
+
+def test_unreadable_manifest_starts_empty(tmp_path):
+    path = tmp_path / "manifest.json"
+    write(path, '{"files": {')
+    assert SnapshotManifest(str(path)).entries == {}
@@ -0,0 +1,51 @@
+import csv
+import os
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from columnar_store import PENDING_SUFFIX
+from snapshot_writer import CsvSnapshotWriter, recover_csv_snapshots
+
+
+def product(key, page=1):
+    return {"name": key, "price": "$10.00", "rating": "4.0", "category": "laptops", "website": "Amazon",
+            "timestamp": "2026-10-17 10:00:00", "product_key": key, "page": page}
+
+
+def test_each_product_key_is_written_once(tmp_path):
+    path = str(tmp_path / "products_1.csv")
+    writer = None
+
+    def on_batch(products):
+        products[:] = writer.unseen(products)
+
+    writer = CsvSnapshotWriter(path, batch_size=2, on_batch=on_batch)
+    # Saved by the interrupted run this one resumes
+    writer.exclude({"Amazon:asin:A"})
+    with writer:
+        writer.write([product("Amazon:asin:A"), product("Amazon:asin:B")])
+        writer.write([product("Amazon:asin:B", page=2), product("Amazon:asin:C", page=2)])
+        writer.write([product("Amazon:asin:A", page=3)])
+
+    with open(path, newline="", encoding="utf-8") as f:
+        keys = [row["product_key"] for row in csv.DictReader(f)]
+    assert keys == ["Amazon:asin:B", "Amazon:asin:C"]
+    assert writer.rows == 2
+
+
+def test_recover_publishes_the_complete_rows_of_pending_snapshots(tmp_path):
+    header = "name,price,rating,category,website,timestamp\n"
+    row = "Echo Buds,$49.99,4.5,headphones,Amazon,2026-10-17 10:00:00\n"
+    cut_short = tmp_path / f"products_20261017_100000.csv{PENDING_SUFFIX}"
+    cut_short.write_bytes((header + row + row + "Echo Dot,$2").encode())
+    header_only = tmp_path / f"products_20261017_110000.csv{PENDING_SUFFIX}"
+    header_only.write_bytes((header + "Echo").encode())
+
+    recovered = recover_csv_snapshots(str(tmp_path))
+
+    assert recovered == [str(tmp_path / "products_20261017_100000.csv")]
+    with open(recovered[0], encoding="utf-8") as f:
+        assert f.read() == header + row + row
+    assert sorted(os.listdir(tmp_path)) == ["products_20261017_100000.csv"]
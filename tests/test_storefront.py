@@ -0,0 +1,39 @@
+import os
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from http_fetch import HttpFetcher, next_page_url, search_url
+from page_crawler import page_urls
+from storefront import FixtureRecorder, MockStorefront, synthetic_cards
+
+NEXT_LINK = "a.s-pagination-next"
+
+
+def live_page(cards, next_href):
+    return (f"<html><body>{''.join(cards)}"
+            f'<a class="s-pagination-next" href="{next_href}">Next</a></body></html>')
+
+
+def test_replay_follows_recorded_pagination(tmp_path):
+    recorder = FixtureRecorder(str(tmp_path), next_links={"Amazon": NEXT_LINK})
+    page_1 = synthetic_cards("Amazon", "laptops", 1, 3)
+    page_2 = synthetic_cards("Amazon", "laptops", 2, 3)
+    # Live pages link to the next page relative to the live site
+    recorder.save("Amazon", "laptops", live_page(page_1, "/s?k=laptops&page=2&ref=sr_pg_1"))
+    recorder.save("Amazon", "laptops", live_page(page_2, "https://www.amazon.com/s?k=laptops&page=3"), page=2)
+
+    fetcher = HttpFetcher(retries=0)
+    with MockStorefront(str(tmp_path)) as storefront:
+        url, param = search_url(storefront.site_urls()["Amazon"], "Amazon")
+        html = fetcher.get(url, params={param: "laptops"})
+        targets = page_urls(next_page_url(html, NEXT_LINK, url), 3)
+        assert [page for page, _ in targets] == [2, 3]
+        replayed = fetcher.get(targets[0][1])
+    fetcher.close()
+
+    assert replayed is not None
+    first_sku = page_2[0].split('data-asin="')[1].split('"')[0]
+    assert first_sku in replayed
+    assert next_page_url(replayed, NEXT_LINK, targets[0][1]).startswith(storefront.base_url + "/amazon/s?")
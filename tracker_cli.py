@@ -0,0 +1,147 @@
+"""
+Command line interface of the product trackers.
+
+    python tracker_cli.py scrape     # scrape every website and category once
+    python tracker_cli.py process    # clean the raw snapshots not processed yet
+    python tracker_cli.py analyze    # write the analysis tables and charts
+    python tracker_cli.py run        # scrape, process and analyze now and on a schedule
+
+--tracker picks the tracker script (web_scraping_final, group.final or
+improvising); each script also takes the same subcommands directly, e.g.
+python improvising.py process. Nothing heavy is imported before the command
+is known, and the trackers import selenium, the HTTP client, matplotlib,
+seaborn and fake_useragent only in the code paths that use them, so process
+and analyze start without loading the browser or plotting stack.
+
+With --profile every stage of the command (driver startup, each website and
+category scrape, cleaning, aggregation and each chart) is profiled, and the
+per-stage profiles and a flame graph are written to a new folder in
+profiles/, next to analysis_output/ (see profiling.py).
+"""
+import argparse
+import glob
+import importlib.util
+import logging
+import os
+import sys
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+TRACKERS = ['web_scraping_final', 'group.final', 'improvising']
+COMMANDS = {
+    'scrape': "scrape every website and category once",
+    'process': "clean the raw snapshots that were not processed yet",
+    'analyze': "write the analysis tables and charts",
+    'run': "scrape, process and analyze now, then on a schedule (default)",
+}
+
+
+def load_tracker(name):
+    """EcommerceProductTracker class of a tracker script (group.final is not a valid module name)."""
+    module_name = name.replace('.', '_')
+    if module_name not in sys.modules:
+        spec = importlib.util.spec_from_file_location(module_name, os.path.join(REPO_DIR, f'{name}.py'))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module
+        spec.loader.exec_module(module)
+    return sys.modules[module_name].EcommerceProductTracker
+
+
+def build_parser(choose_tracker=True):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    if choose_tracker:
+        parser.add_argument("--tracker", choices=TRACKERS, default=TRACKERS[0], help="tracker script to run")
+    parser.add_argument("--storage-format", choices=["csv", "parquet"], help="override STORAGE_FORMAT")
+    parser.add_argument("--data-dir", help="put the logs, processed_data and analysis_output folders here")
+    parser.add_argument("--profile", action="store_true",
+                        help="profile every stage and write the profiles and a flame graph to PROFILE_DIR")
+    commands = parser.add_subparsers(dest="command", metavar="command")
+    for name, help_text in COMMANDS.items():
+        command = commands.add_parser(name, help=help_text, description=help_text)
+        if name == 'analyze':
+            command.add_argument("--input", help="processed CSV to analyze (default: the latest one; "
+                                                 "the parquet format analyzes the whole history)")
+    return parser
+
+
+def latest_processed_csv(directory):
+    """Most recently written processed CSV in directory, or None."""
+    files = glob.glob(os.path.join(directory, 'processed_data_*.csv'))
+    return max(files, key=os.path.getmtime) if files else None
+
+
+def move_log_file(log_dir):
+    """Send the tracker log (scraper.log) to log_dir instead of the directory of the scripts."""
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        if isinstance(handler, logging.FileHandler):
+            moved = logging.FileHandler(os.path.join(log_dir, os.path.basename(handler.baseFilename)))
+            moved.setFormatter(handler.formatter)
+            root.removeHandler(handler)
+            handler.close()
+            root.addHandler(moved)
+
+
+def analyze(tracker, input_path=None):
+    """Analyze processed data and wait for the charts to be rendered."""
+    from concurrent.futures import wait
+
+    df = None
+    if input_path or tracker.STORAGE_FORMAT != "parquet":
+        input_path = input_path or latest_processed_csv(tracker.PROCESSED_DATA_DIR)
+        if input_path is None:
+            logging.warning(f"No processed data in {tracker.PROCESSED_DATA_DIR}, run the process command first")
+            return
+        import pandas as pd
+        df = pd.read_csv(input_path)
+    charts = tracker.analyze_product_data(df)
+    if charts:
+        wait(charts)
+        tracker.chart_renderer().shutdown()
+
+
+def main(argv=None, tracker_class=None):
+    """
+    Run a tracker command.
+
+    Args:
+        argv (list): Command line arguments (default: sys.argv[1:])
+        tracker_class (type): Tracker to run; when omitted it is chosen with --tracker
+    """
+    args = build_parser(choose_tracker=tracker_class is None).parse_args(argv)
+    tracker = (tracker_class or load_tracker(args.tracker))()
+    if args.storage_format:
+        tracker.STORAGE_FORMAT = args.storage_format
+    if args.data_dir:
+        tracker.LOG_DIR = os.path.join(args.data_dir, 'logs')
+        tracker.PROCESSED_DATA_DIR = os.path.join(args.data_dir, 'processed_data')
+        tracker.ANALYSIS_OUTPUT_DIR = os.path.join(args.data_dir, 'analysis_output')
+        tracker.PROFILE_DIR = os.path.join(args.data_dir, 'profiles')
+        for directory in (tracker.LOG_DIR, tracker.PROCESSED_DATA_DIR, tracker.ANALYSIS_OUTPUT_DIR):
+            os.makedirs(directory, exist_ok=True)
+        move_log_file(tracker.LOG_DIR)
+
+    if args.profile:
+        from datetime import datetime
+
+        from profiling import StageProfiler
+
+        tracker.profiler = StageProfiler(os.path.join(tracker.PROFILE_DIR, datetime.now().strftime('%Y%m%d_%H%M%S')))
+
+    try:
+        if args.command == 'scrape':
+            tracker.scrape_all_sources()
+            # Nothing scrapes after this command, don't keep the browsers warm
+            tracker.close_browsers()
+        elif args.command == 'process':
+            tracker.clean_and_process_data()
+        elif args.command == 'analyze':
+            analyze(tracker, args.input)
+        else:
+            tracker.run_scheduler()
+    finally:
+        if tracker.profiler is not None:
+            tracker.profiler.close()
+
+
+if __name__ == "__main__":
+    main()
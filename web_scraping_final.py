@@ -1,22 +1,68 @@
 import os
-import csv
 import logging
-import time
 import threading
+import time
+from concurrent.futures import Future, wait
 from datetime import datetime
+from urllib.parse import urlencode
 import pandas as pd
-import numpy as np
-import schedule
-import matplotlib.pyplot as plt
-import seaborn as sns
-
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
+
+from analysis_cache import AnalysisCache, FrameDigest
+from batch_extract import card_spec, extract_cards, field_spec
+from browser_sessions import BrowserManager, ChromeDriverCache
+from chart_renderer import (ChartRenderer, category_price_histogram, completed, price_distribution,
+                            price_trend, website_price_comparison)
+from cleaning import parse_prices
+from columnar_store import ParquetStore, partition_filter, processed_schema, raw_schema, snapshot_id, RAW_COLUMNS
+from http_fetch import HttpFetcher, next_page_url, parse_cards, search_url
+from job_scheduler import JobScheduler, Stage
+from lean_pages import (DEFAULT_BLOCKED_DOMAINS, PageLoadStats, block_requests, blocked_url_patterns,
+                        lean_chrome_options, log_page_loads, page_metrics)
+from page_crawler import crawl_tabs, fetch_pages, page_urls
+from metrics import MetricsRegistry, MetricsServer, count_webdriver_commands, resident_memory, timed_stage, write_json
+from page_ready import ReadinessStats, log_readiness, wait_until_ready
+from price_alerts import PriceChangeDetector
+from price_history import PriceHistoryStore
+from product_identity import ProductIndex
+from product_matching import price_spread_report
+from rate_limiter import HostRateLimiter
+from run_journal import RunJournal
+from scrape_pool import ScrapePool, log_job_latency
+from snapshot_manifest import SnapshotManifest, processed_path
+from snapshot_writer import CsvSnapshotWriter, ParquetSnapshotWriter, recover_csv_snapshots, snapshot_path
+from storefront import FixtureRecorder, MockStorefront
+from tracker_cli import main as run_command
+
+# Selectors for reading a whole results page in one execute_script call
+AMAZON_RESULT_CARDS = card_spec(
+    "div[data-component-type='s-search-result']",
+    name=field_spec("h2 a span", required=True),
+    price=field_spec(".a-price-whole"),
+    rating=field_spec("span.a-icon-alt"),
+    product_id=field_spec(":scope", attr="data-asin"),
+    url=field_spec("h2 a", attr="href"),
+)
+BESTBUY_RESULT_CARDS = card_spec(
+    "li.sku-item",
+    name=field_spec("h4.sku-title", required=True),
+    price=field_spec("div.priceView-hero-price span"),
+    rating=field_spec("span.c-review-average"),
+    product_id=field_spec(":scope", attr="data-sku-id"),
+    url=field_spec("h4.sku-title a", attr="href"),
+)
+RESULT_CARDS = {"Amazon": AMAZON_RESULT_CARDS, "BestBuy": BESTBUY_RESULT_CARDS}
+
+# "Next page" link of a results page, which further result pages are numbered from
+NEXT_PAGE_LINKS = {
+    "Amazon": "a.s-pagination-next",
+    "BestBuy": "a.sku-list-page-next, a.s-pagination-next",
+}
+
+# Columns the cross-site price spread report is computed from
+SPREAD_COLUMNS = ['product_key', 'name', 'website', 'category', 'price', 'price_cleaned']
+
+# Processed columns read back from the Parquet store for analyze_product_data
+ANALYSIS_COLUMNS = ['product_key', 'name', 'category', 'website', 'price', 'price_cleaned', 'timestamp']
 
 class EcommerceProductTracker:
     def __init__(self):
@@ -34,6 +80,7 @@ class EcommerceProductTracker:
         self.LOG_DIR = os.path.join(self.BASE_DIR, 'logs')
         self.PROCESSED_DATA_DIR = os.path.join(self.BASE_DIR, 'processed_data')
         self.ANALYSIS_OUTPUT_DIR = os.path.join(self.BASE_DIR, 'analysis_output')
+        self.PROFILE_DIR = os.path.join(self.BASE_DIR, 'profiles')
 
         # Create directories if they don't exist
         for dir_path in [self.LOG_DIR, self.PROCESSED_DATA_DIR, self.ANALYSIS_OUTPUT_DIR]:
@@ -52,10 +99,141 @@ class EcommerceProductTracker:
         # Define scraping configuration
         # Configure which websites and product categories to track
         self.WEBSITES = ["Amazon", "BestBuy"]
+        self.SITE_URLS = {"Amazon": "https://www.amazon.com", "BestBuy": "https://www.bestbuy.com"}
         self.PRODUCT_CATEGORIES = ["laptops", "headphones"]
         self.SCRAPE_INTERVAL = 24  # Scrape every 24 hours
+        self.SCRAPER_POOL_SIZE = 2  # Number of browsers scraping in parallel
+
+        # Scheduled scrape -> process -> analyze pipelines: name -> (interval in hours,
+        # categories to scrape or None for all PRODUCT_CATEGORIES). Runs of the same
+        # pipeline never overlap, and each starts up to SCHEDULE_JITTER * interval late
+        self.SCHEDULES = {"all": (self.SCRAPE_INTERVAL, None)}
+        self.SCHEDULE_JITTER = 0.05
+
+        # Limit requests per host (token bucket) instead of pausing after every job,
+        # so different websites can be scraped at the same time
+        self.HOST_RATE_LIMIT = 0.2  # Requests per second per host (one every 5 seconds)
+        self.HOST_BURST = 1  # Requests a host may receive back to back
+        self.rate_limiter = HostRateLimiter(rate=self.HOST_RATE_LIMIT, burst=self.HOST_BURST)
+
+        # Browsers stay open between runs (KEEP_BROWSERS_WARM) with persistent profiles
+        # in BROWSER_PROFILE_DIR, so cookies and consent survive; a session is restarted
+        # after BROWSER_MAX_PAGES pages or once it uses more than BROWSER_MAX_MEMORY_MB.
+        # The chromedriver path is resolved once and cached in PROCESSED_DATA_DIR.
+        self.KEEP_BROWSERS_WARM = True
+        self.BROWSER_PROFILE_DIR = os.path.join(self.BASE_DIR, 'browser_profiles')
+        self.BROWSER_MAX_PAGES = 200
+        self.BROWSER_MAX_MEMORY_MB = 1500
+        self.CHROMEDRIVER_CACHE = 'chromedriver_path.json'
+        self._browser_manager = None
+        self._driver_cache = None
+
+        # Lean page loads: the browser skips images, media, fonts and BLOCKED_DOMAINS
+        # (Chrome prefs and host rules plus DevTools request blocking), and driver.get
+        # returns at DOMContentLoaded ("eager"). The bytes transferred and page-ready
+        # latency of every page are logged, with per-website totals after each run
+        self.LEAN_PAGES = True
+        self.BLOCKED_DOMAINS = list(DEFAULT_BLOCKED_DOMAINS)
+        self.page_loads = PageLoadStats()
+
+        # Pages are read as soon as they are ready instead of after fixed waits: a probe
+        # injected into the page returns once the search box or result cards are present
+        # and the result grid saw no changes (and no fetch/XHR requests) for
+        # GRID_QUIET_SECONDS. PAGE_READY_TIMEOUT only bounds pages that never get ready.
+        # The wait times are collected in per-website histograms and logged after each run
+        self.PAGE_READY_TIMEOUT = 15
+        self.GRID_QUIET_SECONDS = 0.15
+        self.readiness = ReadinessStats()
+
+        # Hot-path metrics (stage durations, products, parse failures, fallback selector
+        # hits, WebDriver round trips, memory) are kept in memory and served in the
+        # Prometheus text format on METRICS_PORT (localhost only, None to disable) while
+        # the scheduler runs, with the summary of the last scrape run at /summary. Every
+        # scrape run also writes its JSON summary to RUN_SUMMARY_DIR inside LOG_DIR
+        self.metrics = MetricsRegistry()
+        self.METRICS_PORT = 9464
+        self.RUN_SUMMARY_DIR = 'run_summaries'
+        self.last_run_summary = None
+
+        # Profile mode (tracker_cli --profile) sets a profiling.StageProfiler here: every
+        # stage above is then profiled, charts are rendered inline so plotting is too,
+        # and the profiles are written to a new folder in PROFILE_DIR
+        self.profiler = None
+
+        # "batch" reads each results page with one execute_script call,
+        # "elements" uses one find_element call per field of every product card
+        self.EXTRACTION_MODE = "batch"
+
+        # "http_first" tries a pooled keep-alive HTTP client and only starts a browser
+        # when the plain HTML has no products; "browser" always uses WebDriver
+        self.FETCH_MODE = "http_first"
+
+        # Result pages scraped per (website, category); pages after the first are
+        # opened from the pagination links, up to MAX_TABS at once per browser
+        # (or concurrent HTTP requests), each still paced by the rate limiter
+        self.RESULT_PAGES = 10
+        self.MAX_TABS = 4
+        self.http_fetcher = HttpFetcher(pool_size=self.SCRAPER_POOL_SIZE * self.MAX_TABS)
+
+        # Offline fixtures: "record" saves every results page the scrapers see,
+        # "replay" serves recorded (or synthetic) pages from a local mock storefront
+        self.FIXTURE_MODE = None
+        self.FIXTURE_DIR = os.path.join(self.BASE_DIR, 'fixtures')
+        self.fixture_recorder = FixtureRecorder(self.FIXTURE_DIR, next_links=NEXT_PAGE_LINKS)
+
+        # Raw snapshots already cleaned, kept in PROCESSED_DATA_DIR so each run
+        # only processes products_*.csv files it has not seen before
+        self.SNAPSHOT_MANIFEST = 'snapshot_manifest.json'
+
+        # "csv" writes raw snapshots and processed data as CSV files; "parquet" keeps
+        # both in Parquet datasets partitioned by date/website/category (needs pyarrow)
+        self.STORAGE_FORMAT = "csv"
+
+        # Every saved run is also recorded in an indexed SQLite database in
+        # PROCESSED_DATA_DIR for price-history lookups (None disables it)
+        self.PRICE_HISTORY_DB = 'price_history.db'
+        self._history_store = None
+
+        # Persistent index of product identities (ASIN/SKU, or a name hash when
+        # the listing id is unknown) in PROCESSED_DATA_DIR
+        self.PRODUCT_INDEX = 'product_index.json'
+        self._product_index = None
+
+        # Scraped products are streamed to the run's snapshot in batches of this size
+        # as jobs finish, so memory stays flat and an interrupted run keeps its data
+        self.WRITE_BATCH_SIZE = 200
 
-    def init_driver(self):
+        # Journal of the jobs the current run has completed, in PROCESSED_DATA_DIR;
+        # an interrupted run is resumed within RUN_WINDOW_HOURS instead of started over
+        self.RUN_JOURNAL = 'run_journal.jsonl'
+        self.RUN_WINDOW_HOURS = self.SCRAPE_INTERVAL
+
+        # Per-product rolling price state, updated as products are saved; price drops
+        # and anomalies are appended to PRICE_EVENTS (both in PROCESSED_DATA_DIR,
+        # None disables detection)
+        self.PRICE_STATE = 'price_state.json'
+        self.PRICE_EVENTS = 'price_events.jsonl'
+        self._price_detector = None
+
+        # Analysis tables and charts are cached by the content hash of the columns
+        # they read, so unchanged artifacts are neither recomputed nor re-rendered
+        # (directory in PROCESSED_DATA_DIR, least recently used entries evicted
+        # past ANALYSIS_CACHE_MAX_MB; None disables the cache)
+        self.ANALYSIS_CACHE = 'analysis_cache'
+        self.ANALYSIS_CACHE_MAX_MB = 200
+        self._analysis_cache = None
+
+        # Charts are rendered by this many background processes (headless Agg
+        # backend) while the analysis tables are written; 0 renders them inline
+        self.CHART_WORKERS = 2
+        self._chart_renderer = None
+
+        # Set to stop a scheduled run early (CTRL+C): the scrape workers finish the
+        # job they are on and take no new ones, so the run can be resumed
+        self.stop_event = threading.Event()
+
+    @timed_stage("init_driver")
+    def init_driver(self, profile_dir=None):
         """
         Initialize Selenium WebDriver with anti-bot detection bypassing.
         
@@ -63,20 +241,43 @@ class EcommerceProductTracker:
         - Disable automation control features
         - Prevent websites from detecting automated browsing
         
+        Args:
+            profile_dir (str): Persistent Chrome profile directory (cookies, consent)
+                to use, if any
+        
         Returns:
             WebDriver: Configured Chrome WebDriver instance
         """
+        from selenium import webdriver
+        from selenium.common.exceptions import WebDriverException
+        from selenium.webdriver.chrome.service import Service
+
         # Configure Chrome options to appear more like a human user
         options = webdriver.ChromeOptions()
         options.add_argument("--disable-blink-features=AutomationControlled")
         options.add_experimental_option("excludeSwitches", ["enable-automation"])
         options.add_experimental_option('useAutomationExtension', False)
+        if profile_dir:
+            options.add_argument(f"--user-data-dir={profile_dir}")
+        if self.LEAN_PAGES:
+            lean_chrome_options(options, self.BLOCKED_DOMAINS)
 
         # Initialize and configure the WebDriver
-        driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+        # The chromedriver path is resolved once and cached; resolve it again when the
+        # cached driver no longer starts (e.g. after a Chrome update)
+        try:
+            driver = webdriver.Chrome(service=Service(self.chromedriver_path()), options=options)
+        except WebDriverException as e:
+            logging.warning(f"Cached chromedriver failed to start, resolving it again: {e}")
+            driver = webdriver.Chrome(service=Service(self.chromedriver_path(refresh=True)), options=options)
+        if self.metrics.enabled:
+            count_webdriver_commands(driver, self.metrics)
         driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        if self.LEAN_PAGES:
+            block_requests(driver, blocked_url_patterns(self.BLOCKED_DOMAINS))
         return driver
 
+    @timed_stage("scrape_amazon", profile_by=("category",))
     def scrape_amazon(self, driver, category):
         """
         Scrape product information from Amazon for a specific category.
@@ -88,53 +289,93 @@ class EcommerceProductTracker:
         Returns:
             list: List of dictionaries containing product information
         """
+        from selenium.webdriver.common.keys import Keys
+
         try:
             # Navigate to Amazon and search for the specified category
-            driver.get("https://www.amazon.com")
-            search_box = WebDriverWait(driver, 30).until(
-                EC.presence_of_element_located((By.ID, "twotabsearchtextbox"))
-            )
+            self.rate_limiter.acquire(self.SITE_URLS["Amazon"])
+            driver.get(self.SITE_URLS["Amazon"])
+            search_box = self.wait_ready(driver, "Amazon", "search box", "#twotabsearchtextbox", quiet=0)
             search_box.clear()
             search_box.send_keys(category)
             search_box.send_keys(Keys.RETURN)
 
-            products = []
-            # Wait and find product elements
-            product_elements = WebDriverWait(driver, 10).until(
-                EC.presence_of_all_elements_located((By.CSS_SELECTOR, "div[data-component-type='s-search-result']"))
-            )
+            # Wait for the result grid to be filled
+            self.wait_ready(driver, "Amazon", "results", AMAZON_RESULT_CARDS["card"])
 
-            # Extract product details
-            for product in product_elements[:20]:
-                try:
-                    # Extract name, price, and rating with error handling
-                    name = product.find_element(By.CSS_SELECTOR, "h2 a span").text
-                    try:
-                        price = product.find_element(By.CSS_SELECTOR, ".a-price-whole").text
-                    except:
-                        price = "N/A"
-                    try:
-                        rating = product.find_element(By.CSS_SELECTOR, "span.a-icon-alt").text
-                    except:
-                        rating = "N/A"
-
-                    # Store product information
-                    products.append({
-                        "name": name,
-                        "price": price,
-                        "rating": rating,
-                        "category": category,
-                        "website": "Amazon",
-                        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                    })
-                except Exception as e:
-                    logging.error(f"Error parsing Amazon product: {e}")
+            if self.FIXTURE_MODE == "record":
+                self.fixture_recorder.save("Amazon", category, driver.page_source)
+            self.record_page_load(driver, "Amazon", category)
 
+            products = self.extract_amazon_products(driver, category)
+            products.extend(self.crawl_result_pages(driver, "Amazon", category, self.extract_amazon_products))
             return products
         except Exception as e:
             logging.error(f"Error scraping Amazon for {category}: {e}")
             return []
 
+    def extract_amazon_products(self, driver, category):
+        """
+        Extract product details from an Amazon results page already loaded in the driver.
+
+        In "batch" EXTRACTION_MODE every card is read by a single execute_script call;
+        in "elements" mode each field is looked up with its own find_element call.
+
+        Args:
+            driver (WebDriver): Selenium WebDriver instance showing search results
+            category (str): Product category that was searched
+
+        Returns:
+            list: List of dictionaries containing product information
+        """
+        from selenium.webdriver.common.by import By
+
+        products = []
+        if self.EXTRACTION_MODE == "batch":
+            for card in extract_cards(driver, AMAZON_RESULT_CARDS, self.metrics, website="Amazon"):
+                products.append({
+                    "name": card["name"],
+                    "price": card["price"],
+                    "rating": card["rating"],
+                    "product_id": card["product_id"],
+                    "url": card["url"],
+                    "category": category,
+                    "website": "Amazon",
+                    "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                })
+            return products
+
+        product_elements = driver.find_elements(By.CSS_SELECTOR, AMAZON_RESULT_CARDS["card"])
+        for product in product_elements[:20]:
+            try:
+                # Extract name, price, and rating with error handling
+                name = product.find_element(By.CSS_SELECTOR, "h2 a span").text
+                try:
+                    price = product.find_element(By.CSS_SELECTOR, ".a-price-whole").text
+                except:
+                    price = "N/A"
+                try:
+                    rating = product.find_element(By.CSS_SELECTOR, "span.a-icon-alt").text
+                except:
+                    rating = "N/A"
+
+                # Store product information
+                products.append({
+                    "name": name,
+                    "price": price,
+                    "rating": rating,
+                    "product_id": product.get_attribute("data-asin"),
+                    "category": category,
+                    "website": "Amazon",
+                    "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                })
+            except Exception as e:
+                logging.error(f"Error parsing Amazon product: {e}")
+                self.metrics.inc("parse_failures_total", website="Amazon", source="browser")
+
+        return products
+
+    @timed_stage("scrape_bestbuy", profile_by=("category",))
     def scrape_bestbuy(self, driver, category):
         """   Scrape product information from Best Buy for a specific category.
         
@@ -147,264 +388,1046 @@ class EcommerceProductTracker:
          Returns:
              list: List of dictionaries containing product information
        """
+        from selenium.webdriver.common.keys import Keys
+
         try:
-            driver.get("https://www.bestbuy.com")
-            search_box = WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "input.search-input"))
-            )
+            self.rate_limiter.acquire(self.SITE_URLS["BestBuy"])
+            driver.get(self.SITE_URLS["BestBuy"])
+            search_box = self.wait_ready(driver, "BestBuy", "search box", "input.search-input", quiet=0)
             search_box.clear()
             search_box.send_keys(category)
             search_box.send_keys(Keys.RETURN)
 
-            products = []
-            product_elements = WebDriverWait(driver, 15).until(
-                EC.presence_of_all_elements_located((By.CSS_SELECTOR, "li.sku-item"))
-            )
+            self.wait_ready(driver, "BestBuy", "results", BESTBUY_RESULT_CARDS["card"])
 
-            for product in product_elements[:20]:
-                try:
-                    # Name
-                    name = product.find_element(By.CSS_SELECTOR, "h4.sku-title").text
-
-                    # Price
-                    try:
-                        price = product.find_element(By.CSS_SELECTOR, "div.priceView-hero-price span").text
-                    except Exception:
-                        price = "N/A"
-
-                    # Rating
-                    try:
-                        rating = product.find_element(By.CSS_SELECTOR, "span.c-review-average").text
-                    except Exception:
-                        rating = "N/A"
-
-                    # Add to product list
-                    products.append({
-                        "name": name,
-                        "price": price,
-                        "rating": rating,
-                        "category": category,
-                        "website": "BestBuy",
-                        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                    })
-                except Exception as e:
-                    logging.error(f"Error parsing Best Buy product: {e}")
+            if self.FIXTURE_MODE == "record":
+                self.fixture_recorder.save("BestBuy", category, driver.page_source)
+            self.record_page_load(driver, "BestBuy", category)
 
+            products = self.extract_bestbuy_products(driver, category)
+            products.extend(self.crawl_result_pages(driver, "BestBuy", category, self.extract_bestbuy_products))
             return products
         except Exception as e:
             logging.error(f"Error scraping Best Buy for {category}: {e}")
             return []
 
+    def extract_bestbuy_products(self, driver, category):
+        """
+        Extract product details from a Best Buy results page already loaded in the driver.
+
+        Same EXTRACTION_MODE handling as extract_amazon_products.
+
+        Args:
+            driver (WebDriver): Selenium WebDriver instance showing search results
+            category (str): Product category that was searched
+
+        Returns:
+            list: List of dictionaries containing product information
+        """
+        from selenium.webdriver.common.by import By
+
+        products = []
+        if self.EXTRACTION_MODE == "batch":
+            for card in extract_cards(driver, BESTBUY_RESULT_CARDS, self.metrics, website="BestBuy"):
+                products.append({
+                    "name": card["name"],
+                    "price": card["price"],
+                    "rating": card["rating"],
+                    "product_id": card["product_id"],
+                    "url": card["url"],
+                    "category": category,
+                    "website": "BestBuy",
+                    "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                })
+            return products
+
+        product_elements = driver.find_elements(By.CSS_SELECTOR, BESTBUY_RESULT_CARDS["card"])
+        for product in product_elements[:20]:
+            try:
+                # Name
+                name = product.find_element(By.CSS_SELECTOR, "h4.sku-title").text
 
+                # Price
+                try:
+                    price = product.find_element(By.CSS_SELECTOR, "div.priceView-hero-price span").text
+                except Exception:
+                    price = "N/A"
+
+                # Rating
+                try:
+                    rating = product.find_element(By.CSS_SELECTOR, "span.c-review-average").text
+                except Exception:
+                    rating = "N/A"
+
+                # Add to product list
+                products.append({
+                    "name": name,
+                    "price": price,
+                    "rating": rating,
+                    "product_id": product.get_attribute("data-sku-id"),
+                    "category": category,
+                    "website": "BestBuy",
+                    "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                })
+            except Exception as e:
+                logging.error(f"Error parsing Best Buy product: {e}")
+                self.metrics.inc("parse_failures_total", website="BestBuy", source="browser")
+
+        return products
+
+    def crawl_result_pages(self, driver, website, category, extract):
+        """
+        Scrape result pages 2..RESULT_PAGES of the search shown in the driver.
+
+        The pages are numbered from the first page's "next page" link and opened
+        as new tabs of the same browser, up to MAX_TABS loading at once; every
+        page still waits for the per-host rate limiter. The crawl stops at the
+        first page without products (past the last page of results).
+
+        Args:
+            driver (WebDriver): Selenium WebDriver instance showing the first results page
+            website (str): Website name from WEBSITES (e.g., 'Amazon')
+            category (str): Product category that was searched
+            extract (callable): extract(driver, category) -> products of the page shown
+
+        Returns:
+            list: Products of the further pages, each with the page it was found on
+        """
+        from selenium.webdriver.common.by import By
+
+        if self.RESULT_PAGES < 2:
+            return []
+        links = driver.find_elements(By.CSS_SELECTOR, NEXT_PAGE_LINKS[website])
+        targets = page_urls(links[0].get_attribute("href") if links else None, self.RESULT_PAGES)
+        if not targets:
+            return []
+
+        def read_page(tab, page):
+            self.wait_ready(tab, website, "results", RESULT_CARDS[website]["card"])
+            if self.FIXTURE_MODE == "record":
+                self.fixture_recorder.save(website, category, tab.page_source, page=page)
+            self.record_page_load(tab, website, category, page)
+            return [dict(product, page=page) for product in extract(tab, category)]
+
+        base_url = self.SITE_URLS[website]
+        blocked = blocked_url_patterns(self.BLOCKED_DOMAINS)
+        pages = crawl_tabs(driver, targets, read_page, max_tabs=self.MAX_TABS,
+                           before_open=lambda url: self.rate_limiter.acquire(base_url),
+                           prepare_tab=(lambda tab: block_requests(tab, blocked)) if self.LEAN_PAGES else None)
+        return [product for page in pages for product in page]
+
+    def record_page_load(self, driver, website, category, page=1):
+        """
+        Log the bytes transferred and page-ready latency of the page shown in the driver,
+        and add them to the run's page_loads.
+
+        Args:
+            driver (WebDriver): Selenium WebDriver instance showing a results page
+            website (str): Website name from WEBSITES (e.g., 'Amazon')
+            category (str): Product category that was searched
+            page (int): Results page number
+        """
+        metrics = page_metrics(driver)
+        if not metrics:
+            return
+        self.page_loads.add(website, metrics)
+        ready = metrics.get("ready_ms")
+        logging.info(
+            f"{website}/{category} page {page}: {metrics['bytes'] / 1024:.0f} KiB in {metrics['requests']} requests"
+            + (f", ready after {ready / 1000:.2f}s" if ready is not None else "")
+        )
+
+    def wait_ready(self, driver, website, what, selector, quiet=None):
+        """
+        Wait until an element of the page shown in the driver is ready, and record the wait in readiness.
+
+        Args:
+            driver (WebDriver): Selenium WebDriver instance
+            website (str): Website name from WEBSITES (e.g., 'Amazon')
+            what (str): Name of the element in the readiness histograms (e.g., 'results')
+            selector (str): CSS selector of the element
+            quiet (float): Seconds the matching elements must not change (default GRID_QUIET_SECONDS;
+                0 returns as soon as the element is present)
+
+        Returns:
+            WebElement: First element matching selector
+
+        Raises:
+            PageNotReady: When the element did not appear within PAGE_READY_TIMEOUT
+        """
+        ready = wait_until_ready(driver, selector, timeout=self.PAGE_READY_TIMEOUT,
+                                 quiet=self.GRID_QUIET_SECONDS if quiet is None else quiet,
+                                 stats=self.readiness, label=(website, what))
+        return ready["element"]
+
+
+    @timed_stage("save_to_csv")
     def save_to_csv(self, products):
         """
-        Save scraped product information to a CSV file.
+        Save scraped product information as a new raw snapshot.
+        
+        Writes a CSV file in LOG_DIR, or a snapshot in the raw Parquet store when
+        STORAGE_FORMAT is "parquet", through the same streaming writer as
+        scrape_all_sources.
         
         Args:
             products (list): List of product dictionaries to save
         
         Returns:
-            str or None: Filename of the saved CSV, or None if saving failed
+            str or None: Filename (or Parquet snapshot name) of the saved snapshot,
+                or None if saving failed
         """
         if not products:
             logging.warning("No products to save")
             return None
 
-        # Generate a unique filename with timestamp
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = os.path.join(self.LOG_DIR, f'products_{timestamp}.csv')
+        try:
+            with self.open_snapshot() as writer:
+                writer.write(products)
+            return writer.name
+        except Exception as e:
+            logging.error(f"Error saving snapshot: {e}")
+            return None
 
+    def open_snapshot(self):
+        """
+        Open a streaming writer for a new raw snapshot in STORAGE_FORMAT.
+        
+        Products are written out in batches of WRITE_BATCH_SIZE to pending files,
+        and the snapshot is only published (renamed to its final name) when the
+        writer is closed. Every batch gets its stable product keys and is recorded
+        in the price history just before it is written.
+        
+        Returns:
+            SnapshotWriter: Writer to pass products to; use it as a context manager
+        """
+        run = {"run_id": None}
+
+        def on_batch(products):
+            # Give every product its stable key before it is written anywhere
+            self.identify_products(products)
+            # A product listed on several result pages (or already saved by the
+            # interrupted run this one resumes) is written once per snapshot
+            products[:] = writer.unseen(products)
+            if not products:
+                return
+            run["run_id"] = self.record_price_history(products, writer.name, run_id=run["run_id"])
+            self.detect_price_changes(products)
+
+        if self.STORAGE_FORMAT == "parquet":
+            store = self.raw_store()
+            writer = ParquetSnapshotWriter(store, store.new_snapshot_id('products_'), self.WRITE_BATCH_SIZE, on_batch)
+        else:
+            writer = CsvSnapshotWriter(snapshot_path(self.LOG_DIR), RAW_COLUMNS, self.WRITE_BATCH_SIZE, on_batch)
+        return writer
+
+    def recover_partial_snapshots(self):
+        """
+        Publish raw snapshots left pending by an interrupted run.
+        
+        The batches such a run wrote before it stopped are kept and processed
+        like any other snapshot.
+        
+        Returns:
+            list: Recovered snapshot files
+        """
+        try:
+            if self.STORAGE_FORMAT == "parquet":
+                return self.raw_store().recover_pending()
+            return recover_csv_snapshots(self.LOG_DIR)
+        except Exception as e:
+            logging.error(f"Error recovering partial snapshots: {e}")
+            return []
+
+    def snapshot_keys(self, snapshots):
+        """
+        Product keys saved in raw snapshots.
+
+        Snapshots that were never published (an attempt that died before its
+        first batch was written) are skipped.
+
+        Args:
+            snapshots (list): Snapshot names (SnapshotWriter.name: the CSV path, or
+                the Parquet snapshot id), e.g. RunJournal.snapshots
+
+        Returns:
+            set: Product keys of their rows
+        """
         try:
-            # Write products to CSV
-            with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-                fieldnames = ['name', 'price', 'rating', 'category', 'website', 'timestamp']
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                writer.writeheader()
-                writer.writerows(products)
-
-            logging.info(f"Saved {len(products)} products to {filename}")
-            return filename
+            if self.STORAGE_FORMAT == "parquet":
+                names = set(snapshots)
+                files = [path for path in self.raw_store().files() if snapshot_id(path) in names]
+                if not files:
+                    return set()
+                keys = self.raw_store().read(columns=['product_key'], files=files)['product_key']
+            else:
+                paths = [path for path in snapshots if os.path.exists(path)]
+                if not paths:
+                    return set()
+                keys = pd.concat([pd.read_csv(path, usecols=['product_key'])['product_key'] for path in paths])
+            return set(keys.dropna())
         except Exception as e:
-            logging.error(f"Error saving to CSV: {e}")
+            logging.error(f"Error reading the product keys of {snapshots}: {e}")
+            return set()
+
+    def identify_products(self, products):
+        """
+        Add a stable 'product_key' to each scraped product and persist the product index.
+        
+        The key is the listing's ASIN/SKU (from the card or its URL) when available,
+        otherwise a hash of the normalized name.
+        
+        Args:
+            products (list): List of product dictionaries, updated in place
+        """
+        index = self.product_index()
+        index.identify(products)
+        try:
+            index.save()
+        except OSError as e:
+            logging.error(f"Error saving product index: {e}")
+
+    def product_index(self):
+        """
+        Load the persistent product index, once per index path.
+        
+        Returns:
+            ProductIndex: Hash index from product key to product record
+        """
+        path = os.path.join(self.PROCESSED_DATA_DIR, self.PRODUCT_INDEX)
+        if self._product_index is None or self._product_index.path != path:
+            self._product_index = ProductIndex(path)
+        return self._product_index
+
+    def record_price_history(self, products, source, run_id=None):
+        """
+        Record a saved run in the SQLite price-history store (one bulk transaction).
+        
+        Failures are logged and never affect the saved snapshot.
+        
+        Args:
+            products (list): List of product dictionaries that were saved
+            source (str): Snapshot file or name the products were saved to
+            run_id (int): Run to add the products to, for later batches of a snapshot
+        
+        Returns:
+            int or None: The run_id, or None when nothing was recorded
+        """
+        if not self.PRICE_HISTORY_DB:
             return None
+        try:
+            return self.history_store().record_run(products, source=os.path.basename(source),
+                                                   run_id=run_id)
+        except Exception as e:
+            logging.error(f"Error recording price history: {e}")
+            return run_id
 
-    def clean_and_process_data(self):
+    def history_store(self):
+        """
+        Open the SQLite price-history store, once per database path.
+        
+        Returns:
+            PriceHistoryStore: Store with the time-series query API, e.g.
+                history_store().price_history('Amazon:asin:B0ABCDEFGH', since='2024-12-01')
+        """
+        path = os.path.join(self.PROCESSED_DATA_DIR, self.PRICE_HISTORY_DB)
+        if self._history_store is None or self._history_store.path != path:
+            self._history_store = PriceHistoryStore(path)
+        return self._history_store
+
+    def price_detector(self):
+        """
+        Load the rolling price state, once per state path.
+        
+        Returns:
+            PriceChangeDetector: Detector that reports events to on_price_event
+        """
+        state_path = os.path.join(self.PROCESSED_DATA_DIR, self.PRICE_STATE)
+        if self._price_detector is None or self._price_detector.state_path != state_path:
+            events_path = os.path.join(self.PROCESSED_DATA_DIR, self.PRICE_EVENTS)
+            self._price_detector = PriceChangeDetector(state_path, events_path, on_event=self.on_price_event)
+        return self._price_detector
+
+    def detect_price_changes(self, products):
+        """
+        Update the rolling price state with saved products and record price events.
+        
+        Each product's state is updated in O(1), without reading earlier
+        snapshots. Failures are logged and never affect the saved snapshot.
+        
+        Args:
+            products (list): List of product dictionaries with their product_key
+        
+        Returns:
+            list: Detected event dictionaries
+        """
+        if not self.PRICE_STATE:
+            return []
+        try:
+            detector = self.price_detector()
+            events = detector.observe(products)
+            detector.save()
+            return events
+        except Exception as e:
+            logging.error(f"Error detecting price changes: {e}")
+            return []
+
+    def on_price_event(self, event):
+        """
+        Report a detected price event (logged; replace to send notifications elsewhere).
+        
+        Args:
+            event (dict): Event as written to PRICE_EVENTS
         """
-        Clean and process scraped data:
-        - Find the latest CSV file
+        if event['event'] == 'price_drop':
+            logging.info(f"Price drop: {event['name']} ({event['website']}) "
+                         f"{event['previous_price']} -> {event['price']} ({event['change_pct']}%)")
+        else:
+            logging.info(f"Price {event['event']}: {event['name']} ({event['website']}) at {event['price']}")
+
+    def raw_store(self):
+        """Parquet store of raw snapshots, used when STORAGE_FORMAT is "parquet"."""
+        return ParquetStore(os.path.join(self.LOG_DIR, 'products'), raw_schema())
+
+    def processed_store(self):
+        """Parquet store of processed data, used when STORAGE_FORMAT is "parquet"."""
+        return ParquetStore(os.path.join(self.PROCESSED_DATA_DIR, 'processed'), processed_schema('price_cleaned'))
+
+    def load_processed_data(self, columns=None, since=None, until=None, websites=None, categories=None):
+        """
+        Read processed history from the Parquet store.
+        
+        Only the requested columns are read, and the date/website/category
+        filters skip whole partitions instead of filtering loaded rows.
+        
+        Args:
+            columns (list): Columns to read (default: all)
+            since (str): First date to include, 'YYYY-MM-DD'
+            until (str): Last date to include, 'YYYY-MM-DD'
+            websites (list): Websites to include
+            categories (list): Categories to include
+        
+        Returns:
+            pandas.DataFrame: Processed rows
+        """
+        return self.processed_store().read(columns, partition_filter(since, until, websites, categories))
+
+    def clean_snapshot(self, df):
+        """
+        Clean one raw snapshot:
         - Clean price data
         - Remove duplicates
         - Handle missing values
         
+        Args:
+            df (pandas.DataFrame): Raw snapshot as saved by save_to_csv
+        
         Returns:
-            pandas.DataFrame or None: Processed DataFrame or None if no data
+            pandas.DataFrame: Cleaned snapshot
+        """
+        # Clean price data: convert to float, handling various formats
+        # (vectorized, same result as applying cleaning.parse_price row by row)
+        df['price_cleaned'] = parse_prices(df['price'])
+        
+        # Remove duplicate listings: one row per product key (see product_identity)
+        df['product_key'] = self.product_index().keys_for(df)
+        df = df.drop_duplicates(subset=['product_key'])
+        
+        # Handle missing values
+        df['rating'] = df['rating'].fillna('N/A')
+        df['price_cleaned'] = df['price_cleaned'].fillna(df['price_cleaned'].median())
+        return df
+
+    @timed_stage("clean_and_process_data")
+    def clean_and_process_data(self):
+        """
+        Clean and process scraped data incrementally:
+        - Find raw snapshots not yet listed in the snapshot manifest
+        - Clean each of them (see clean_snapshot)
+        - Save them together as a new processed file
+        - Record them in the manifest so later runs skip them
+        
+        Returns:
+            pandas.DataFrame or None: Newly processed data, or None if there was nothing new
         """
         logging.info("Starting data processing...")
         
-        # Find the latest CSV file in the logs directory
-        csv_files = [f for f in os.listdir(self.LOG_DIR) if f.startswith('products_') and f.endswith('.csv')]
-        if not csv_files:
+        # Raw data files grouped by snapshot: one CSV file, or one Parquet file per partition
+        if self.STORAGE_FORMAT == "parquet":
+            raw_store = self.raw_store()
+            data_files = raw_store.files()
+            load_snapshot = lambda files: raw_store.read(files=files)
+        else:
+            data_files = sorted(os.path.join(self.LOG_DIR, f) for f in os.listdir(self.LOG_DIR)
+                                if f.startswith('products_') and f.endswith('.csv'))
+            load_snapshot = lambda files: pd.read_csv(files[0])
+        if not data_files:
             logging.warning("No data to process.")
             return None
 
-        # Load the latest CSV file
-        latest_file = max(csv_files)
-        df = pd.read_csv(os.path.join(self.LOG_DIR, latest_file))
+        manifest = SnapshotManifest(os.path.join(self.PROCESSED_DATA_DIR, self.SNAPSHOT_MANIFEST))
+        new_files = manifest.pending_paths(data_files, self.LOG_DIR)
+        if not new_files:
+            logging.info("No new snapshots to process.")
+            return None
 
-        # Clean price data: convert to float, handling various formats
-        def parse_price(price):
-            try:
-                return float(str(price).replace('$', '').replace(',', ''))
-            except:
-                return np.nan
+        snapshots = {}
+        for path in new_files:
+            snapshots.setdefault(snapshot_id(path), []).append(path)
+        df = pd.concat([self.clean_snapshot(load_snapshot(files)) for files in snapshots.values()], ignore_index=True)
 
-        # Apply price cleaning
-        df['price_cleaned'] = df['price'].apply(parse_price)
-        
-        # Remove duplicate entries
-        df = df.drop_duplicates(subset=['name', 'timestamp'])
-        
-        # Handle missing values
-        df['rating'] = df['rating'].fillna('N/A')
-        df['price_cleaned'] = df['price_cleaned'].fillna(df['price_cleaned'].median())
+        # Save processed data as a new CSV, or append it to the processed Parquet store
+        if self.STORAGE_FORMAT == "parquet":
+            processed_store = self.processed_store()
+            processed_file = processed_store.new_snapshot_id('processed_data_')
+            processed_store.write(df, processed_file)
+        else:
+            processed_file = processed_path(self.PROCESSED_DATA_DIR)
+            df.to_csv(processed_file, index=False)
+        logging.info(f"Processed {len(snapshots)} new snapshot(s) into {processed_file}")
 
-        # Save processed data to a new CSV
-        processed_file = os.path.join(self.PROCESSED_DATA_DIR, f'processed_data_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv')
-        df.to_csv(processed_file, index=False)
-        logging.info(f"Processed data saved to {processed_file}")
+        # Only checkpoint once the processed data is on disk
+        for path in new_files:
+            manifest.record(path, processed_file, key=os.path.relpath(path, self.LOG_DIR))
+        manifest.save()
 
         return df
 
-    def analyze_product_data(self, df):
+    @timed_stage("analyze_product_data")
+    def analyze_product_data(self, df=None):
         """
         Perform comprehensive data analysis and generate visualizations:
         - Price analysis by category
         - Price distribution boxplot
         - Rating analysis
         - Price comparison across websites
+        - Price spread of the same products matched across websites
+        - Average price per website, price trend and per-category histogram charts
+
+        Tables are written before this returns; charts are rendered in background
+        processes (see CHART_WORKERS).
         
         Args:
-            df (pandas.DataFrame): Processed product data
+            df (pandas.DataFrame): Processed product data. When omitted with the
+                "parquet" storage format, the whole processed history is analyzed.
+
+        Returns:
+            list: concurrent.futures.Future per chart, resolving to the image path
         """
+        if df is None and self.STORAGE_FORMAT == "parquet":
+            # Read only the columns the analysis uses
+            df = self.load_processed_data(columns=ANALYSIS_COLUMNS)
+
         if df is None:
             logging.warning("Cannot perform analysis without data.")
-            return
+            return []
+
+        # Every artifact is keyed by the content hash of the columns it reads, and
+        # only recomputed when those columns (or its parameters) change
+        digest = FrameDigest(df)
 
         # Analyze prices by category
-        price_by_category = df.groupby('category')['price_cleaned'].agg(['mean', 'median', 'min', 'max'])
-        price_by_category.to_csv(os.path.join(self.ANALYSIS_OUTPUT_DIR, 'price_analysis.csv'))
+        self.cached_artifact(
+            'price_analysis.csv', digest, ['category', 'price_cleaned'],
+            lambda path: df.groupby('category')['price_cleaned'].agg(['mean', 'median', 'min', 'max']).to_csv(path),
+        )
 
         # Visualize price distribution
-        plt.figure(figsize=(12, 6))
-        sns.boxplot(x='category', y='price_cleaned', data=df)
-        plt.title('Price Distribution by Product Category')
-        plt.xticks(rotation=45)
-        plt.tight_layout()
-        plt.savefig(os.path.join(self.ANALYSIS_OUTPUT_DIR, 'price_distribution.png'))
-        plt.close()
+        charts = [self.cached_chart('price_distribution.png', df, digest, price_distribution,
+                                    ['category', 'price_cleaned'], figsize=(12, 6))]
 
         
         # Compare prices across websites
-        website_price_comparison = df.groupby(['website', 'category'])['price_cleaned'].mean().unstack()
-        website_price_comparison.to_csv(os.path.join(self.ANALYSIS_OUTPUT_DIR, 'website_price_comparison.csv'))
+        self.cached_artifact(
+            'website_price_comparison.csv', digest, ['website', 'category', 'price_cleaned'],
+            lambda path: df.groupby(['website', 'category'])['price_cleaned'].mean().unstack().to_csv(path),
+        )
+
+        # Match the same products across websites and report their price spread
+        self.cached_artifact('cross_site_price_spread.csv', digest, SPREAD_COLUMNS,
+                             lambda path: self.write_price_spread(df, path))
+
+        # Average price per website, daily price trend and one histogram per category
+        charts.append(self.cached_chart('website_price_comparison.png', df, digest, website_price_comparison,
+                                        ['website', 'category', 'price_cleaned']))
+        charts.append(self.cached_chart('price_trend.png', df, digest, price_trend,
+                                        ['timestamp', 'website', 'category', 'price_cleaned']))
+        for category in sorted(df['category'].dropna().unique()):
+            charts.append(self.cached_chart(f"price_histogram_{category.replace(' ', '_')}.png", df, digest,
+                                            category_price_histogram, ['website', 'category', 'price_cleaned'],
+                                            category=category))
+
+        logging.info(f"Data analysis completed. Results saved in analysis output directory, "
+                     f"{sum(not chart.done() for chart in charts)} chart(s) still rendering.")
+        return charts
+
+    def write_price_spread(self, df, path):
+        """
+        Match the same products across websites and write their price spread report.
+
+        Args:
+            df (pandas.DataFrame): Processed product data
+            path (str): Output CSV file
+        """
+        spread_report = price_spread_report(df)
+        spread_report.to_csv(path, index=False)
+        logging.info(f"Matched {len(spread_report)} products across websites")
+
+    def analysis_cache(self):
+        """
+        Open the analysis artifact cache, once per cache directory.
+
+        Returns:
+            AnalysisCache or None: The cache, or None when ANALYSIS_CACHE is disabled
+        """
+        if not self.ANALYSIS_CACHE:
+            return None
+        directory = os.path.join(self.PROCESSED_DATA_DIR, self.ANALYSIS_CACHE)
+        if self._analysis_cache is None or self._analysis_cache.directory != directory:
+            self._analysis_cache = AnalysisCache(directory, max_bytes=self.ANALYSIS_CACHE_MAX_MB * 2 ** 20)
+        return self._analysis_cache
+
+    def cached_artifact(self, filename, digest, columns, render, **params):
+        """
+        Write an analysis artifact unless its inputs are unchanged.
+
+        The artifact is keyed by the content hash of the columns it is computed
+        from plus its parameters. When the output file already holds that key
+        nothing is done; when the key is in the cache the file is copied from
+        there. Only otherwise is render called.
+
+        Args:
+            filename (str): Artifact file in ANALYSIS_OUTPUT_DIR
+            digest (FrameDigest): Column hashes of the analyzed data
+            columns (list): Columns the artifact is computed from
+            render (callable): render(path) computes and writes the artifact, or
+                returns a future of it
+            **params: Parameters that change the artifact (figure size, ...)
+
+        Returns:
+            concurrent.futures.Future: Resolves to the artifact path once it is
+                written; only still pending when render returned a future (charts)
+        """
+        path = os.path.join(self.ANALYSIS_OUTPUT_DIR, filename)
+        cache = self.analysis_cache()
+        if cache is not None:
+            key = cache.key(filename, digest.digest(columns), params)
+            status = cache.restore(key, path)
+            if status:
+                logging.info(f"{filename} {status}: inputs did not change, skipped computing it")
+                return completed(path)
+        future = render(path)
+        if not isinstance(future, Future):
+            future = completed(path)
+        if cache is not None:
+            future.add_done_callback(lambda done: self.cache_artifact(cache, key, filename, done))
+        return future
+
+    def cache_artifact(self, cache, key, filename, future):
+        """
+        Add an artifact to the analysis cache once its future is done.
+
+        Failed and superseded renders are not cached.
+
+        Args:
+            cache (AnalysisCache): Analysis artifact cache
+            key (str): Cache key of the artifact
+            filename (str): Artifact file in ANALYSIS_OUTPUT_DIR
+            future (concurrent.futures.Future): Finished render of the artifact
+        """
+        if future.cancelled() or future.exception() is not None or future.result() is None:
+            return
+        try:
+            cache.store(key, future.result())
+        except OSError as e:
+            logging.error(f"Error caching {filename}: {e}")
+
+    def cached_chart(self, filename, df, digest, chart, columns, **params):
+        """
+        Render a chart in the background unless its inputs are unchanged.
+
+        Args:
+            filename (str): Image file in ANALYSIS_OUTPUT_DIR
+            df (pandas.DataFrame): Processed product data
+            digest (FrameDigest): Column hashes of df
+            chart (callable): Chart function of chart_renderer
+            columns (list): Columns the chart is drawn from (only these are sent
+                to the rendering process)
+            **params: Keyword arguments of the chart function
+
+        Returns:
+            concurrent.futures.Future: Resolves to the image path once it is rendered
+        """
+        return self.cached_artifact(
+            filename, digest, columns,
+            lambda path: self.chart_renderer().submit(chart, df[columns], path, **params), **params,
+        )
+
+    def chart_renderer(self):
+        """
+        Start (once) the pool of background chart rendering processes.
+
+        Returns:
+            ChartRenderer: The renderer
+        """
+        if self._chart_renderer is None:
+            self._chart_renderer = ChartRenderer(max_workers=0 if self.profiler else self.CHART_WORKERS,
+                                                 profiler=self.profiler)
+        return self._chart_renderer
 
-        logging.info("Data analysis completed. Results saved in analysis output directory.")
+    @timed_stage("fetch_website", profile_by=("website", "category"))
+    def fetch_website(self, website, category):
+        """
+        Fetch search results over plain HTTP and parse them without a browser.
+
+        Uses the same result card selectors as the WebDriver scrapers, and fetches
+        up to RESULT_PAGES result pages.
+
+        Args:
+            website (str): Website name from WEBSITES (e.g., 'Amazon')
+            category (str): Product category to search (e.g., 'laptops')
 
-    def scrape_all_sources(self):
+        Returns:
+            list: List of product dictionaries (empty when the page needs a real browser)
+        """
+        if website not in RESULT_CARDS:
+            return []
+        spec = RESULT_CARDS[website]
+
+        base_url = self.SITE_URLS[website]
+        url, param = search_url(base_url, website)
+        html = self.http_fetcher.get(url, params={param: category}, limiter=self.rate_limiter)
+        if not html:
+            return []
+        if self.FIXTURE_MODE == "record":
+            self.fixture_recorder.save(website, category, html)
+        cards = parse_cards(html, spec, self.metrics, website=website)
+
+        # Result pages 2..RESULT_PAGES, up to MAX_TABS requests at once
+        if cards and self.RESULT_PAGES > 1:
+            def fetch_page(page, page_url):
+                page_html = self.http_fetcher.get(page_url, limiter=self.rate_limiter)
+                if not page_html:
+                    return []
+                if self.FIXTURE_MODE == "record":
+                    self.fixture_recorder.save(website, category, page_html, page=page)
+                return [dict(card, page=page) for card in parse_cards(page_html, spec, self.metrics, website=website)]
+
+            first_url = f"{url}?{urlencode({param: category})}"
+            targets = page_urls(next_page_url(html, NEXT_PAGE_LINKS[website], first_url), self.RESULT_PAGES)
+            for page_cards in fetch_pages(targets, fetch_page, self.MAX_TABS):
+                cards.extend(page_cards)
+
+        return [
+            dict(card, category=category, website=website, timestamp=datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+            for card in cards
+        ]
+
+    def scrape_website(self, driver, website, category):
+        """
+        Dispatch a single (website, category) job to the matching scraper.
+
+        Args:
+            driver (WebDriver): Selenium WebDriver instance
+            website (str): Website name from WEBSITES (e.g., 'Amazon')
+            category (str): Product category to search (e.g., 'laptops')
+
+        Returns:
+            list: List of dictionaries containing product information
+        """
+        if website == "Amazon":
+            return self.scrape_amazon(driver, category)
+        elif website == "BestBuy":
+            return self.scrape_bestbuy(driver, category)
+
+        logging.error(f"Unsupported website: {website}")
+        return []
+
+    def scrape_all_sources(self, categories=None):
         """
         Comprehensive scraping method to:
-        - Scrape multiple websites and product categories
-        - Manage WebDriver lifecycle
-        - Save scraped data to CSV
+        - Scrape multiple websites and product categories in parallel
+        - Try plain HTTP first and fall back to a browser (FETCH_MODE)
+        - Manage a bounded pool of WebDrivers (SCRAPER_POOL_SIZE browsers), kept warm
+          between runs (KEEP_BROWSERS_WARM)
+        - Report per-job latency
+        - Stream scraped products to a new snapshot as each job finishes
+        - Resume an interrupted run with only the jobs it has not completed
+
+        Args:
+            categories (list): Product categories to scrape (default: PRODUCT_CATEGORIES)
         """
-        all_products = []
-        driver = self.init_driver()
+        categories = categories or self.PRODUCT_CATEGORIES
+        self.page_loads = PageLoadStats()
+        self.readiness = ReadinessStats()
+        started_at = time.time()
+        metrics_baseline = self.metrics.totals_since()
+        targets = [(website, category) for website in self.WEBSITES for category in categories]
+
+        # Replay mode points the scrapers at a local mock storefront for the whole run
+        storefront = None
+        live_site_urls = self.SITE_URLS
+        if self.FIXTURE_MODE == "replay":
+            storefront = MockStorefront(self.FIXTURE_DIR).start()
+            self.SITE_URLS = storefront.site_urls()
 
         try:
-            # Iterate through websites and categories
-            for website in self.WEBSITES:
-                for category in self.PRODUCT_CATEGORIES:
-                    logging.info(f"Scraping {website} for {category}")
-                    
-                    # Select appropriate scraping method based on website
-                    if website == "Amazon":
-                        products = self.scrape_amazon(driver, category)
-                    elif website == "BestBuy":
-                        products = self.scrape_bestbuy(driver, category)
-                    else:
-                        logging.error(f"Unsupported website: {website}")
-                        continue
-
-                    # Collect and extend product list
-                    all_products.extend(products)
-                    time.sleep(5)  # Pause between scrapes to avoid overwhelming websites
-
-            # Save all collected products to CSV
-            self.save_to_csv(all_products)
+            self.recover_partial_snapshots()
+
+            # Resume an interrupted run: skip the (website, category) jobs it already
+            # completed, each covering all its result pages. A job it had only partly
+            # saved is scraped again, without writing the products it did save again
+            journal = self.run_journal()
+            if journal:
+                done_jobs = journal.open_run(self.RUN_WINDOW_HOURS)
+                if done_jobs:
+                    targets = [target for target in targets if (*target, 1) not in done_jobs]
+                    logging.info(f"Resuming run {journal.run_id}: {len(done_jobs)} jobs already done, "
+                                 f"{len(targets)} remaining")
+            fetch_fn = self.fetch_website if self.FETCH_MODE == "http_first" else None
+
+            # Products are streamed to the snapshot as each job finishes instead of
+            # being merged and saved at the end of the run
+            with self.open_snapshot() as writer:
+                if journal:
+                    # Products saved by any earlier attempt at this run are not written again
+                    writer.exclude(self.snapshot_keys(journal.snapshots))
+                    journal.record_snapshot(writer.name)
+                pool = ScrapePool(self.init_driver, self.scrape_website, pool_size=self.SCRAPER_POOL_SIZE,
+                                  fetch_fn=fetch_fn, on_job_done=lambda job: self.save_job(writer, journal, job),
+                                  browsers=self.browser_manager(), stop_event=self.stop_event)
+                jobs = pool.run(targets)
+            log_job_latency(jobs)
+            log_page_loads(self.page_loads)
+            log_readiness(self.readiness)
+            self.write_run_summary(jobs, categories, started_at, metrics_baseline)
+            if journal and not self.stop_event.is_set():
+                journal.complete()
         except Exception as e:
             logging.error(f"Error during scraping: {e}")
         finally:
-            # Always close the WebDriver to free up system resources
-            driver.quit()
+            if storefront:
+                storefront.stop()
+                self.SITE_URLS = live_site_urls
+            if not self.KEEP_BROWSERS_WARM:
+                self.close_browsers()
+
+    def browser_manager(self):
+        """
+        Pool of warm browser sessions, kept across scrape runs.
+        
+        Returns:
+            BrowserManager: The manager
+        """
+        if self._browser_manager is None or self._browser_manager.closed:
+            self._browser_manager = BrowserManager(
+                self.init_driver, profile_root=self.BROWSER_PROFILE_DIR,
+                max_pages=self.BROWSER_MAX_PAGES, max_memory_mb=self.BROWSER_MAX_MEMORY_MB,
+            )
+        return self._browser_manager
+
+    def close_browsers(self):
+        """Quit the warm browser sessions."""
+        if self._browser_manager is not None:
+            self._browser_manager.close()
+            self._browser_manager = None
+
+    def chromedriver_path(self, refresh=False):
+        """
+        Path of the chromedriver binary, resolved with webdriver_manager once and
+        then read from CHROMEDRIVER_CACHE (works offline).
+        
+        Args:
+            refresh (bool): Resolve the driver again instead of using the cached path
+        
+        Returns:
+            str: chromedriver executable
+        """
+        cache_file = os.path.join(self.PROCESSED_DATA_DIR, self.CHROMEDRIVER_CACHE)
+        if self._driver_cache is None or self._driver_cache.cache_file != cache_file:
+            self._driver_cache = ChromeDriverCache(cache_file)
+        return self._driver_cache.path(refresh=refresh)
+
+    def run_journal(self):
+        """
+        Open the journal of scrape runs.
+        
+        Returns:
+            RunJournal or None: The journal, or None when RUN_JOURNAL is disabled
+        """
+        if not self.RUN_JOURNAL:
+            return None
+        return RunJournal(os.path.join(self.PROCESSED_DATA_DIR, self.RUN_JOURNAL))
+
+    def save_job(self, writer, journal, job):
+        """
+        Stream a finished scrape job's products to the snapshot writer.
+        
+        Successful jobs are added to the run journal once their products are on
+        disk, so a resumed run skips them; failed or empty jobs are scraped again.
+        
+        Args:
+            writer (SnapshotWriter): Writer of the run's snapshot
+            journal (RunJournal): Journal of the run, or None
+            job (ScrapeJob): Finished job
+        """
+        done = None
+        if journal and job.error is None and job.product_count:
+            done = lambda: journal.record(job.website, job.category, job.page, job.product_count)
+        writer.write(job.products, done=done)
+        status = "failed" if job.error else ("ok" if job.product_count else "empty")
+        self.metrics.inc("scrape_jobs_total", website=job.website, status=status)
+        if job.product_count:
+            self.metrics.inc("products_extracted_total", job.product_count, website=job.website,
+                             category=job.category, source=job.source)
+
+    def write_run_summary(self, jobs, categories, started_at, baseline=None):
+        """
+        Write the JSON summary of a finished scrape run to RUN_SUMMARY_DIR (inside LOG_DIR)
+        and keep it as last_run_summary for the metrics endpoint.
+
+        The summary has the run's jobs, the page weight and readiness of its browser
+        pages, its memory use and the metrics recorded while it ran (stage durations,
+        products, parse failures, fallback selector hits and WebDriver round trips).
+
+        Args:
+            jobs (list): Finished ScrapeJob objects of the run
+            categories (list): Product categories the run scraped
+            started_at (float): time.time() at the start of the run
+            baseline (dict): self.metrics.totals_since() at the start of the run
+
+        Returns:
+            str or None: Path of the summary file, or None if it could not be written
+        """
+        resident, peak = resident_memory()
+        summary = {
+            "started_at": datetime.fromtimestamp(started_at).isoformat(timespec="seconds"),
+            "seconds": round(time.time() - started_at, 3),
+            "categories": list(categories),
+            "products": sum(job.product_count for job in jobs),
+            "failed_jobs": sum(1 for job in jobs if job.error is not None),
+            "jobs": [
+                {
+                    "website": job.website,
+                    "category": job.category,
+                    "source": job.source,
+                    "products": job.product_count,
+                    "pages": job.pages,
+                    "seconds": None if job.duration is None else round(job.duration, 3),
+                    "error": None if job.error is None else str(job.error),
+                }
+                for job in jobs
+            ],
+            "page_loads": self.page_loads.summary(),
+            "readiness": self.readiness.summary(),
+            "metrics": self.metrics.totals_since(baseline),
+            "memory": {"resident_bytes": resident, "peak_resident_bytes": peak},
+        }
+        self.last_run_summary = summary
+        summary_dir = os.path.join(self.LOG_DIR, self.RUN_SUMMARY_DIR)
+        path = os.path.join(summary_dir, f"run_{datetime.fromtimestamp(started_at):%Y%m%d_%H%M%S}.json")
+        try:
+            os.makedirs(summary_dir, exist_ok=True)
+            write_json(path, summary)
+        except OSError as e:
+            logging.error(f"Error saving the run summary: {e}")
+            return None
+        logging.info(f"Run summary saved to {path}")
+        return path
+
+    def start_metrics_server(self):
+        """
+        Serve the metrics (/metrics) and the last run summary (/summary) on METRICS_PORT.
+
+        Returns:
+            MetricsServer or None: The running server, or None when METRICS_PORT is not
+                set or the port is taken
+        """
+        if not self.METRICS_PORT:
+            return None
+        try:
+            return MetricsServer(self.metrics, port=self.METRICS_PORT, summary=lambda: self.last_run_summary).start()
+        except OSError as e:
+            logging.warning(f"Could not serve metrics on port {self.METRICS_PORT}: {e}")
+            return None
+
+    def scrape_pipeline(self, categories=None):
+        """
+        Stages of one scheduled run: scrape, then process the new snapshots, then
+        analyze the processed data and wait for its charts.
+
+        Each stage starts as soon as the one before it has committed its output.
+        The same stage of different pipelines never runs twice at once (scrapes
+        share the browsers and run journal, processing shares the snapshot
+        manifest), but one pipeline may analyze while another one scrapes.
+
+        Args:
+            categories (list): Product categories to scrape (default: PRODUCT_CATEGORIES)
+
+        Returns:
+            list: job_scheduler.Stage objects
+        """
+        def analyze(results):
+            if results["process"] is None:
+                logging.info("No new processed data to analyze")
+                return None
+            charts = self.analyze_product_data(results["process"])
+            wait(charts)
+            return charts
+
+        return [
+            Stage("scrape", lambda results: self.scrape_all_sources(categories), lock="scrape"),
+            Stage("process", lambda results: self.clean_and_process_data(), after=["scrape"], lock="process"),
+            Stage("analyze", analyze, after=["process"], lock="analyze"),
+        ]
 
     def run_scheduler(self):
         """
         Main scheduling method to:
-        - Perform initial scrape and analysis
-        - Schedule periodic scraping and analysis
-        - Handle graceful shutdown
+        - Run every pipeline of SCHEDULES (scrape -> process -> analyze) right away
+          and then on its own cadence, from an asyncio loop
+        - Skip a run that comes due while the previous run of that pipeline is still
+          going, and jitter the start of every run (SCHEDULE_JITTER)
+        - Log the queue lag and duration of every stage
+        - Handle graceful shutdown: CTRL+C stops scheduling, lets the running stages
+          finish (a scrape takes no new jobs) and only then closes the browsers
         """
         import signal
-        import sys
+
+        scheduler = JobScheduler(jitter=self.SCHEDULE_JITTER, cancel_event=self.stop_event)
 
         def signal_handler(sig, frame):
             """Handle graceful shutdown when CTRL+C is pressed"""
-            logging.info("Stopping E-commerce Product Tracker...")
-            sys.exit(0)
+            logging.info("Stopping E-commerce Product Tracker, waiting for the running stages "
+                         "(press CTRL+C again to exit right away)...")
+            # A second CTRL+C raises KeyboardInterrupt
+            signal.signal(signal.SIGINT, signal.default_int_handler)
+            scheduler.stop()
 
         # Register signal handler for clean exit
         signal.signal(signal.SIGINT, signal_handler)
 
         logging.info("E-commerce Product Tracker Starting...")
+        metrics_server = self.start_metrics_server()
         
         try:
-            # Initial scrape and analysis
-            self.scrape_all_sources()
-            processed_data = self.clean_and_process_data()
-            if processed_data is not None:
-                self.analyze_product_data(processed_data)
-            
-            # Schedule periodic scraping every 24 hours
-            schedule.every(24).hours.do(self.scrape_all_sources)
-            
-            # Schedule periodic analysis every 24 hours
-            schedule.every(24).hours.do(self._periodic_analysis)
-            
-            # Continuous loop to run scheduled tasks
-            while True:
-                schedule.run_pending()
-                time.sleep(60)  # Check every minute
-        
+            for name, (hours, categories) in self.SCHEDULES.items():
+                scheduler.add_job(name, self.scrape_pipeline(categories), interval=hours * 3600)
+            scheduler.run_forever()
         except Exception as e:
             logging.error(f"Fatal error in scheduler: {e}")
         finally:
             logging.info("E-commerce Product Tracker Shutting Down...")
+            self.close_browsers()
+            if metrics_server is not None:
+                metrics_server.stop()
+            if self._chart_renderer is not None:
+                # Let the charts still rendering finish
+                self._chart_renderer.shutdown()
 
-    def _periodic_analysis(self):
-        """
-        Separate method for periodic data processing and analysis
-        Provides isolation and easier error handling
-        """
-        try:
-            processed_data = self.clean_and_process_data()
-            if processed_data is not None:
-                self.analyze_product_data(processed_data)
-        except Exception as e:
-            logging.error(f"Error during periodic analysis: {e}")
-
-def main():
-    tracker = EcommerceProductTracker()
-    tracker.run_scheduler()
+def main(argv=None):
+    # Subcommands: scrape, process, analyze and run (the default), see tracker_cli
+    run_command(argv, tracker_class=EcommerceProductTracker)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file